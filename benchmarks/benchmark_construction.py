@@ -0,0 +1,124 @@
+"""
+Benchmark of magic class construction.
+
+Run this script to compare the per-instance construction time with and without
+the cached build plan.
+
+The build plan only removes the member analysis (iterating over the class members,
+classifying them and parsing the docstrings), which was about 0.3 ms per instance on
+a typical machine. The total construction time is dominated by creating the Qt
+widgets, so the total gain is only about 1%.
+
+>>> python benchmarks/benchmark_construction.py
+"""
+
+from __future__ import annotations
+
+import time
+from magicclass import magicclass, magicmenu, field, vfield
+from magicclass._gui import _build_plan
+from magicclass._gui._build_plan import BuildPlan
+
+
+@magicclass
+class Panel:
+    """
+    A panel for a dataset.
+
+    Attributes
+    ----------
+    dataset_name : str
+        Name of the dataset.
+    threshold : float
+        Threshold value.
+    """
+
+    @magicmenu
+    class Menu:
+        def open_file(self, path: str = ""):
+            """Open a file."""
+
+        def save_file(self, path: str = ""):
+            """Save a file."""
+
+    dataset_name = vfield(str)
+    threshold = vfield(0.5)
+    counter = field(int)
+
+    def run(self, sigma: float = 1.0, niter: int = 10):
+        """
+        Run the analysis.
+
+        Parameters
+        ----------
+        sigma : float
+            Standard deviation of the filter.
+        niter : int
+            Number of iterations.
+        """
+
+    def reset(self):
+        """Reset all the parameters."""
+
+    @magicclass(widget_type="collapsible")
+    class Advanced:
+        def clear(self):
+            """Clear the cache."""
+
+        def export(self, path: str = ""):
+            """Export the results."""
+
+
+def _clear_cache():
+    _build_plan._PLANS.clear()
+    _build_plan._BASE_MEMBERS.clear()
+
+
+def _construct(n: int) -> tuple[float, float]:
+    # cold and warm constructions are interleaved to cancel the drift of Qt.
+    widgets = []
+    t_cold = t_warm = 0.0
+    for _ in range(n):
+        _clear_cache()
+        t0 = time.perf_counter()
+        widgets.append(Panel())
+        t1 = time.perf_counter()
+        widgets.append(Panel())
+        t2 = time.perf_counter()
+        t_cold += t1 - t0
+        t_warm += t2 - t1
+    for widget in widgets:
+        widget.close()
+    return t_cold / n, t_warm / n
+
+
+def _analyze(n: int, cold: bool) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        if cold:
+            _clear_cache()
+        for cls in [Panel, Panel.Menu, Panel.Advanced]:
+            BuildPlan.get(cls, *cls.__mro__[1:3])
+    return (time.perf_counter() - t0) / n
+
+
+def main(n: int = 200):
+    _construct(5)  # warm up
+    a_cold = _analyze(n, cold=True)
+    a_warm = _analyze(n, cold=False)
+    print("member analysis per instance")
+    print(f"  without build plan cache: {a_cold * 1e3:.3f} ms")
+    print(f"  with build plan cache:    {a_warm * 1e3:.3f} ms")
+    t_cold, t_warm = _construct(n)
+    print("total construction per instance")
+    print(f"  without build plan cache: {t_cold * 1e3:.3f} ms")
+    print(f"  with build plan cache:    {t_warm * 1e3:.3f} ms")
+    saved = a_cold - a_warm
+    print(
+        f"member analysis saved {saved * 1e3:.3f} ms per instance "
+        f"({saved / t_cold:.1%} of the total construction time)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark of the cold import time of magicclass.
+
+This script runs ``python -X importtime -c "import magicclass"`` in fresh processes
+and reports the total import time and the time spent in the modules of magicclass
+itself (excluding the dependencies such as Qt and magicgui).
+
+>>> python benchmarks/benchmark_import.py
+>>> python benchmarks/benchmark_import.py --max-self-ms 150  # fail if exceeded
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# These modules must not be imported by "import magicclass".
+LAZY_MODULES = [
+    "magicclass.logging",
+    "magicclass.widgets.codeedit",
+    "magicclass.widgets.colormap",
+    "magicclass.widgets.logger",
+    "magicclass.widgets.misc",
+    "magicclass.widgets.plot",
+]
+
+
+def _run_importtime() -> tuple[float, float, set[str]]:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import magicclass"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    total_us = 0
+    self_us = 0
+    modules: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_str, cum_str, name = _split(line)
+        if not self_str.isdigit():
+            continue  # header
+        modules.add(name)
+        if name == "magicclass" or name.startswith("magicclass."):
+            self_us += int(self_str)
+        if name == "magicclass":
+            total_us = int(cum_str)
+    return total_us / 1e3, self_us / 1e3, modules
+
+
+def _split(line: str) -> tuple[str, str, str]:
+    self_str, cum_str, name = line[len("import time:") :].split("|")
+    return self_str.strip(), cum_str.strip(), name.strip()
+
+
+def main(n: int = 7, max_self_ms: float | None = None) -> int:
+    totals: list[float] = []
+    selves: list[float] = []
+    for _ in range(n):
+        total, self_, modules = _run_importtime()
+        totals.append(total)
+        selves.append(self_)
+    print(f"import magicclass (median of {n} runs)")
+    print(f"  total:            {statistics.median(totals):.1f} ms")
+    print(f"  magicclass only:  {statistics.median(selves):.1f} ms")
+
+    status = 0
+    if loaded := [mod for mod in LAZY_MODULES if mod in modules]:
+        print(f"FAILED: modules that should be lazily imported: {loaded}")
+        status = 1
+    if max_self_ms is not None and statistics.median(selves) > max_self_ms:
+        print(f"FAILED: import time of magicclass exceeded {max_self_ms} ms.")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=7, help="Number of runs.")
+    parser.add_argument(
+        "--max-self-ms",
+        type=float,
+        default=None,
+        help="Fail if the import time of magicclass modules exceeds this value.",
+    )
+    args = parser.parse_args()
+    sys.exit(main(args.n, args.max_self_ms))
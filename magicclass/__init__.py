@@ -9,6 +9,7 @@ from magicclass.core import (
     build_help,
     get_button,
     get_function_gui,
+    get_prebuild_records,
     update_widget_state,
 )
 
@@ -17,6 +18,8 @@ from magicclass.wrappers import (
     set_design,
     do_not_record,
     bind_key,
+    cache_choices,
+    threaded_choices,
     confirm,
     nogui,
     impl_preview,
@@ -35,10 +38,22 @@ from magicclass.fields import (
     HasFields,
 )
 from magicclass._gui._base import defaults, MagicTemplate, PopUpMode
-from magicclass import widgets, utils, types, functools, logging
+from magicclass import widgets, utils, types, functools
 
 from magicgui import *  # noqa: F403
 
+# submodules that are not needed to build magic classes
+_LAZY_SUBMODULES = frozenset(["logging"])
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        import importlib
+
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "magicclass",
     "magicmenu",
@@ -48,12 +63,15 @@ __all__ = [
     "build_help",
     "get_button",
     "get_function_gui",
+    "get_prebuild_records",
     "repeat",
     "update_widget_state",
     "set_options",
     "set_design",
     "do_not_record",
     "bind_key",
+    "cache_choices",
+    "threaded_choices",
     "confirm",
     "nogui",
     "impl_preview",
@@ -27,16 +27,13 @@ from magicgui.signature import MagicParameter
 from magicgui.widgets import (
     FunctionGui,
     FileEdit,
-    EmptyWidget,
     Widget,
     Container,
     Image,
     Table,
     Label,
 )
-from magicgui.application import use_app
 from magicgui.widgets.bases import ButtonWidget, ValueWidget
-from magicgui import types as _mgui_types
 from macrokit import Symbol
 
 from magicclass._gui.keybinding import as_shortcut
@@ -44,6 +41,7 @@ from magicclass._gui.mgui_ext import (
     AbstractAction,
     FunctionGuiPlus,
     Action,
+    PushButtonPlus,
     Clickable,
     is_clickable,
     _LabeledWidgetAction,
@@ -51,7 +49,8 @@ from magicclass._gui.mgui_ext import (
 )
 from magicclass._gui.utils import (
     copy_class,
-    callable_to_classes,
+    get_callable_info,
+    get_text_width,
     show_dialog_from_mgui,
     connect_magicclasses,
 )
@@ -64,19 +63,21 @@ from magicclass._gui._macro_utils import (
     MagicGuiPostRunCallback,
 )
 from magicclass._gui._icon import get_icon
+from magicclass._gui._build_plan import MemberKind, PlannedMember
+from magicclass._gui._deferred import deferring, MagicClassChildren
 from magicclass._gui._gui_modes import PopUpMode, ErrorMode
 
 from magicclass.utils import (
     get_signature,
     Tooltips,
     move_to_screen_center,
-    argcount,
     is_instance_method,
     method_as_getter,
     eval_attribute,
 )
+from magicclass.utils._choices import choices_as_getter, iter_choices_memos
 from magicclass.widgets import Separator, FreeWidget
-from magicclass.fields import MagicField, FieldGroup
+from magicclass.fields import MagicField
 from magicclass.signature import (
     ConfirmDict,
     MagicMethodSignature,
@@ -94,18 +95,26 @@ from magicclass.box._fields import BoxMagicField
 if TYPE_CHECKING:
     import numpy as np
     import napari
+    from magicclass._gui._prebuild import FunctionGuiPrebuilder
 
 defaults = {
     "popup_mode": PopUpMode.popup,
     "error_mode": ErrorMode.msgbox,
     "close_on_run": True,
     "macro-max-history": 100000,
+    "macro-spill-path": None,
+    "macro-journal-path": None,
+    "macro-update-interval": 50,
+    "macro-arg-size-limit": None,
     "macro-highlight": False,
     "macro-attribute-check": True,
     "macro-signature-check": True,
     "macro-name-check": True,
     "undo-max-history": 100,
+    "undo-max-bytes": None,
+    "undo-compression": None,
     "raise-conversion-error": False,
+    "lazy-tooltip": False,
 }
 
 _RESERVED = frozenset(
@@ -188,6 +197,12 @@ class _MagicTemplateMeta(ABCMeta):
     def __get__(self, obj: Literal[None], objtype=None) -> Self: ...
 
     def __get__(self, obj, objtype=None):
+        if getattr(obj, "_deferred_build", None) is not None:
+            # The nested magic class is not constructed yet.
+            obj._build_deferred()
+            for child in vars(obj).values():
+                if type(child) is self:
+                    return child
         return self
 
 
@@ -197,6 +212,35 @@ def _typeof(current_self) -> type:
     return getattr(tp, "__original_class__", tp)
 
 
+def reset_choices_of(self: BaseGui, only: Any) -> None:
+    """Reset the choices of the targets in the magic class."""
+    if isinstance(only, str) or callable(only) or not isinstance(only, Iterable):
+        only = [only]
+    memos = list(iter_choices_memos(self))
+    for _, child in self._iter_child_magicclasses():
+        memos.extend(iter_choices_memos(child))
+    providers = [memo.provider for memo in memos]
+
+    for target in only:
+        if isinstance(target, str):
+            attr = getattr(type(self), target, None)
+            target = attr if any(attr is p for p in providers) else self[target]
+        if isinstance(target, (Widget, mguiLike)):
+            target = getattr(target, "_inner_widget", target)
+            if hasattr(target, "reset_choices"):
+                target.reset_choices()
+        elif callable(target):
+            # choices provider: discard the memoized result and reset the widgets
+            for memo in memos:
+                if memo.provider is target:
+                    memo.invalidate()
+                    if (widget := memo.widget) is not None:
+                        widget.reset_choices()
+        else:
+            raise TypeError(f"Cannot reset choices of {target!r}.")
+    return None
+
+
 def _find_gui_class(self) -> type[BaseGui] | None:
     """
     Find a superclass of BaseGui.
@@ -216,6 +260,7 @@ class MagicTemplate(
     MutableSequence["Widget | AbstractAction"], metaclass=_MagicTemplateMeta
 ):
     __doc__ = ""
+    _batch_depth: int = 0
     __magicclass_parent__: None | MagicTemplate
     __magicclass_children__: WeakSet[MagicTemplate]
     _close_on_run: bool
@@ -313,6 +358,38 @@ class MagicTemplate(
         self._fast_insert(key, widget)
         self._unify_label_widths()
 
+    def extend(self, widgets: Iterable[Widget | AbstractAction | Callable]) -> None:
+        """Append widgets at once, with the layout updated only once."""
+        with self.batch_update():
+            for widget in widgets:
+                self.append(widget)
+        return None
+
+    @contextmanager
+    def batch_update(self):
+        """
+        Context manager to update the widget list efficiently.
+
+        Screen updates are suspended and label widths are unified only once when the
+        context exits, which makes inserting many widgets much faster.
+
+        >>> with ui.batch_update():
+        ...     for i in range(100):
+        ...         ui.append(SpinBox(name=f"value_{i}"))
+        """
+        native = self.native
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            updates_enabled = native.updatesEnabled()
+            native.setUpdatesEnabled(False)
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._unify_label_widths()
+                native.setUpdatesEnabled(updates_enabled)
+
     def render(self) -> np.ndarray:
         if cls := _find_gui_class(self):
             return cls.render(self)
@@ -321,9 +398,9 @@ class MagicTemplate(
     def _unify_label_widths(self):
         raise NotImplementedError()
 
-    def reset_choices(self, *args):
+    def reset_choices(self, *args, only=None):
         if cls := _find_gui_class(self):
-            return cls.reset_choices(self, *args)
+            return cls.reset_choices(self, *args, only=only)
         raise NotImplementedError()
 
     @property
@@ -584,9 +661,19 @@ class MagicTemplate(
 
                     child_widget.changed.disconnect()
                     child_widget.changed.connect(widget.changed)
-                    child_widget.tooltip = widget.tooltip
+                    _getter = getattr(widget, "_tooltip_getter", None)
+                    if (
+                        _getter is not None
+                        and not widget.tooltip
+                        and isinstance(child_widget, PushButtonPlus)
+                    ):
+                        # tooltip of the original widget is not built yet
+                        child_widget._set_lazy_tooltip(_getter)
+                    else:
+                        child_widget.tooltip = widget.tooltip
                     child_widget._doc = widget._doc
                     child_widget._get_running = lambda: widget.running
+                    child_widget._mgui_builder = widget._mgui_builder
 
                 _found += 1
                 if _found == _n_match:
@@ -648,17 +735,17 @@ class MagicTemplate(
         """
         raise NotImplementedError()
 
-    def _convert_an_attribute_into_widget(
-        self, name: str, attr: Any, tooltips: Tooltips
-    ) -> Widget:
-        if isinstance(attr, type):
+    def _convert_an_attribute_into_widget(self, member: PlannedMember) -> Widget:
+        name, attr, kind = member.name, member.attr, member.kind
+        if kind is MemberKind.nested_class:
             # Nested magic-class
-            widget = attr()
+            with deferring(self._lazy):
+                widget = attr()
             object.__setattr__(self, name, widget)
             if isinstance(widget, BaseGui):
                 connect_magicclasses(self, widget, name)
 
-        elif isinstance(attr, MagicField):
+        elif kind is MemberKind.field:
             # If MagicField is given by field() function.
             widget = self._create_widget_from_field(name, attr)
             if isinstance(widget, BaseGui):
@@ -668,9 +755,9 @@ class MagicTemplate(
                     if isinstance(wdt, BaseGui):
                         connect_magicclasses(self, wdt, name)
             if not widget.tooltip:
-                widget.tooltip = tooltips.attributes.get(name, "")
+                widget.tooltip = member.tooltip
 
-        elif isinstance(attr, FunctionGui):
+        elif kind is MemberKind.function_gui:
             widget = attr.copy()
             first_widget = widget[0]
             if not hasattr(first_widget, "bind"):  # TODO: instance check in the future
@@ -679,7 +766,7 @@ class MagicTemplate(
                 )
             first_widget.bind(self)  # bind self to the first argument
 
-        elif isinstance(attr, Widget) and not isinstance(attr, FieldGroup):
+        elif kind is MemberKind.widget:
             warnings.warn(
                 f"Widget {name!r} is given as a class attribute. This is not "
                 "recommended, as it is shared between all the instances. "
@@ -689,7 +776,7 @@ class MagicTemplate(
             )
             widget = attr
 
-        elif _is_separator(attr):
+        elif kind is MemberKind.separator:
             widget = Separator()
         else:
             # convert class method into instance method
@@ -730,24 +817,15 @@ class MagicTemplate(
         func = _create_gui_method(self, obj)
 
         # Prepare a button or action
-        widget.tooltip = Tooltips(func).desc
+        if defaults["lazy-tooltip"] and isinstance(widget, PushButtonPlus):
+            widget._set_lazy_tooltip(lambda: Tooltips(func).desc)
+        else:
+            widget.tooltip = Tooltips(func).desc
         widget._doc = func.__doc__
 
         # Get the number of parameters except for empty widgets.
         # With these lines, "bind" method of magicgui works inside magicclass.
-        fgui_info = callable_to_classes(func)
-        n_empty = sum(
-            1
-            for _wdg_cls, _prm in fgui_info
-            if _wdg_cls is EmptyWidget or _prm.options.get("bind", None) is not None
-        )
-        nparams = argcount(func) - n_empty
-        if len(fgui_info) == 0:
-            _first_is_file_edit = False
-        else:
-            _first_is_file_edit = issubclass(fgui_info[0][0], FileEdit)
-
-        has_preview = get_additional_option(func, "preview", None) is not None
+        nparams, _first_is_file_edit, has_preview = get_callable_info(obj, func)
 
         if nparams == 0 and not has_preview:
             # We don't want a dialog with a single widget "Run" to show up.
@@ -811,6 +889,9 @@ class MagicTemplate(
                 return None
 
         widget.changed.connect(run_function)
+        if nparams > 0 or has_preview:
+            # buttons without a dialog are not worth prebuilding
+            widget._mgui_builder = lambda: _build_mgui(widget, func, self)
 
         # If design is given, load the options.
         widget.from_options(func)
@@ -854,17 +935,21 @@ class MagicTemplate(
 
 
 class BaseGui(MagicTemplate):
+    _lazy: bool = False
+    _deferred_build: Callable[[], None] | None = None
+
     def __init__(
         self, close_on_run=True, popup_mode=PopUpMode.popup, error_mode=ErrorMode.msgbox
     ):
         self._macro_instance = GuiMacro(self, options=defaults)
         self.__magicclass_parent__: BaseGui | None = None
-        self.__magicclass_children__: WeakSet[MagicTemplate] = WeakSet()
+        self.__magicclass_children__: WeakSet[MagicTemplate] = MagicClassChildren(self)
         self._close_on_run = close_on_run
         self._popup_mode = popup_mode or PopUpMode.popup
         self._error_mode = error_mode or ErrorMode.msgbox
         self._my_symbol = Symbol.var("ui")
         self._icon = None
+        self._prebuilder: FunctionGuiPrebuilder | None = None
 
     def __init_subclass__(cls, **kwargs):
         pass
@@ -893,8 +978,18 @@ class ContainerLikeGui(BaseGui, mguiLike):
     _list: list[AbstractAction | ContainerLikeGui]
     native: QtW.QMenu | QtW.QToolBar
 
-    def reset_choices(self, *_: Any):
-        """Reset child Categorical widgets"""
+    def reset_choices(self, *_: Any, only=None):
+        """
+        Reset child Categorical widgets.
+
+        Parameters
+        ----------
+        only : str, widget, callable or list of them, optional
+            If given, only reset the choices of these targets. See
+            `ClassGui.reset_choices` for details.
+        """
+        if only is not None:
+            return reset_choices_of(self, only)
         all_widgets: set[Widget] = set()
 
         for item in self._list:
@@ -973,11 +1068,12 @@ class ContainerLikeGui(BaseGui, mguiLike):
             Table,
             Action,
         )
+        if self._batch_depth > 0:
+            return  # will be called at the end of batch update
         need_labels = [w for w in self if not isinstance(w, _hide_labels)]
 
         if self.labels and need_labels:
-            measure = use_app().get_obj("get_text_width")
-            widest_label = max(measure(w.label) for w in need_labels)
+            widest_label = max(get_text_width(w.label) for w in need_labels)
             for w in need_labels:
                 labeled_widget = w._labeled_widget()
                 if labeled_widget:
@@ -1110,7 +1206,7 @@ def _create_gui_method(self: BaseGui, obj: MethodType):
                 _arg_choices = eval_attribute(type(self), _arg_choices)
 
             if is_instance_method(_arg_choices):
-                _new_option["choices"] = method_as_getter(self, _arg_choices)
+                _new_option["choices"] = choices_as_getter(self, _arg_choices)
 
             _param = MagicParameter(
                 name=param.name,
@@ -1431,17 +1527,6 @@ def _define_popup(self: BaseGui, obj, widget: Clickable):
     return _prep
 
 
-_void = object()
-
-
-def _is_separator(attr) -> bool:
-    if isinstance(attr, str) and attr == "separator":
-        return True
-    if attr is getattr(_mgui_types, "Separator", _void):
-        return True
-    return False
-
-
 def _implement_confirmation(
     method: MethodType,
     self: BaseGui,
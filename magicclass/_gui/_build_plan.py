@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, Iterator, NamedTuple
+from weakref import WeakKeyDictionary
+from magicgui.widgets import FunctionGui, Widget
+from magicgui import types as _mgui_types
+
+from magicclass.fields import MagicField, FieldGroup
+from magicclass.utils import iter_members, Tooltips
+from magicclass.utils._functions import _class_version
+from magicclass._gui.utils import TYPES_IGNORE
+
+
+class MemberKind(Enum):
+    """Kind of a class member that will be converted into a widget."""
+
+    nested_class = "nested_class"
+    field = "field"
+    function_gui = "function_gui"
+    widget = "widget"
+    separator = "separator"
+    method = "method"
+
+
+class PlannedMember(NamedTuple):
+    """A class member and the information needed to convert it into a widget."""
+
+    name: str
+    attr: Any
+    kind: MemberKind
+    tooltip: str
+
+
+class BuildPlan:
+    """
+    Per-class plan of how a magic class is converted into widgets.
+
+    Iterating over the class members, classifying them and parsing the docstrings are
+    independent of the instance. A build plan does these things only once per class
+    and every instance construction replays it.
+    """
+
+    def __init__(self, cls: type, base_members: frozenset[str]):
+        self._cls = cls
+        self._version: tuple[Any, ...] = ()
+        _tooltips = Tooltips(cls)
+        self._tooltip = _tooltips.desc
+        members: list[PlannedMember] = []
+        for name, attr in iter_members(cls):
+            if name in base_members or isinstance(attr, TYPES_IGNORE):
+                continue
+            kind = _kind_of(attr)
+            if kind is MemberKind.field:
+                tooltip = _tooltips.attributes.get(name, "")
+            else:
+                tooltip = ""
+            members.append(PlannedMember(name, attr, kind, tooltip))
+        self._members = tuple(members)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}<{self._cls.__qualname__}, n={len(self)}>"
+
+    def __iter__(self) -> Iterator[PlannedMember]:
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @property
+    def tooltip(self) -> str:
+        """Tooltip of the class."""
+        return self._tooltip
+
+    @classmethod
+    def get(cls, gui_cls: type, *bases: type, exclude: Any = ()) -> BuildPlan:
+        """
+        Get the cached build plan of a magic class.
+
+        Parameters
+        ----------
+        gui_cls : type
+            The magic class.
+        *bases : type
+            Base classes whose members are not converted into widgets.
+        exclude : iterable of str, optional
+            Additional member names that are not converted into widgets.
+        """
+        version = _class_version(gui_cls)
+        if (plan := _PLANS.get(gui_cls)) is not None and plan._version == version:
+            return plan
+        base_members = set(exclude)
+        for base in bases:
+            base_members.update(_base_member_names(base))
+        plan = _PLANS[gui_cls] = cls(gui_cls, frozenset(base_members))
+        plan._version = version
+        return plan
+
+
+# the plan is rebuilt when a member of the class is added, deleted or replaced
+_PLANS: WeakKeyDictionary[type, BuildPlan] = WeakKeyDictionary()
+_BASE_MEMBERS: WeakKeyDictionary[type, frozenset[str]] = WeakKeyDictionary()
+
+
+def _base_member_names(base: type) -> frozenset[str]:
+    if (names := _BASE_MEMBERS.get(base)) is None:
+        names = _BASE_MEMBERS[base] = frozenset(x[0] for x in iter_members(base))
+    return names
+
+
+_void = object()
+
+
+def _is_separator(attr) -> bool:
+    if isinstance(attr, str) and attr == "separator":
+        return True
+    if attr is getattr(_mgui_types, "Separator", _void):
+        return True
+    return False
+
+
+def _kind_of(attr: Any) -> MemberKind:
+    if isinstance(attr, type):
+        return MemberKind.nested_class
+    elif isinstance(attr, MagicField):
+        return MemberKind.field
+    elif isinstance(attr, FunctionGui):
+        return MemberKind.function_gui
+    elif isinstance(attr, Widget) and not isinstance(attr, FieldGroup):
+        return MemberKind.widget
+    elif _is_separator(attr):
+        return MemberKind.separator
+    return MemberKind.method
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator
+import weakref
+from qtpy import QtCore
+
+if TYPE_CHECKING:
+    from magicclass._gui._base import BaseGui
+    from magicclass._gui.class_gui import ClassGuiBase
+
+# True if the next magic class construction should defer building its children.
+_DEFER_NEXT: ContextVar[bool] = ContextVar("_DEFER_NEXT", default=False)
+
+
+@contextmanager
+def deferring(defer: bool = True) -> Iterator[None]:
+    """Request the magic classes constructed in this context to be deferred."""
+    token = _DEFER_NEXT.set(defer)
+    try:
+        yield
+    finally:
+        _DEFER_NEXT.reset(token)
+
+
+@contextmanager
+def consume_deferring() -> Iterator[bool]:
+    """
+    Consume the deferring request.
+
+    Yields True if the magic class under construction is requested to be deferred.
+    Magic classes constructed inside this context are not affected by the request.
+    """
+    token = _DEFER_NEXT.set(False)
+    try:
+        yield token.old_value is True
+    finally:
+        _DEFER_NEXT.reset(token)
+
+
+class MagicClassChildren(weakref.WeakSet):
+    """
+    Set of child magic classes.
+
+    If the construction of the owner is deferred, the owner is built when the set is
+    accessed, so that child magic classes can always be found.
+    """
+
+    def __init__(self, owner: BaseGui):
+        super().__init__()
+        self._owner_ref = weakref.ref(owner)
+
+    def _ensure_built(self):
+        owner = self._owner_ref()
+        if owner is not None and owner._deferred_build is not None:
+            owner._build_deferred()
+
+    def __iter__(self):
+        self._ensure_built()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return super().__len__()
+
+    def __contains__(self, item) -> bool:
+        self._ensure_built()
+        return super().__contains__(item)
+
+
+class RevealFilter(QtCore.QObject):
+    """Build a deferred magic class when its widget is shown for the first time."""
+
+    def __init__(self, ui: ClassGuiBase):
+        super().__init__(ui.native)
+        self._ui_ref = weakref.ref(ui)
+        ui.native.installEventFilter(self)
+        if (btn := _get_expand_button(ui)) is not None:
+            btn.toggled.connect(self._on_toggled)
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if event.type() == QtCore.QEvent.Type.Show:
+            ui = self._ui_ref()
+            if ui is not None and not getattr(ui, "collapsed", False):
+                self._build()
+        return False
+
+    def _on_toggled(self, checked: bool):
+        if checked:
+            self._build()
+
+    def _build(self):
+        if (ui := self._ui_ref()) is None:
+            return
+        ui.native.removeEventFilter(self)
+        if (btn := _get_expand_button(ui)) is not None:
+            btn.toggled.disconnect(self._on_toggled)
+        ui._build_deferred()
+
+
+def is_revealed(ui: ClassGuiBase, parent: BaseGui | None = None) -> bool:
+    """True if the contents of the magic class are visible to the parent."""
+    if getattr(ui, "collapsed", False):
+        return False
+    if parent is None:
+        return True
+    return ui.native.isVisibleTo(parent.native)
+
+
+def _get_expand_button(ui: ClassGuiBase):
+    return getattr(ui._widget, "_expand_btn", None)
@@ -1,23 +1,41 @@
 from __future__ import annotations
+from collections import deque
 from contextlib import contextmanager
+from functools import partial
+from itertools import islice
+import operator
 from pathlib import Path
+import time
+import weakref
 
 from typing import TYPE_CHECKING, Any, Callable, Iterable, overload
 from datetime import datetime
 from qtpy import QtWidgets as QtW, QtCore
 from macrokit import Symbol, Expr, Head, BaseMacro, parse, symbol
-from macrokit.utils import check_call_args, check_attributes
 from magicgui.widgets import FileEdit, LineEdit, EmptyWidget, PushButton
 from magicclass.utils.qthreading import thread_worker, run_async
 
-from magicclass.widgets import CodeEdit, TabbedContainer, ScrollableContainer, Dialog
+from magicclass.widgets import TabbedContainer, ScrollableContainer, Dialog
 from magicclass.utils import move_to_screen_center
+from magicclass.utils._arg_store import ArgumentStore, argument_size
 from magicclass.undo import ImplementsUndo, RedoAction, UndoCallback
 from magicclass._gui.runner import CommandRunnerMenu
+from magicclass._gui._macro_journal import MacroJournal, read_journal
+from magicclass._gui._macro_check import (
+    MacroValidator,
+    ValidationResult,
+    _GuiVersion,
+    _gui_version,
+)
+from magicclass._gui._macro_index import MacroIndex
+from magicclass._gui._macro_compact import compact_lines
+from magicclass._gui._undo_store import UndoStore, CompressionMode
 
 if TYPE_CHECKING:
     from ._base import BaseGui
+    from ._replay import CompiledMacro
     from .mgui_ext import Clickable
+    from magicclass.widgets import CodeEdit
 
 
 class MacroEdit(TabbedContainer):
@@ -39,9 +57,13 @@ class MacroEdit(TabbedContainer):
         self._name_check = False
         self._syntax_highlight = False
         self._run_async = False
+        self._validator = MacroValidator()
+        self._pending_lines: list[str] = []  # lines to be appended
+        self._pending_erase = 0  # number of text lines to be erased from the end
 
     def _add_code_edit(self, name: str = "script", native: bool = False) -> CodeEdit:
         """Add a new code edit widget as a new tab."""
+        from magicclass.widgets import CodeEdit
 
         textedit = CodeEdit(name=name)
         if native:
@@ -115,6 +137,9 @@ class MacroEdit(TabbedContainer):
     @property
     def textedit(self) -> CodeEdit | None:
         """Return the current code editor"""
+        from magicclass.widgets import CodeEdit
+
+        self._flush_updates()
         wdt = self[self.current_index]
         if isinstance(wdt, CodeEdit):
             return wdt
@@ -123,13 +148,39 @@ class MacroEdit(TabbedContainer):
     @property
     def native_macro(self) -> CodeEdit | None:
         """The code edit widget for the native macro"""
+        self._flush_updates()
         return self._native_macro
 
     @property
     def recorded_macro(self) -> CodeEdit | None:
         """The code edit widget for the recording macro"""
+        self._flush_updates()
         return self._recorded_macro
 
+    def _queue_append(self, line: str) -> None:
+        """Append a line to the macro editors in the next update."""
+        self._pending_lines.append(line)
+
+    def _queue_erase(self, line: str) -> None:
+        """Erase the last line from the macro editors in the next update."""
+        if self._pending_lines:
+            self._pending_lines.pop()
+        else:
+            self._pending_erase += line.count("\n") + 1
+
+    def _flush_updates(self) -> None:
+        """Update the macro editors by replacing only the changed trailing lines."""
+        if not self._pending_lines and self._pending_erase == 0:
+            return None
+        text = "\n".join(self._pending_lines)
+        nlines = self._pending_erase
+        self._pending_lines.clear()
+        self._pending_erase = 0
+        for wdt in {self._native_macro, self._recorded_macro}:
+            if wdt is not None:
+                wdt.replace_last_lines(nlines, text)
+        return None
+
     def load(self, path: str):
         """Load macro text from a file."""
         _path = Path(path)
@@ -206,6 +257,7 @@ class MacroEdit(TabbedContainer):
         new.__magicclass_parent__ = self.__magicclass_parent__
         new.native.setParent(self.native.parent(), new.native.windowFlags())
         new._attribute_check = self._attribute_check
+        new._validator = self._validator
         new._signature_check = self._signature_check
         new._name_check = self._name_check
         new._syntax_highlight = self._syntax_highlight
@@ -256,29 +308,85 @@ class MacroEdit(TabbedContainer):
         """Run macro."""
         parent = self._search_parent_magicclass()
         ns = {Symbol.var("ui"): parent}
-        with parent._error_mode.raise_with_handler(parent):
-            if self._attribute_check:
-                strs = [f"- {exc}" for exc in check_attributes(code, ns)]
-                if strs:
-                    raise AttributeError("Attribute check failed.\n" + "\n".join(strs))
-
-            if self._signature_check:
-                strs = [f"- {exc}" for exc in check_call_args(code, ns)]
-                if strs:
-                    raise AttributeError("Signature check failed.\n" + "\n".join(strs))
-
-            if self._name_check:
-                # TODO
-                pass
+        if self._run_async and self._signature_check:
+            # Attribute access may build deferred widgets, so the attributes are
+            # always resolved in the GUI thread, even if the attribute check is
+            # disabled. Validation of the signatures of a long script should not
+            # block the GUI.
+            from superqt.utils import create_worker
+
+            with parent._error_mode.raise_with_handler(parent):
+                result = self._validator.validate(code, parent, ns, signature=False)
+                if self._attribute_check and result.attribute_errors:
+                    self._execute_validated(code, parent, ns, result)
+            worker = create_worker(
+                self._validate,
+                code,
+                parent,
+                ns,
+                attribute=False,
+                version=_gui_version(parent),  # widgets are not thread-safe
+                _start_thread=False,
+            )
+            callback = partial(self._on_validated, code, parent, ns)
+            worker.returned.connect(callback)
+            worker.errored.connect(callback)
+            worker.start()
+        else:
+            with parent._error_mode.raise_with_handler(parent):
+                result = self._validate(code, parent, ns)
+                self._execute_validated(code, parent, ns, result)
 
-            if str(code) == "":
-                raise ValueError("No code selected")
-            if (viewer := parent.parent_viewer) is not None:
-                ns.setdefault(Symbol.var("viewer"), viewer)
-            if self._run_async:
-                run_async(code, parent, ns=ns)
-            else:
-                code.eval(ns)
+    def _validate(
+        self,
+        code: Expr,
+        parent: BaseGui,
+        ns: dict,
+        attribute: bool = True,
+        signature: bool = True,
+        version: tuple[_GuiVersion, ...] | None = None,
+    ) -> ValidationResult:
+        attribute = attribute and self._attribute_check
+        signature = signature and self._signature_check
+        if not (attribute or signature):
+            return ValidationResult([], [])
+        return self._validator.validate(
+            code, parent, ns, attribute=attribute, signature=signature, version=version
+        )
+
+    def _on_validated(
+        self,
+        code: Expr,
+        parent: BaseGui,
+        ns: dict,
+        result: ValidationResult | Exception,
+    ):
+        with parent._error_mode.raise_with_handler(parent):
+            if isinstance(result, Exception):
+                raise result
+            self._execute_validated(code, parent, ns, result)
+
+    def _execute_validated(
+        self, code: Expr, parent: BaseGui, ns: dict, result: ValidationResult
+    ):
+        if strs := [f"- {msg}" for msg in result.attribute_errors]:
+            raise AttributeError("Attribute check failed.\n" + "\n".join(strs))
+
+        if strs := [f"- {msg}" for msg in result.signature_errors]:
+            raise AttributeError("Signature check failed.\n" + "\n".join(strs))
+
+        if self._name_check:
+            # TODO
+            pass
+
+        if str(code) == "":
+            raise ValueError("No code selected")
+        if (viewer := parent.parent_viewer) is not None:
+            ns.setdefault(Symbol.var("viewer"), viewer)
+        if self._run_async:
+            run_async(code, parent, ns=ns)
+        else:
+            code.eval(ns)
 
     def _execute_selected(self, e=None):
         """Run selected line of macro."""
@@ -331,12 +439,14 @@ class MacroEdit(TabbedContainer):
             self.save(result)
 
     def _start_recording(self):
+        self._flush_updates()
         index = self.current_index
         if self[index] is self.native_macro:
             self.new_tab("record")
         self._recorded_macro = self.textedit
 
     def _finish_recording(self):
+        self._flush_updates()
         self._recorded_macro = None
 
     def _set_menubar(self, is_main: bool):
@@ -420,6 +530,10 @@ class PropertyGroup:
         self._parent = parent
         self._max_lines = 10000
         self._max_undo = 100
+        self._spill_path: Path | None = None
+        self._journal_path: Path | None = None
+        self._update_interval = 50
+        self._arg_size_limit: int | None = None
 
     def __get__(self, instance: GuiMacro, owner) -> PropertyGroup:
         if instance is None:
@@ -430,6 +544,12 @@ class PropertyGroup:
         c = type(self).__name__
         return (
             f"{c}(max_lines={self.max_lines}, max_undo={self.max_undo}, "
+            f"max_undo_bytes={self.max_undo_bytes}, "
+            f"undo_compression={self.undo_compression!r}, "
+            f"spill_path={self.spill_path!r}, "
+            f"journal_path={self.journal_path!r}, "
+            f"update_interval={self.update_interval}, "
+            f"arg_size_limit={self.arg_size_limit}, "
             f"syntax_highlight={self.syntax_highlight}, "
             f"attribute_check={self.attribute_check}, "
             f"signature_check={self.signature_check}, "
@@ -468,6 +588,80 @@ class PropertyGroup:
                 "max_undo must be larger than current number of undo steps"
             )
         self._max_undo = value
+        macro = self.macro
+        macro._stack_undo.maxlen = value
+        macro._stack_redo = deque(macro._stack_redo, maxlen=value)
+
+    @property
+    def max_undo_bytes(self) -> int | None:
+        """Maximum total size of the undo operations in bytes."""
+        return self.macro._stack_undo.max_bytes
+
+    @max_undo_bytes.setter
+    def max_undo_bytes(self, value: int | None):
+        if value is not None and value < 0:
+            raise ValueError("max_undo_bytes must be >= 0 or None")
+        self.macro._stack_undo.max_bytes = value
+
+    @property
+    def undo_compression(self) -> CompressionMode | None:
+        """How to store large arrays in the undo operations."""
+        return self.macro._stack_undo.compression
+
+    @undo_compression.setter
+    def undo_compression(self, value: CompressionMode | None):
+        self.macro._stack_undo.compression = value
+
+    @property
+    def spill_path(self) -> Path | None:
+        """Path to the file where the lines evicted from the macro are appended."""
+        return self._spill_path
+
+    @spill_path.setter
+    def spill_path(self, value: str | Path | None):
+        # the file is opened by the root macro when a line is evicted first
+        macro = self.macro
+        if macro._spill_log is not None:
+            macro._spill_log.close()
+            macro._spill_log = None
+        self._spill_path = None if value is None else Path(value)
+
+    @property
+    def journal_path(self) -> Path | None:
+        """Path to the file where the recorded macro is journaled."""
+        return self._journal_path
+
+    @journal_path.setter
+    def journal_path(self, value: str | Path | None):
+        # the file is opened by the root macro when a line is recorded first
+        macro = self.macro
+        if macro._journal is not None:
+            macro._journal.close()
+            macro._journal = None
+        self._journal_path = None if value is None else Path(value)
+
+    @property
+    def update_interval(self) -> int:
+        """Minimum interval in milliseconds between updates of the macro editor."""
+        return self._update_interval
+
+    @update_interval.setter
+    def update_interval(self, value: int):
+        if value < 0:
+            raise ValueError("update_interval must be >= 0")
+        self._update_interval = int(value)
+        self.macro._update_timer.setInterval(self._update_interval)
+
+    @property
+    def arg_size_limit(self) -> int | None:
+        """Arguments larger than this size (in bytes) are recorded as references."""
+        return self._arg_size_limit
+
+    @arg_size_limit.setter
+    def arg_size_limit(self, value: int | None):
+        if value is not None and value < 0:
+            raise ValueError("arg_size_limit must be >= 0 or None")
+        self._arg_size_limit = value
 
     @property
     def syntax_highlight(self) -> bool:
@@ -521,7 +715,15 @@ class GuiMacro(BaseMacro):
 
     def __init__(self, ui: BaseGui = None, options: dict[str, Any] = {}):
         self._blocking_sources = []
+        self._pending_setval: _SetvalRecord | None = None
         super().__init__()
+        # pending records and editor updates are flushed at most once per interval
+        self._update_timer = QtCore.QTimer()
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._on_update_timeout)
+        self._arguments = ArgumentStore()
+        self._spill_log: _SpillLog | None = None
+        self._journal: MacroJournal | None = None
         self.on_appended.append(self._on_macro_added)
         self.on_popped.append(self._on_macro_popped)
 
@@ -531,15 +733,42 @@ class GuiMacro(BaseMacro):
         now = datetime.now()
         self.append(Expr(Head.comment, [now.strftime("%Y/%m/%d %H:%M:%S")]))
 
-        self._stack_undo: list[ImplementsUndo] = []
-        self._stack_redo: list[tuple[Expr, ImplementsUndo]] = []
+        self._stack_undo = UndoStore()
+        self._stack_redo: deque[tuple[Expr, ImplementsUndo]] = deque()
+        # undo/redo requested while an asynchronous one is running
+        self._undo_queue: deque[Callable[[], None]] = deque()
+        self._undo_running = False
+        self._undo_worker: Callable[[], Any] = lambda: None  # weakref to the worker
+        # incremented when a new operation changes the undo history
+        self._undo_version = 0
         self.options.max_lines = options.get("macro-max-history", 10000)
         self.options.max_undo = options.get("undo-max-history", 100)
+        self.options.max_undo_bytes = options.get("undo-max-bytes", None)
+        self.options.undo_compression = options.get("undo-compression", None)
+        self.options.spill_path = options.get("macro-spill-path", None)
+        self.options.journal_path = options.get("macro-journal-path", None)
+        self.options.update_interval = options.get("macro-update-interval", 50)
+        self.options.arg_size_limit = options.get("macro-arg-size-limit", None)
         self.options.syntax_highlight = options.get("macro-highlight", False)
         self.options.attribute_check = options.get("macro-attribute-check", True)
         self.options.signature_check = options.get("macro-signature-check", True)
         self.options.name_check = options.get("macro-name-check", True)
 
+    @property
+    def _args(self) -> deque[Symbol | Expr]:
+        # Every access to the lines goes through this property, so that the
+        # pending value-widget record is always materialized before being read.
+        if self._pending_setval is not None:
+            self._materialize_setval()
+        return self._lines
+
+    @_args.setter
+    def _args(self, value: Iterable[Symbol | Expr]):
+        # deque for O(1) eviction of the oldest lines
+        self._lines: deque[Symbol | Expr] = deque(value)
+        self._index = MacroIndex()
+        self._index.rebuild(self._lines, [time.time()] * len(self._lines))
+
     @property
     def widget(self) -> MacroEdit:
         """Returns the macro editor."""
@@ -550,10 +779,32 @@ class GuiMacro(BaseMacro):
         """The parent GUI object."""
         return self.widget.__magicclass_parent__
 
+    @property
+    def arguments(self) -> ArgumentStore:
+        """Large arguments referred from the macro as `ui.macro.arguments[key]`."""
+        return self._arguments
+
+    def _as_argument(self, value: Any) -> Any:
+        """Convert a value to a reference if it is too large to be recorded."""
+        limit = self.options.arg_size_limit
+        if (
+            limit is None
+            or isinstance(value, (Symbol, Expr))
+            or argument_size(value) <= limit
+        ):
+            return value
+        key = self._arguments.store(value)
+        ui = self._gui_parent
+        macro = Expr(Head.getattr, [symbol(ui), Symbol("macro")])
+        store = Expr(Head.getattr, [macro, Symbol("arguments")])
+        return Expr(Head.getitem, [store, key])
+
     def clear_undo_stack(self) -> None:
         """Clear all the history of undo/redo."""
         self._stack_undo.clear()
         self._stack_redo.clear()
+        self._new_undo_version()
+        self._undo_queue.clear()
 
     def append_with_undo(
         self,
@@ -573,11 +824,58 @@ class GuiMacro(BaseMacro):
         self._append_undo(undo)
         return None
 
+    def _record_setval(
+        self,
+        key: Any,
+        make_target: Callable[[], Symbol | Expr],
+        value: Any,
+    ) -> None:
+        """
+        Record `target = value` lazily.
+
+        The expression is not constructed until the macro is read. Consecutive
+        records of the same `key` are collapsed into one line.
+        """
+        if (pending := self._pending_setval) is not None:
+            if pending.key is key:
+                pending.value = value
+                return None
+            self._materialize_setval()
+        last = self._last_setval
+        if (
+            isinstance(last, _SetvalRecord)
+            and last.key is key
+            and self._lines
+            and self._lines[-1] is last.expr
+        ):
+            self.pop()
+        self._pending_setval = _SetvalRecord(key, make_target, value)
+        self._request_update()
+        return None
+
+    def _materialize_setval(self) -> None:
+        if (record := self._pending_setval) is None:
+            return None
+        self._pending_setval = None
+        value = self._as_argument(record.value)
+        record.expr = Expr(Head.assign, [record.make_target(), value])
+        self.append(record.expr)
+        self._last_setval = record
+        return None
+
     def _append_undo(self, undo: ImplementsUndo) -> None:
+        # the oldest undo is discarded if the stack exceeds the limits
         self._stack_undo.append(undo)
         self._stack_redo.clear()
-        if len(self._stack_undo) > self.options.max_undo:
-            self._stack_undo.pop(0)
+        self._new_undo_version()
+        return None
+
+    def _new_undo_version(self) -> None:
+        self._undo_version += 1
+        if self._undo_running and (worker := self._undo_worker()) is not None:
+            # the running undo/redo is superseded by the new operation. It stops at
+            # the next yield.
+            worker.quit()
         return None
 
     def _pop_undo(self) -> ImplementsUndo:
@@ -590,17 +888,58 @@ class GuiMacro(BaseMacro):
         if n_undo == 0:
             undo = []
         else:
-            undo = [expr.copy() for expr in self.args[-n_undo:]]
+            start = max(len(self._args) - n_undo, 0)
+            undo = [expr.copy() for expr in islice(self._args, start, None)]
         return dict(
             undo=undo,
             redo=[expr.copy() for expr, _ in self._stack_redo],
         )
 
     def undo(self):
-        """Undo the last operation if undo is defined."""
+        """
+        Undo the last operation if undo is defined.
+
+        If the undo function is a generator or an async function, it runs in
+        another thread. Undo/redo requested meanwhile will be run after it. A new
+        operation done meanwhile aborts it at the next yield, and the operation
+        being undone stays in the history.
+        """
+        if self._undo_running:
+            self._undo_queue.append(self.undo)
+            return
         if len(self._stack_undo) == 0:
             return
         undo = self._stack_undo.pop()
+        if getattr(undo, "is_async", False):
+            expr = self.pop()
+            index = len(self)
+            version = self._undo_version
+            older = list(self._stack_undo)
+
+            # If a new operation is done while running, the redo stack has been
+            # cleared and the undo stack no longer ends with this operation.
+            def _on_returned():
+                if self._undo_version == version:
+                    self._stack_redo.append((expr, undo))
+                else:
+                    # undone after the new operation; the history is not reliable
+                    self.clear_undo_stack()
+
+            def _on_errored():
+                if self._undo_version == version:
+                    self.append(expr)
+                    self._stack_undo.append(undo)
+                else:
+                    # aborted by the new operation, which was done after this one
+                    self.insert(min(index, len(self)), expr)
+                    if _starts_with(self._stack_undo, older):
+                        self._stack_undo.insert(len(older), undo)
+                    else:
+                        self.clear_undo_stack()
+
+            return self._run_undo_async(
+                undo._iter_run, "undo", _on_returned, _on_errored
+            )
         try:
             with self.blocked():
                 undo.run()
@@ -612,14 +951,37 @@ class GuiMacro(BaseMacro):
             self._stack_redo.append((expr, undo))
 
     def redo(self):
-        """Redo the last undo operation."""
+        """
+        Redo the last undo operation.
+
+        If the custom redo function is a generator or an async function, it runs
+        in another thread. Undo/redo requested meanwhile will be run after it.
+        """
+        if self._undo_running:
+            self._undo_queue.append(self.redo)
+            return
         if len(self._stack_redo) == 0:
             return
         if not self.active:
             raise ValueError("Cannot redo when the macro is blocked.")
         expr, undo = self._stack_redo.pop()
+        redo_action = undo.redo_action
+        if redo_action.matches("custom") and redo_action.is_async:
+
+            version = self._undo_version
+
+            def _on_returned():
+                self.append(expr)
+                self._stack_undo.append(undo)
+
+            def _on_errored():
+                if self._undo_version == version:
+                    self._stack_redo.append((expr, undo))
+
+            return self._run_undo_async(
+                redo_action._iter_run, "redo", _on_returned, _on_errored
+            )
         try:
-            redo_action = undo.redo_action
             if redo_action.matches("default"):
                 ns = {self._gui_parent._my_symbol: self._gui_parent}
                 parent = self._gui_parent
@@ -640,12 +1002,59 @@ class GuiMacro(BaseMacro):
             self.append(expr)
             self._stack_undo.append(undo)
 
+    def _run_undo_async(
+        self,
+        iter_run: Callable[[], Any],
+        name: str,
+        on_returned: Callable[[], None],
+        on_errored: Callable[[], None],
+    ):
+        """Run undo/redo in a thread worker with a progress bar."""
+        succeeded = False
+
+        def _run(_gui):
+            nonlocal succeeded
+            out = yield from iter_run()
+            succeeded = True
+            return out
+
+        _run.__name__ = _run.__qualname__ = name
+
+        def _finished(_gui):
+            self._undo_running = False
+            if succeeded:
+                on_returned()
+            else:
+                self._undo_queue.clear()  # following requests are no longer valid
+                on_errored()
+            if self._undo_queue:
+                # callbacks are called with the macro blocked
+                QtCore.QTimer.singleShot(0, self._undo_queue.popleft())
+
+        worker = thread_worker(_run, progress={"desc": name}, force_async=True)
+        # GUI updates in callbacks should not be recorded, but the macro must not be
+        # blocked from the worker thread, otherwise operations done in the main thread
+        # meanwhile are lost.
+        worker._set_silencer(in_thread=False)
+        worker.finished.connect(_finished)
+        self._undo_running = True
+        method = worker.__get__(self._gui_parent)
+        try:
+            out = method()
+            self._undo_worker = method._worker
+            return out
+        except Exception:
+            if self._undo_running:  # worker was not started
+                self._undo_running = False
+                on_errored()
+            raise
+
     def copy(self) -> BaseMacro:
         """Copy the macro instance."""
         # GuiMacro does not support deepcopy (and apparently _widget should not be copied)
         from copy import deepcopy
 
-        return BaseMacro(deepcopy(self.args))
+        return BaseMacro(deepcopy(list(self.args)))
 
     @overload
     def __getitem__(self, key: int) -> Expr: ...
@@ -655,9 +1064,89 @@ class GuiMacro(BaseMacro):
 
     def __getitem__(self, key):
         if isinstance(key, slice):
-            return BaseMacro(self._args)[key]
+            return BaseMacro(list(self._args)[key])
         return super().__getitem__(key)
 
+    def insert(self, key: int, expr: Symbol | Expr | str):
+        nlines = len(self._args)
+        super().insert(key, expr)
+        if key >= nlines:
+            self._index.append(self._lines[-1])
+        else:
+            times = list(self._index.times)
+            pos = max(key + nlines, 0) if key < 0 else key
+            # keep the timestamps sorted
+            times.insert(pos, times[pos - 1] if pos > 0 else times[0])
+            self._index.rebuild(self._lines, times)
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            times = list(self._index.times)
+            lines = list(self._args)
+            lines[key] = value
+            positions = range(len(times))[key]
+            if key.step in (None, 1):
+                if times:
+                    fill = times[min(positions.start, len(times) - 1)]
+                else:
+                    fill = time.time()
+                times[key] = [fill] * (len(lines) - len(times) + len(positions))
+            self._lines = deque(lines)
+        else:
+            self._args[key] = value
+            times = list(self._index.times)
+        self._index.rebuild(self._lines, times)
+
+    def __delitem__(self, key):
+        nlines = len(self._args)
+        times = list(self._index.times)
+        if isinstance(key, slice):
+            lines = list(self._lines)
+            del lines[key]
+            del times[key]
+            self._lines = deque(lines)
+        else:
+            expr = self._lines[key]
+            del self._lines[key]
+            if key in (-1, nlines - 1):
+                return self._index.pop(expr)
+            del times[key]
+        self._index.rebuild(self._lines, times)
+
+    def find(
+        self,
+        method: str | None = None,
+        *,
+        target: str | None = None,
+        since: datetime | float | None = None,
+        until: datetime | float | None = None,
+    ) -> list[int]:
+        """
+        Find the lines of the macro.
+
+        >>> ui.macro.find(method="f", since=datetime.now() - timedelta(minutes=5))
+        >>> ui.macro.subset(ui.macro.find(target="B.x"))  # all the "ui.B.x = ..."
+
+        Parameters
+        ----------
+        method : str, optional
+            Name of the called method, such as "f" or "B.f".
+        target : str, optional
+            Name of the value widget or the attribute that is assigned, such as "x"
+            or "B.x".
+        since : datetime or float, optional
+            Find lines recorded at or after this time.
+        until : datetime or float, optional
+            Find lines recorded at or before this time.
+
+        Returns
+        -------
+        list of int
+            Indices of the lines that match all the given conditions.
+        """
+        self._materialize_setval()
+        return self._index.find(method, target, since, until)
+
     @contextmanager
     def blocked(self, source: Any | None = None):
         """Block macro recording in this context."""
@@ -683,6 +1172,119 @@ class GuiMacro(BaseMacro):
         else:
             raise NotImplementedError("Cannot set active=False")
 
+    def full_script(self) -> str:
+        """
+        Return the full script of the session.
+
+        Lines evicted from the macro because of `options.max_lines` are included
+        only if they are spilled to `options.spill_path`.
+        """
+        lines = [str(self)]
+        if self._spill_log is not None:
+            lines.insert(0, self._spill_log.read())
+        return "".join(lines)
+
+    def recover(self, path: str | Path, *, replay: bool = False) -> BaseMacro:
+        """
+        Recover the macro from a journal file.
+
+        Only the last session written to the file is recovered. The session being
+        written by this macro is skipped.
+
+        Parameters
+        ----------
+        path : str or Path
+            Path to the journal file, which is usually the `options.journal_path`
+            of the previous session.
+        replay : bool, default False
+            If true, the recovered macro will be executed. Otherwise, it will be
+            loaded into a new tab of the macro editor.
+
+        Returns
+        -------
+        BaseMacro
+            The recovered macro.
+        """
+        current = None if self._journal is None else self._journal.session
+        lines = read_journal(path, exclude=current)
+        recovered = BaseMacro([_parse_line(line) for _, line in lines])
+        if replay:
+            ui = self._gui_parent
+            ns = {ui._my_symbol: ui}
+            if (viewer := ui.parent_viewer) is not None:
+                ns.setdefault(Symbol.var("viewer"), viewer)
+            recovered.eval(ns)
+        else:
+            self.widget.new_tab(Path(path).stem, text=str(recovered))
+        return recovered
+
+    def compile(
+        self,
+        macro: BaseMacro | str | None = None,
+        *,
+        ns: dict[str, Any] = {},
+        headless: bool = False,
+    ) -> CompiledMacro:
+        """
+        Compile the macro into a single function for fast replay.
+
+        >>> compiled = ui.macro.compile(headless=True)
+        >>> report = compiled.run()  # report.times is the time spent on each line
+
+        Parameters
+        ----------
+        macro : BaseMacro or str, optional
+            The macro to compile. This macro is used by default.
+        ns : dict, optional
+            Additional namespace, such as the values of the variables in the macro.
+        headless : bool, default False
+            If true, methods of magic classes are called directly without macro
+            recording, validation and the GUI-related wrappers.
+        """
+        from ._replay import CompiledMacro
+
+        if macro is None:
+            macro = list(self._args)
+        elif isinstance(macro, str):
+            expr = parse(macro)
+            macro = expr.args if expr.head is Head.block else [expr]
+        ui = self._gui_parent
+        ns = dict(ns)
+        if (viewer := ui.parent_viewer) is not None:
+            ns.setdefault("viewer", viewer)
+        return CompiledMacro(macro, ui, ns, headless=headless)
+
+    def compact(self) -> int:
+        """
+        Remove redundant lines from the macro.
+
+        Following lines are removed.
+
+        - Assignments such as ``ui.x = 1`` overwritten before any method is called.
+        - Calls of an auto-call method immediately overwritten by the next call.
+        - ``ui.macro.undo()`` immediately cancelled by ``ui.macro.redo()``.
+
+        Returns
+        -------
+        int
+            Number of the removed lines.
+        """
+        lines = list(self._args)
+        kept = compact_lines(lines, self._gui_parent)
+        n_removed = len(lines) - len(kept)
+        if n_removed == 0:
+            return 0
+        n_unchanged = next((i for i, k in enumerate(kept) if i != k), len(kept))
+        if n_unchanged >= len(lines) - len(self._stack_undo):
+            # removed lines cannot be undone any more
+            self.clear_undo_stack()
+        times = self._index.times
+        self._lines = deque(lines[k] for k in kept)
+        self._index.rebuild(self._lines, [times[k] for k in kept])
+        self._last_setval = None
+        self.widget.native_macro.value = str(self)
+        return n_removed
+
     def subset(self, indices: Iterable[int]) -> BaseMacro:
         """Generate a subset of macro."""
         args = [self._args[i] for i in indices]
@@ -789,23 +1391,101 @@ class GuiMacro(BaseMacro):
                 wdt.changed()  # save as blocking=False for non-thread worker
         return None
 
+    def _request_update(self):
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _on_update_timeout(self):
+        self._materialize_setval()
+        self.widget._flush_updates()
+
     def _on_macro_added(self, expr=None):
         line = str(self.args[-1])
-        if wdt := self.widget.native_macro:
-            wdt.append(line)
-        if wdt := self.widget.recorded_macro:
-            wdt.append(line)
-        if len(self) > self.options.max_lines:
-            del self[0]
+        self.widget._queue_append(line)
+        self._request_update()
+        if self._journal is not None:
+            self._journal.record(line)
+        else:
+            self._open_journal()
+        while len(self._args) > self.options.max_lines:
+            evicted = self._args.popleft()
+            self._index.evict()
+            if (spill_log := self._get_spill_log()) is not None:
+                spill_log.write(evicted)
 
     def _on_macro_popped(self, expr=None):
-        self._erase_last()
+        self.widget._queue_erase(str(expr))
+        self._request_update()
+        if self._journal is not None:
+            self._journal.record_pop()
+        else:
+            self._open_journal()
+
+    def _is_root(self) -> bool:
+        # Every magic class has its own macro, but only the macro of the root is
+        # used. Files must not be opened by the macros of the child classes.
+        return getattr(self._gui_parent, "__magicclass_parent__", None) is None
+
+    def _open_journal(self) -> None:
+        """Open the journal and record all the current lines."""
+        if (path := self.options.journal_path) is None or not self._is_root():
+            return None
+        self._journal = MacroJournal(path)
+        for expr in self._args:
+            self._journal.record(expr)
+        return None
+
+    def _get_spill_log(self) -> _SpillLog | None:
+        if self._spill_log is None:
+            if (path := self.options.spill_path) is None or not self._is_root():
+                return None
+            self._spill_log = _SpillLog(path)
+        return self._spill_log
 
-    def _erase_last(self):
-        if wdt := self.widget.native_macro:
-            wdt.erase_last()
-        if wdt := self.widget.recorded_macro:
-            wdt.erase_last()
+
+class _SetvalRecord:
+    """Lightweight record of `target = value`."""
+
+    __slots__ = ("key", "make_target", "value", "expr")
+
+    def __init__(self, key: Any, make_target: Callable[[], Symbol | Expr], value):
+        self.key = key
+        self.make_target = make_target
+        self.value = value
+        self.expr: Expr | None = None
+
+
+def _parse_line(line: str) -> Symbol | Expr:
+    if line.startswith("#"):  # comments are dropped by `parse`
+        return Expr(Head.comment, [line[1:].strip()])
+    return parse(line)
+
+
+class _SpillLog:
+    """
+    Append-only log of the macro lines evicted from the memory.
+
+    The file is overwritten, so that it only contains the lines of this session.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._file = path.open("w", encoding="utf-8")
+        self._finalizer = weakref.finalize(self, self._file.close)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def write(self, expr: Symbol | Expr) -> None:
+        self._file.write(f"{expr}\n")
+
+    def read(self) -> str:
+        self._file.flush()
+        return self._path.read_text(encoding="utf-8")
+
+    def close(self) -> None:
+        self._finalizer()
 
 
 class DummyMacro(BaseMacro):
@@ -820,3 +1500,15 @@ class DummyMacro(BaseMacro):
 
     def clear_undo_stack(self) -> None:
         return None
+
+    def _record_setval(self, key, make_target, value) -> None:
+        return None
+
+    def _as_argument(self, value):
+        return value
+
+
+def _starts_with(stack: Iterable[Any], items: list[Any]) -> bool:
+    """True if the stack starts with the same objects as the items."""
+    head = list(islice(stack, len(items)))
+    return len(head) == len(items) and all(map(operator.is_, head, items))
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Iterator, NamedTuple
+from macrokit import Symbol, Expr, Head
+from macrokit.utils import check_call_args, check_attributes
+
+from magicclass.utils import get_member_table
+
+if TYPE_CHECKING:
+    from ._base import BaseGui
+
+_ATTRIBUTE = "attribute"
+_SIGNATURE = "signature"
+
+
+class ValidationResult(NamedTuple):
+    """Error messages of the attribute and signature checks."""
+
+    attribute_errors: list[str]
+    signature_errors: list[str]
+
+
+class MacroValidator:
+    """
+    Attribute and signature checker of macro with cache.
+
+    The results are cached per top-level statement, keyed by the source of the
+    statement. The cache is discarded when any of the magic classes are redefined or
+    modified, or when widgets are added to or removed from the instances.
+
+    Parameters
+    ----------
+    maxsize : int, default 4096
+        Maximum number of cached statements.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self._cache: OrderedDict[tuple[str, str], list[str]] = OrderedDict()
+        self._maxsize = maxsize
+        self._version: tuple[_GuiVersion, ...] = ()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(hits={self.hits}, misses={self.misses}, "
+            f"currsize={len(self._cache)})"
+        )
+
+    def clear(self) -> None:
+        """Clear the cache."""
+        with self._lock:
+            self._cache.clear()
+            self._version = ()
+
+    def validate(
+        self,
+        code: Expr,
+        ui: BaseGui,
+        ns: dict[Symbol | str, Any],
+        attribute: bool = True,
+        signature: bool = True,
+        version: tuple[_GuiVersion, ...] | None = None,
+    ) -> ValidationResult:
+        """
+        Check the code and return the error messages.
+
+        The version of the GUI can be given if it is already computed in the GUI
+        thread, so that widgets are not accessed from another thread.
+        """
+        if version is None:
+            version = _gui_version(ui)
+        with self._lock:
+            if len(version) != len(self._version) or not all(
+                map(_GuiVersion.same, version, self._version)
+            ):
+                self._cache.clear()
+                self._version = version
+        out = ValidationResult([], [])
+        for stmt in _iter_statements(code):
+            source = str(stmt)
+            if attribute:
+                out.attribute_errors.extend(
+                    self._check(_ATTRIBUTE, source, stmt, ns, check_attributes)
+                )
+            if signature:
+                out.signature_errors.extend(
+                    self._check(_SIGNATURE, source, stmt, ns, check_call_args)
+                )
+        return out
+
+    def _check(
+        self,
+        kind: str,
+        source: str,
+        stmt: Expr,
+        ns: dict[Symbol | str, Any],
+        checker: Callable[[Expr, dict], list],
+    ) -> list[str]:
+        key = (kind, source)
+        with self._lock:
+            if (cached := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+        errors = [str(exc) for exc in checker(Expr(Head.block, [stmt]), ns)]
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = errors
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return errors
+
+
+def _iter_statements(code: Symbol | Expr) -> Iterator[Symbol | Expr]:
+    if isinstance(code, Expr) and code.head is Head.block:
+        yield from code.args
+    else:
+        yield code
+
+
+class _GuiVersion(NamedTuple):
+    member_table: Any  # renewed when the class is updated
+    instance_state: tuple[Any, ...]
+
+    def same(self, other: _GuiVersion) -> bool:
+        return (
+            self.member_table is other.member_table
+            and self.instance_state == other.instance_state
+        )
+
+
+def _gui_version(ui: BaseGui) -> tuple[_GuiVersion, ...]:
+    """Versions of all the magic classes and their instances."""
+    out: list[_GuiVersion] = []
+    stack = [ui]
+    while stack:
+        gui = stack.pop()
+        # widgets appended to the instance can be accessed as attributes
+        state = (id(gui), tuple(getattr(w, "name", None) for w in gui._list))
+        out.append(_GuiVersion(get_member_table(type(gui)), state))
+        # iterate without building deferred children
+        stack.extend(weakref.WeakSet.__iter__(gui.__magicclass_children__))
+    return tuple(sorted(out, key=lambda v: v.instance_state[0]))
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Sequence
+from macrokit import Symbol, Expr, Head
+
+from magicclass.signature import get_additional_option
+from ._macro_index import index_keys
+
+if TYPE_CHECKING:
+    from ._base import BaseGui
+
+_COMMENT = "comment"
+_STORE = "store"
+_AUTO_CALL = "auto_call"
+_UNDO = "undo"
+_REDO = "redo"
+_OTHER = "other"
+
+
+def compact_lines(lines: Sequence[Symbol | Expr], ui: BaseGui) -> list[int]:
+    """
+    Return the indices of the lines that are kept after compaction.
+
+    Following lines are removed.
+
+    1. Pairs of ``ui.macro.undo()`` and ``ui.macro.redo()`` that cancel each other.
+    2. Calls of an auto-call method that are overwritten by the next call.
+    3. Assignments that are overwritten before any call reads the value.
+    """
+    root = ui._my_symbol.name
+    auto_call_cache: dict[str, bool] = {}
+    kinds: list[tuple[str, str | None]] = []
+    for line in lines:
+        kind, key = _classify(line, root)
+        if kind == _OTHER and key is not None:
+            if (is_auto_call := auto_call_cache.get(key)) is None:
+                is_auto_call = auto_call_cache[key] = _is_auto_call(ui, key)
+            if is_auto_call:
+                kind = _AUTO_CALL
+        kinds.append((kind, key))
+
+    removed: set[int] = set()
+
+    # undo-redo pairs
+    stack: list[int] = []
+    for i, (kind, _) in enumerate(kinds):
+        if kind == _COMMENT:
+            continue
+        if kind == _REDO and stack and kinds[stack[-1]][0] == _UNDO:
+            removed.update((stack.pop(), i))
+        else:
+            stack.append(i)
+
+    # repeated auto-call
+    prev: int | None = None
+    for i, (kind, key) in enumerate(kinds):
+        if kind == _COMMENT or i in removed:
+            continue
+        if prev is not None and kind == _AUTO_CALL and kinds[prev] == (kind, key):
+            removed.add(prev)
+        prev = i
+
+    # dead stores
+    overwritten: set[str] = set()
+    for i in reversed(range(len(kinds))):
+        kind, key = kinds[i]
+        if kind == _COMMENT or i in removed:
+            continue
+        if kind == _STORE:
+            if key in overwritten:
+                removed.add(i)
+            else:
+                overwritten.add(key)
+        else:
+            overwritten.clear()
+
+    return [i for i in range(len(kinds)) if i not in removed]
+
+
+def _classify(line: Symbol | Expr, root: str) -> tuple[str, str | None]:
+    if not isinstance(line, Expr):
+        return _OTHER, None
+    if line.head is Head.comment:
+        return _COMMENT, None
+    method, target = index_keys(line)
+    if not _is_rooted(line.args[0], root):
+        return _OTHER, None
+    if target is not None and _is_pure(line.args[1], root):
+        return _STORE, target
+    if method is not None:
+        if len(line.args) == 1 and method in ("macro.undo", "macro.redo"):
+            return (_UNDO if method == "macro.undo" else _REDO), None
+        return _OTHER, method
+    return _OTHER, None
+
+
+def _is_rooted(expr: Symbol | Expr, root: str) -> bool:
+    while isinstance(expr, Expr) and expr.head is Head.getattr:
+        expr = expr.args[0]
+    return isinstance(expr, Symbol) and expr.name == root
+
+
+def _is_pure(expr: Any, root: str) -> bool:
+    """True if evaluating the expression does not call or read the GUI."""
+    if not isinstance(expr, Expr):
+        return True
+    if expr.head is Head.call:
+        return False
+    if expr.head is Head.getattr:
+        # references to large arguments are allowed
+        return not _is_rooted(expr, root) or str(expr).startswith(f"{root}.macro.")
+    return all(_is_pure(arg, root) for arg in expr.args)
+
+
+def _is_auto_call(ui: BaseGui, key: str) -> bool:
+    *owners, name = key.split(".")
+    obj = ui
+    try:
+        for owner in owners:
+            obj = getattr(obj, owner)
+        method = getattr(type(obj), name)
+    except Exception:
+        return False
+    return bool(get_additional_option(method, "auto_call", False))
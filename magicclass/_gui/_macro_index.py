@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime
+import time
+from typing import Iterable, NamedTuple
+from macrokit import Symbol, Expr, Head
+
+_VALUE = "value"
+_CALL_WITH_RETURN = "_call_with_return_callback"
+
+
+class IndexKeys(NamedTuple):
+    """Method and widget target of a macro line, such as "B.f" or "B.x"."""
+
+    method: str | None
+    target: str | None
+
+
+class MacroIndex:
+    """
+    Secondary index of macro lines by method, widget target and time.
+
+    Lines are identified by serial numbers that never change. The serial number of the
+    first line increases when the oldest line is evicted.
+    """
+
+    def __init__(self):
+        self._start = 0  # serial number of the first line
+        self._times: deque[float] = deque()
+        self._methods: dict[str, deque[int]] = {}
+        self._targets: dict[str, deque[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def append(self, expr: Symbol | Expr, timestamp: float | None = None) -> None:
+        """Index a line appended to the end."""
+        serial = self._start + len(self._times)
+        self._times.append(time.time() if timestamp is None else timestamp)
+        for table, key in zip((self._methods, self._targets), index_keys(expr)):
+            if key is None:
+                continue
+            for name in _lookup_names(key):
+                table.setdefault(name, deque()).append(serial)
+
+    def pop(self, expr: Symbol | Expr) -> None:
+        """Remove the last line from the index."""
+        self._times.pop()
+        serial = self._start + len(self._times)
+        for table, key in zip((self._methods, self._targets), index_keys(expr)):
+            if key is None:
+                continue
+            for name in _lookup_names(key):
+                serials = table.get(name)
+                if serials and serials[-1] == serial:
+                    serials.pop()
+
+    def evict(self) -> None:
+        """Remove the first line from the index."""
+        # stale serial numbers are removed on query
+        self._times.popleft()
+        self._start += 1
+
+    def rebuild(self, lines: Iterable[Symbol | Expr], times: Iterable[float]) -> None:
+        """Rebuild the index from scratch."""
+        self._methods.clear()
+        self._targets.clear()
+        self._times.clear()
+        for expr, timestamp in zip(lines, times):
+            self.append(expr, timestamp)
+
+    @property
+    def times(self) -> deque[float]:
+        """Timestamps of the lines."""
+        return self._times
+
+    def find(
+        self,
+        method: str | None = None,
+        target: str | None = None,
+        since: datetime | float | None = None,
+        until: datetime | float | None = None,
+    ) -> list[int]:
+        """Return the positions of the lines that match all the conditions."""
+        start = self._start
+        lo = 0
+        hi = len(self._times)
+        if since is not None:
+            lo = bisect_left(self._times, _as_timestamp(since))
+        if until is not None:
+            hi = bisect_right(self._times, _as_timestamp(until))
+        candidates: set[int] | None = None
+        for table, key in [(self._methods, method), (self._targets, target)]:
+            if key is None:
+                continue
+            serials = table.get(key, deque())
+            while serials and serials[0] < start:
+                serials.popleft()
+            found = {s - start for s in serials}
+            candidates = found if candidates is None else candidates & found
+        if candidates is None:
+            return list(range(lo, hi))
+        return sorted(i for i in candidates if lo <= i < hi)
+
+
+def index_keys(expr: Symbol | Expr) -> IndexKeys:
+    """Get the method and the widget target of a line, without the root symbol."""
+    if not isinstance(expr, Expr):
+        return IndexKeys(None, None)
+    if expr.head is Head.call:
+        path = _getattr_path(expr.args[0])
+        if path is None or len(path) < 2:
+            return IndexKeys(None, None)
+        if path[-1] == _CALL_WITH_RETURN and len(expr.args) > 1:
+            name = expr.args[1]
+            path = path[:-1] + [str(name.eval() if isinstance(name, Symbol) else name)]
+        return IndexKeys(".".join(path[1:]), None)
+    if expr.head is Head.assign:
+        path = _getattr_path(expr.args[0])
+        if path is None or len(path) < 2:
+            return IndexKeys(None, None)
+        if path[-1] == _VALUE and len(path) > 2:
+            path = path[:-1]
+        return IndexKeys(None, ".".join(path[1:]))
+    return IndexKeys(None, None)
+
+
+def _getattr_path(expr: Symbol | Expr) -> list[str] | None:
+    if isinstance(expr, Symbol):
+        return [expr.name]
+    if isinstance(expr, Expr) and expr.head is Head.getattr:
+        try:
+            return [str(sym) for sym in expr.split_getattr()]
+        except ValueError:
+            return None
+    return None
+
+
+def _lookup_names(key: str) -> list[str]:
+    """Names that can be used to find the key, such as "f", "B.f" and "A.B.f"."""
+    parts = key.split(".")
+    return [".".join(parts[i:]) for i in range(len(parts))]
+
+
+def _as_timestamp(t: datetime | float) -> float:
+    if isinstance(t, datetime):
+        return t.timestamp()
+    return float(t)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING
+import uuid
+import weakref
+
+if TYPE_CHECKING:
+    from macrokit import Symbol, Expr
+
+_POP = "pop"
+_EXPR = "expr"
+_TIME = "time"
+_SESSION = "session"
+
+
+class _Flush:
+    """Request to flush the journal file, set when done."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_CLOSE = object()
+
+
+class MacroJournal:
+    """
+    Append-only journal of the recorded macro.
+
+    Every recorded expression is written to the file as a JSON line of its source
+    text and the timestamp. Removal of the last line (such as undo) is also
+    recorded. Lines are written, flushed and fsynced in a background thread so that
+    macro recording never waits for the disk. Each journal starts with a marker of
+    a new session, so that the sessions appended to the same file can be told
+    apart.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the journal file. Lines are appended if the file exists.
+    interval : float, default 0.2
+        Lines recorded within this period (in seconds) are written to the disk at
+        once.
+    """
+
+    def __init__(self, path: str | Path, interval: float = 0.2):
+        self._path = Path(path)
+        self._session = uuid.uuid4().hex
+        self._queue: queue.SimpleQueue[str | _Flush | object] = queue.SimpleQueue()
+        self._queue.put(json.dumps({_TIME: _now(), _SESSION: self._session}))
+        self._thread = threading.Thread(
+            target=_write_loop,
+            args=(self._path, self._queue, interval),
+            name=f"MacroJournal({self._path.name})",
+            daemon=True,
+        )
+        self._thread.start()
+        self._finalizer = weakref.finalize(self, _close, self._queue, self._thread)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self._path)!r})"
+
+    @property
+    def path(self) -> Path:
+        """Path to the journal file."""
+        return self._path
+
+    @property
+    def session(self) -> str:
+        """ID of the session written by this journal."""
+        return self._session
+
+    @property
+    def closed(self) -> bool:
+        """True if the journal is closed."""
+        return not self._finalizer.alive
+
+    def record(self, expr: Symbol | Expr) -> None:
+        """Record an appended expression."""
+        self._put({_TIME: _now(), _EXPR: str(expr)})
+
+    def record_pop(self) -> None:
+        """Record removal of the last expression."""
+        self._put({_TIME: _now(), _POP: True})
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all the recorded lines are written to the disk."""
+        if self.closed:
+            return True
+        req = _Flush()
+        self._queue.put(req)
+        return req.done.wait(timeout)
+
+    def close(self) -> None:
+        """Write all the pending lines and stop the writer thread."""
+        self._finalizer()
+
+    def _put(self, obj: dict) -> None:
+        if self.closed:
+            raise RuntimeError(f"{self!r} is already closed.")
+        self._queue.put(json.dumps(obj))
+
+
+def read_journal(
+    path: str | Path, exclude: str | None = None
+) -> list[tuple[datetime, str]]:
+    """
+    Read the last session of a journal file.
+
+    The recorded lines of the last session are returned with their timestamps.
+    Removed lines are excluded. An incomplete last entry, which is left when the
+    process was killed while writing, is ignored.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the journal file.
+    exclude : str, optional
+        ID of the session to be skipped, such as the session being written now.
+    """
+    sessions: list[tuple[str | None, list[tuple[datetime, str]]]] = [(None, [])]
+    with open(path, encoding="utf-8") as f:
+        for entry in f:
+            try:
+                obj = json.loads(entry)
+            except json.JSONDecodeError:
+                continue
+            lines = sessions[-1][1]
+            if _SESSION in obj:
+                sessions.append((obj[_SESSION], []))
+            elif obj.get(_POP):
+                if lines:
+                    lines.pop()
+            elif _EXPR in obj:
+                lines.append((datetime.fromisoformat(obj[_TIME]), obj[_EXPR]))
+    for session, lines in reversed(sessions):
+        if lines and (session is None or session != exclude):
+            return lines  # empty sessions are skipped
+    return []
+
+
+def _write_loop(path: Path, q: queue.SimpleQueue, interval: float):
+    with open(path, "a", encoding="utf-8") as f:
+        closing = False
+        while not closing:
+            batch: list[str] = []
+            flushes: list[_Flush] = []
+            item = q.get()
+            deadline = time.monotonic() + interval
+            while True:
+                if item is _CLOSE:
+                    closing = True
+                elif isinstance(item, _Flush):
+                    flushes.append(item)
+                else:
+                    batch.append(item)
+                if closing or flushes:
+                    break  # items queued before these are already in the batch
+                try:
+                    item = q.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            if batch:
+                f.write("\n".join(batch) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            for req in flushes:
+                req.done.set()
+
+
+def _close(q: queue.SimpleQueue, thread: threading.Thread):
+    q.put(_CLOSE)
+    thread.join()
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
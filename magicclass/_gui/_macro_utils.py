@@ -40,6 +40,9 @@ def value_widget_callback(
     else:
         sub = sym_name
 
+    def _make_target():
+        return Expr(Head.getattr, [symbol(gui), sub])
+
     def _set_value(value):
         if not widget.enabled or not gui.macro.active:
             # If widget is read only, it means that value is set in script (not
@@ -48,19 +51,12 @@ def value_widget_callback(
 
         gui.changed.emit(gui)
 
-        # Make an expression of
+        # Record an expression of
         # >>> x.name.value = value
         # or
         # >>> x.name = value
-        target = Expr(Head.getattr, [symbol(gui), sub])
-        expr = Expr(Head.assign, [target, widget.value])
-
-        if gui.macro._last_setval == target and len(gui.macro) > 0:
-            gui.macro.pop()
-        else:
-            gui.macro._last_setval = target
-
-        gui.macro.append(expr)
+        # The expression is constructed only when the macro is read.
+        gui.macro._record_setval(_set_value, _make_target, widget.value)
         gui.macro.clear_undo_stack()
         return None
 
@@ -112,7 +108,7 @@ class MagicGuiPostRunCallback(Generic[_P, _R]):
                     )
         else:
             if isinstance(out, UndoCallback):
-                gui.macro._stack_undo.append(out.with_name(str(expr)))
+                gui.macro._append_undo(out.with_name(str(expr)))
             else:
                 gui.macro.clear_undo_stack()
         gui.macro.append(expr)
@@ -300,7 +296,7 @@ def _define_macro_recorder(sig: inspect.Signature, func: Callable):
 
         def _record_macro(bgui: MagicTemplate, out, *args, **kwargs):
             bound = sig.bind(*args, **kwargs)
-            expr = Expr.parse_method(bgui, func, *_format_arguments(bound))
+            expr = Expr.parse_method(bgui, func, *_format_arguments(bgui, bound))
             if _auto_call:
                 # Auto-call will cause many redundant macros. To avoid this, only the
                 # last input will be recorded in magic-class.
@@ -328,7 +324,7 @@ def _define_macro_recorder(sig: inspect.Signature, func: Callable):
 
         def _record_macro(bgui: MagicTemplate, out, *args, **kwargs):
             bound = sig.bind(*args, **kwargs)
-            _args, _kwargs = _format_arguments(bound)
+            _args, _kwargs = _format_arguments(bgui, bound)
             expr = Expr.parse_method(bgui, _cname_, (func.__name__,) + _args, _kwargs)
             if _auto_call:
                 # Auto-call will cause many redundant macros. To avoid this, only the
@@ -366,7 +362,7 @@ def _define_macro_recorder_for_partial(
         def _record_macro(bgui: MagicTemplate, out, *args, **kwargs):
             bound = sig.bind(*args, **kwargs)
             bound.apply_defaults()
-            expr = Expr.parse_method(bgui, base_func, *_format_arguments(bound))
+            expr = Expr.parse_method(bgui, base_func, *_format_arguments(bgui, bound))
             if _auto_call:
                 # Auto-call will cause many redundant macros. To avoid this, only the
                 # last input will be recorded in magic-class.
@@ -396,7 +392,7 @@ def _define_macro_recorder_for_partial(
             bound = sig.bind(*args, **kwargs)
             bound.apply_defaults()
             kwargs = bound.arguments
-            _args, _kwargs = _format_arguments(bound)
+            _args, _kwargs = _format_arguments(bgui, bound)
             expr = Expr.parse_method(
                 bgui, _cname_, (base_func.__name__,) * _args, _kwargs
             )
@@ -428,14 +424,15 @@ def _is_recordable(func: Callable):
     return False
 
 
-def _format_arguments(bound: inspect.BoundArguments):
+def _format_arguments(bgui: MagicTemplate, bound: inspect.BoundArguments):
     """Use keyword argument as much as possible"""
     args = []
     kwargs = {}
     bound.apply_defaults()
+    as_argument = bgui.macro._as_argument  # large values are recorded as references
     for name, param in bound.signature.parameters.items():
         if param.kind is inspect.Parameter.POSITIONAL_ONLY:
-            args.append(bound.arguments[name])
+            args.append(as_argument(bound.arguments[name]))
         else:
-            kwargs[name] = bound.arguments[name]
+            kwargs[name] = as_argument(bound.arguments[name])
     return tuple(args), kwargs
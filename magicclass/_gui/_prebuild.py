@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections import deque
+import time
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+import weakref
+from qtpy import QtCore
+
+from magicclass._gui.mgui_ext import is_clickable, WidgetAction
+
+if TYPE_CHECKING:
+    from magicclass._gui._base import BaseGui
+    from magicclass._gui.mgui_ext import Clickable
+
+
+class PrebuildRecord(NamedTuple):
+    """Record of a prebuilt FunctionGui."""
+
+    name: str
+    seconds: float
+
+
+class FunctionGuiPrebuilder:
+    """
+    Build FunctionGuis of the buttons while the Qt event loop is idle.
+
+    A zero-interval timer is fired only when the event queue is empty. Each time it
+    fires, FunctionGuis are built one by one until the time slice is used up, so that
+    the GUI never stalls for longer than the time slice.
+
+    Parameters
+    ----------
+    ui : BaseGui
+        The root magic class.
+    time_slice : float, default 0.01
+        Maximum time in seconds spent in each idle callback.
+    """
+
+    def __init__(self, ui: BaseGui, time_slice: float = 0.01):
+        self._ui_ref = weakref.ref(ui)
+        self._time_slice = time_slice
+        self._queue: deque[tuple[str, Clickable]] = deque()
+        self._records: list[PrebuildRecord] = []
+        self._started = False
+        self._timer = QtCore.QTimer()
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._on_idle)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(prebuilt={len(self._records)}, "
+            f"pending={len(self._queue)})"
+        )
+
+    @property
+    def records(self) -> list[PrebuildRecord]:
+        """List of the prebuilt FunctionGuis and the time spent for each."""
+        return list(self._records)
+
+    @property
+    def n_prebuilt(self) -> int:
+        """Number of FunctionGuis built so far."""
+        return len(self._records)
+
+    @property
+    def n_pending(self) -> int:
+        """Number of FunctionGuis waiting to be built."""
+        return len(self._queue)
+
+    @property
+    def finished(self) -> bool:
+        """True if prebuild is started and all the FunctionGuis are built."""
+        return self._started and not self._timer.isActive()
+
+    def start(self) -> None:
+        """Collect the visible buttons and start prebuilding when idle."""
+        if self._started or (ui := self._ui_ref()) is None:
+            return None
+        self._started = True
+        self._queue.extend(_iter_clickables(ui))
+        if self._queue:
+            self._timer.start()
+        return None
+
+    def stop(self) -> None:
+        """Stop prebuilding."""
+        self._timer.stop()
+        self._queue.clear()
+        return None
+
+    def run_all(self) -> None:
+        """Build all the pending FunctionGuis now."""
+        while self._queue:
+            self._build_next()
+        self._timer.stop()
+        return None
+
+    def _on_idle(self):
+        t_end = time.perf_counter() + self._time_slice
+        while self._queue and time.perf_counter() < t_end:
+            self._build_next()
+        if not self._queue:
+            self._timer.stop()
+
+    def _build_next(self):
+        name, widget = self._queue.popleft()
+        if widget.mgui is not None or (builder := widget._mgui_builder) is None:
+            return None
+        t0 = time.perf_counter()
+        try:
+            builder()
+        except Exception:
+            # Errors will be raised again when the button is clicked.
+            return None
+        self._records.append(PrebuildRecord(name, time.perf_counter() - t0))
+        return None
+
+
+def _iter_clickables(ui: BaseGui) -> Iterator[tuple[str, Clickable]]:
+    if ui._deferred_build is not None:
+        # not built yet; don't force building
+        return
+    qualname = type(ui).__qualname__
+    for child in ui:
+        if isinstance(child, WidgetAction):
+            child = child.widget
+        if is_clickable(child) and child.visible:
+            yield f"{qualname}.{child.name}", child
+    for child in weakref.WeakSet.__iter__(ui.__magicclass_children__):
+        yield from _iter_clickables(child)
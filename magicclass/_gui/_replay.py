@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterable, NamedTuple
+from macrokit import Symbol, Expr, Head, parse
+
+from magicclass.utils import thread_worker
+from ._macro_utils import _IS_RECORDABLE
+
+if TYPE_CHECKING:
+    from ._base import BaseGui
+
+_FUNC = Symbol("__magicclass_replay__")
+_RESOLVE = Symbol("__resolve__")
+_TIMER = Symbol("__timer__")
+_TIMES = Symbol("__times__")
+_T0 = Symbol("__t0__")
+_T1 = Symbol("__t1__")
+
+
+class ReplayReport(NamedTuple):
+    """Lines of the replayed macro and the time spent on each line in seconds."""
+
+    lines: list[str]
+    times: list[float]
+
+    @property
+    def total(self) -> float:
+        """Total time in seconds."""
+        return sum(self.times)
+
+    def slowest(self, n: int = 10) -> list[tuple[float, str]]:
+        """Return the `n` slowest lines with their time."""
+        return sorted(zip(self.times, self.lines), reverse=True)[:n]
+
+
+class CompiledMacro:
+    """
+    Macro compiled into a single function for fast replay.
+
+    Attribute lookups of the called methods, such as ``ui.child.method``, are
+    resolved once before the first line is executed.
+
+    Parameters
+    ----------
+    lines : iterable of Expr
+        Lines of the macro.
+    ui : BaseGui
+        The magic class that the macro is executed on.
+    ns : dict, optional
+        Additional namespace.
+    headless : bool, default False
+        If true, methods of magic classes are called directly without macro
+        recording, validation and the GUI-related wrappers.
+    """
+
+    def __init__(
+        self,
+        lines: Iterable[Symbol | Expr],
+        ui: BaseGui,
+        ns: dict[Symbol | str, Any] = {},
+        headless: bool = False,
+    ):
+        self._ui = ui
+        self._headless = headless
+        self._lines: list[Symbol | Expr] = [
+            line
+            for line in lines
+            if not (isinstance(line, Expr) and line.head is Head.comment)
+        ]
+        self._ns = dict(ns)
+        self._ns.setdefault(ui._my_symbol, ui)
+        self._func: Callable[[Callable, Callable, list[float]], None] | None = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self._lines)} lines>)"
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    @property
+    def headless(self) -> bool:
+        """True if methods are called directly."""
+        return self._headless
+
+    def run(self) -> ReplayReport:
+        """Execute the macro and return the time spent on each line."""
+        if self._func is None:
+            self._func = self._compile()
+        times: list[float] = []
+        resolve = _resolve_headless if self._headless else getattr
+        if self._headless:
+            with self._ui.macro.blocked():
+                self._func(resolve, time.perf_counter, times)
+        else:
+            self._func(resolve, time.perf_counter, times)
+        return ReplayReport([str(line) for line in self._lines], times)
+
+    def _compile(self):
+        hoisted: dict[str, Symbol] = {}
+        prologue: list[Expr] = []
+        body: list[Symbol | Expr] = [parse(f"{_T0} = {_TIMER}()")]
+        record_time = [
+            parse(f"{_T1} = {_TIMER}()"),
+            parse(f"{_TIMES}.append({_T1} - {_T0})"),
+            parse(f"{_T0} = {_T1}"),
+        ]
+        root = self._ui._my_symbol
+        for line in self._lines:
+            if (split := _split_method_call(line, root)) is not None:
+                owner, name = split
+                key = f"{owner}.{name}"
+                if (sym := hoisted.get(key)) is None:
+                    sym = hoisted[key] = Symbol(f"__f{len(hoisted)}__")
+                    resolved = Expr(Head.call, [_RESOLVE, owner, name])
+                    prologue.append(Expr(Head.assign, [sym, resolved]))
+                line = Expr(Head.call, [sym] + line.args[1:])
+            body.append(line)
+            body.extend(record_time)
+        func_def = Expr(
+            Head.function,
+            [
+                Expr(Head.call, [_FUNC, _RESOLVE, _TIMER, _TIMES]),
+                Expr(Head.block, prologue + body),
+            ],
+        )
+        # Expr.eval deep-copies the whole expression to rename the registered
+        # modules, which is too slow for a long macro. Compile the source directly.
+        code = compile(str(func_def), "<macro>", "exec")
+        _globals = _stored_namespace(
+            self._lines, {str(k): v for k, v in self._ns.items()}
+        )
+        exec(code, _globals)
+        return _globals[_FUNC.name]
+
+
+def _split_method_call(line: Symbol | Expr, root: Symbol) -> tuple[Expr, str] | None:
+    """Split ``ui.a.b.f(...)`` into ``ui.a.b`` and ``"f"``."""
+    if not (isinstance(line, Expr) and line.head is Head.call):
+        return None
+    target = line.args[0]
+    if not (isinstance(target, Expr) and target.head is Head.getattr):
+        return None
+    try:
+        _ui, *attrs, last = target.split_getattr()
+    except ValueError:
+        return None
+    if not (isinstance(_ui, Symbol) and _ui.name == root.name):
+        return None
+    owner = _ui
+    for attr in attrs:
+        owner = Expr(Head.getattr, [owner, attr])
+    return owner, last.name
+
+
+def _stored_namespace(
+    lines: Iterable[Symbol | Expr], ns: dict[str, Any]
+) -> dict[str, Any]:
+    """Namespace of the registered objects used in the lines, updated with `ns`."""
+    out: dict[str, Any] = {}
+    for sym in _iter_free_symbols(lines):
+        if sym.name in out or sym.name in ns:
+            continue
+        try:
+            out[sym.name] = sym.eval()
+        except Exception:  # not registered, such as a local variable
+            pass
+    out.update(ns)
+    return out
+
+
+def _iter_free_symbols(args: Iterable[Any]) -> Iterable[Symbol]:
+    """Iterate over the symbols that are looked up as names."""
+    for arg in args:
+        if isinstance(arg, Symbol):
+            if not arg.constant:
+                yield arg
+        elif isinstance(arg, Expr):
+            if arg.head is Head.getattr:
+                # attribute names are not looked up
+                yield from _iter_free_symbols(arg.args[:1])
+            elif arg.head is Head.kw:
+                yield from _iter_free_symbols(arg.args[1:])
+            else:
+                yield from _iter_free_symbols(arg.args)
+
+
+def _resolve_headless(owner: Any, name: str) -> Any:
+    """Resolve the method defined in the class, not the recordable one."""
+    attr = getattr(type(owner), name, None)
+    if (
+        getattr(attr, _IS_RECORDABLE, False)
+        and not isinstance(attr, thread_worker)
+        and (func := getattr(attr, "__wrapped__", None)) is not None
+    ):
+        return func.__get__(owner)
+    return getattr(owner, name)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+import os
+import sys
+import tempfile
+import weakref
+import zlib
+from typing import TYPE_CHECKING, Any, Iterator, Literal
+
+from magicclass.undo import ImplementsUndo, UndoCallback
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CompressionMode = Literal["zlib", "mmap"]
+
+_MIN_PACK_BYTES = 1 << 16  # small arrays are not worth packing
+_CHUNK_SIZE = 1 << 22
+
+
+class UndoStore:
+    """
+    Stack of undo operations bounded by the number and the total size.
+
+    Parameters
+    ----------
+    maxlen : int, default 100
+        Maximum number of undo operations.
+    max_bytes : int, optional
+        Maximum total size of the payloads in bytes. The oldest operations are
+        discarded when exceeded, but the latest one is always kept.
+    compression : "zlib" or "mmap", optional
+        If given, large arrays in the payloads are compressed or moved to a
+        memory-mapped temporary file, and reloaded when the undo is executed. Arrays
+        referenced from outside of the undo operation, such as the arrays of the
+        application state, are kept as they are.
+    """
+
+    def __init__(
+        self,
+        maxlen: int = 100,
+        max_bytes: int | None = None,
+        compression: CompressionMode | None = None,
+    ):
+        self._stack: deque[ImplementsUndo] = deque()
+        self._maxlen = maxlen
+        self._max_bytes = max_bytes
+        self._compression = compression
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} operations>, nbytes={self.nbytes})"
+
+    def __len__(self) -> int:
+        return len(self._stack)
+
+    def __iter__(self) -> Iterator[ImplementsUndo]:
+        return iter(self._stack)
+
+    @property
+    def maxlen(self) -> int:
+        """Maximum number of undo operations."""
+        return self._maxlen
+
+    @maxlen.setter
+    def maxlen(self, value: int):
+        self._maxlen = value
+        self._evict()
+
+    @property
+    def max_bytes(self) -> int | None:
+        """Maximum total size of the payloads in bytes."""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int | None):
+        self._max_bytes = value
+        self._evict()
+
+    @property
+    def compression(self) -> CompressionMode | None:
+        """Compression mode of the large array payloads."""
+        return self._compression
+
+    @compression.setter
+    def compression(self, value: CompressionMode | None):
+        if value not in (None, "zlib", "mmap"):
+            raise ValueError(
+                f"compression must be 'zlib', 'mmap' or None, not {value!r}"
+            )
+        self._compression = value
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the payloads in bytes."""
+        return sum(_nbytes(undo) for undo in self._stack)
+
+    def append(self, undo: ImplementsUndo) -> None:
+        self.insert(len(self._stack), undo)
+
+    def insert(self, index: int, undo: ImplementsUndo) -> None:
+        if self._compression is not None and isinstance(undo, UndoCallback):
+            undo._pack(_PACKERS[self._compression])
+        self._stack.insert(index, undo)
+        self._evict()
+
+    def pop(self) -> ImplementsUndo:
+        # packed payloads are reloaded when the undo is run
+        return self._stack.pop()
+
+    def clear(self) -> None:
+        self._stack.clear()
+
+    def _evict(self):
+        while len(self._stack) > self._maxlen:
+            self._stack.popleft()
+        if self._max_bytes is None:
+            return None
+        nbytes = self.nbytes
+        while len(self._stack) > 1 and nbytes > self._max_bytes:
+            nbytes -= _nbytes(self._stack.popleft())
+        return None
+
+
+def _nbytes(undo: ImplementsUndo) -> int:
+    return getattr(undo, "nbytes", 0)
+
+
+def _is_large_array(obj: Any) -> bool:
+    if (np := sys.modules.get("numpy")) is None:
+        return False
+    return isinstance(obj, np.ndarray) and obj.nbytes >= _MIN_PACK_BYTES
+
+
+class PackedArray(ABC):
+    """Array payload that is reloaded on demand."""
+
+    nbytes: int
+
+    @abstractmethod
+    def load(self) -> np.ndarray:
+        """Reload the array."""
+
+
+class ZlibArray(PackedArray):
+    """Array compressed chunk by chunk."""
+
+    def __init__(self, arr: np.ndarray):
+        import numpy as np
+
+        arr = np.ascontiguousarray(arr)
+        self._dtype = arr.dtype
+        self._shape = arr.shape
+        buf = arr.reshape(-1).view(np.uint8)
+        self._chunks = [
+            zlib.compress(buf[i : i + _CHUNK_SIZE], 1)
+            for i in range(0, buf.size, _CHUNK_SIZE)
+        ]
+        self.nbytes = sum(len(chunk) for chunk in self._chunks)
+
+    def load(self) -> np.ndarray:
+        import numpy as np
+
+        out = np.empty(self._shape, dtype=self._dtype)
+        buf = out.reshape(-1).view(np.uint8)
+        start = 0
+        for chunk in self._chunks:
+            data = zlib.decompress(chunk)
+            buf[start : start + len(data)] = np.frombuffer(data, dtype=np.uint8)
+            start += len(data)
+        return out
+
+
+class MemmapArray(PackedArray):
+    """Array moved to a memory-mapped temporary file."""
+
+    nbytes = 0  # not in memory
+
+    def __init__(self, arr: np.ndarray):
+        import numpy as np
+
+        fd, path = tempfile.mkstemp(prefix="magicclass-undo-", suffix=".dat")
+        os.close(fd)
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+        mmap = np.memmap(path, dtype=arr.dtype, mode="w+", shape=arr.shape)
+        mmap[...] = arr
+        mmap.flush()
+        self._path = path
+        self._dtype = arr.dtype
+        self._shape = arr.shape
+
+    def load(self) -> np.ndarray:
+        import numpy as np
+
+        mmap = np.memmap(self._path, dtype=self._dtype, mode="r", shape=self._shape)
+        out = np.array(mmap)
+        del mmap
+        return out
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _pack_array(cls: type[PackedArray]):
+    def _pack(obj: Any) -> Any:
+        if _is_large_array(obj):
+            return cls(obj)
+        return obj
+
+    return _pack
+
+
+_PACKERS = {"zlib": _pack_array(ZlibArray), "mmap": _pack_array(MemmapArray)}
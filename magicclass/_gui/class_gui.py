@@ -5,7 +5,6 @@ import warnings
 from psygnal import Signal
 from qtpy.QtWidgets import QMenuBar, QWidget, QMainWindow, QBoxLayout, QDockWidget
 from qtpy.QtCore import Qt
-from magicgui.application import use_app
 from magicgui.widgets import (
     Container,
     MainWindow,
@@ -34,9 +33,12 @@ from magicclass._gui._base import (
     PopUpMode,
     ErrorMode,
     normalize_insertion,
+    reset_choices_of,
     defaults,
 )
-from magicclass._gui.utils import format_error, connect_magicclasses, TYPES_IGNORE
+from magicclass._gui.utils import format_error, connect_magicclasses, get_text_width
+from magicclass._gui._build_plan import BuildPlan
+from magicclass._gui._deferred import RevealFilter, is_revealed
 from magicclass._gui._macro_utils import value_widget_callback
 from magicclass.widgets import (
     ButtonContainer,
@@ -58,7 +60,7 @@ from magicclass.widgets import (
 from magicclass.widgets._box import Box
 from magicclass.box._fields import BoxMagicField
 
-from magicclass.utils import iter_members, Tooltips, move_to_screen_center
+from magicclass.utils import move_to_screen_center
 from magicclass.fields import MagicField
 from magicclass.signature import get_additional_option
 from magicclass._app import run_app
@@ -120,26 +122,24 @@ class ClassGuiBase(BaseGui):
         """This function is called in dynamically created __init__.
         Methods, fields and nested classes are converted to magicgui widgets.
         """
-        cls = self.__class__
+        plan = BuildPlan.get(
+            self.__class__,
+            self._container_widget,
+            ClassGuiBase,
+            exclude=ClassGuiBase.__annotations__.keys(),
+        )
 
         # Add class docstring as tooltip.
-        _tooltips = Tooltips(cls)
-        self.tooltip = _tooltips.desc
+        self.tooltip = plan.tooltip
 
         # Bind all the methods and annotations
         n_insert = 0
-        base_members = {x[0] for x in iter_members(self._container_widget)}
-        base_members |= {x[0] for x in iter_members(ClassGuiBase)}
-
         _hist: list[tuple[str, str, str]] = []  # for traceback
-        _annot = ClassGuiBase.__annotations__.keys()
-
-        for name, attr in filter(lambda x: x[0] not in base_members, iter_members(cls)):
-            if name in _annot or isinstance(attr, TYPES_IGNORE):
-                continue
 
+        for member in plan:
+            name, attr = member.name, member.attr
             try:
-                widget = self._convert_an_attribute_into_widget(name, attr, _tooltips)
+                widget = self._convert_an_attribute_into_widget(member)
 
                 if isinstance(widget, MenuGui):
                     # Add menubar to container
@@ -263,6 +263,9 @@ class ClassGuiBase(BaseGui):
                     # Now, "widget" is a Widget object. Add widget in a way similar to
                     # "insert" method of Container.
                     if widget.name.startswith("_"):
+                        if getattr(widget, "_deferred_build", None) is not None:
+                            # private classes are built when shown as a window
+                            widget._build_when_revealed(parent=self)
                         continue
 
                     moveto = get_additional_option(attr, "into")
@@ -272,6 +275,8 @@ class ClassGuiBase(BaseGui):
                     else:
                         self._fast_insert(n_insert, widget)
                         n_insert += 1
+                        if getattr(widget, "_deferred_build", None) is not None:
+                            widget._build_when_revealed(parent=self)
 
                     _hist.append((name, str(type(attr)), type(widget).__name__))
 
@@ -280,6 +285,23 @@ class ClassGuiBase(BaseGui):
 
         self._unify_label_widths()
 
+    def _build_deferred(self) -> None:
+        """Build the child widgets if the construction was deferred."""
+        if (build := self._deferred_build) is None:
+            return None
+        self._deferred_build = None
+        with self.macro.blocked():
+            build()
+        return None
+
+    def _build_when_revealed(self, parent: BaseGui | None = None) -> None:
+        """Build the deferred child widgets now, or when they are revealed."""
+        if is_revealed(self, parent):
+            self._build_deferred()
+        else:
+            self._reveal_filter = RevealFilter(self)
+        return None
+
     def _fast_insert(
         self, key: int, obj: Widget | Callable, remove_label: bool = False
     ) -> None:
@@ -331,8 +353,22 @@ class ClassGuiBase(BaseGui):
         else:
             object.__setattr__(self, name, value)
 
-    def reset_choices(self, *_: Any):
-        """Reset child Categorical widgets"""
+    def reset_choices(self, *_: Any, only=None):
+        """
+        Reset child Categorical widgets.
+
+        Parameters
+        ----------
+        only : str, widget, callable or list of them, optional
+            If given, only reset the choices of these targets. A string is the name
+            of a widget or a choices provider method. If a choices provider is
+            given, its memoized result is discarded and all the widgets that use it
+            are reset.
+        """
+        if only is not None:
+            return reset_choices_of(self, only)
+        if self._deferred_build is not None:
+            return None  # choices will be set on construction
         all_widgets: set[Widget] = set()
 
         for item in self._list:
@@ -370,6 +406,8 @@ class ClassGuiBase(BaseGui):
         if mcls_parent is not None and self.name.startswith("_") and was_not_visible:
             move_to_screen_center(self.native)
         self.native.activateWindow()
+        if self._prebuilder is not None:
+            self._prebuilder.start()
         if run:
             run_app()
 
@@ -390,13 +428,12 @@ class ClassGuiBase(BaseGui):
         _close(self)
 
     def _unify_label_widths(self):
-        if not self._initialized:
+        if not self._initialized or self._batch_depth > 0:
             return
 
         need_labels = [w for w in self._list if not isinstance(w, _HIDE_LABELS)]
         if self.layout == "vertical" and self.labels and need_labels:
-            measure = use_app().get_obj("get_text_width")
-            widest_label = max(measure(w.label) for w in need_labels)
+            widest_label = max(get_text_width(w.label) for w in need_labels)
             for w in self:
                 labeled_widget = w._labeled_widget()
                 if labeled_widget:
@@ -572,10 +609,26 @@ def make_gui(
             cls.remove_dock_widget = remove_dock_widget
             cls.status = status
 
+        def __getitem__(self: ClassGuiBase, key):
+            if self._deferred_build is not None:
+                self._build_deferred()
+            return container.__getitem__(self, key)
+
+        def __iter__(self: ClassGuiBase):
+            if self._deferred_build is not None:
+                self._build_deferred()
+            return container.__iter__(self)
+
+        def __len__(self: ClassGuiBase) -> int:
+            if self._deferred_build is not None:
+                self._build_deferred()
+            return container.__len__(self)
+
         cls.__init__ = __init__
         cls.__delitem__ = container.__delitem__
-        cls.__iter__ = container.__iter__
-        cls.__len__ = container.__len__
+        cls.__getitem__ = __getitem__
+        cls.__iter__ = __iter__
+        cls.__len__ = __len__
         cls.__dir__ = ClassGuiBase.__dir__
         cls._unify_label_widths = ClassGuiBase._unify_label_widths
         cls.__setattr__ = ClassGuiBase.__setattr__
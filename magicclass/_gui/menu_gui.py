@@ -21,11 +21,11 @@ from magicclass._gui._base import (
     ContainerLikeGui,
     normalize_insertion,
 )
-from magicclass._gui.utils import TYPES_IGNORE, format_error
+from magicclass._gui.utils import format_error
+from magicclass._gui._build_plan import BuildPlan
 
 from magicclass.signature import get_additional_option, upgrade_signature
 from magicclass.widgets import Separator, FreeWidget
-from magicclass.utils import iter_members, Tooltips
 
 
 def _check_popupmode(popup_mode: PopUpMode):
@@ -75,23 +75,18 @@ class MenuGuiBase(ContainerLikeGui):
         return self._native
 
     def _convert_attributes_into_widgets(self):
-        cls = self.__class__
+        plan = BuildPlan.get(self.__class__, MenuGuiBase)
 
         # Add class docstring as tooltip.
-        _tooltips = Tooltips(cls)
-        self.tooltip = _tooltips.desc
+        self.tooltip = plan.tooltip
 
         # Bind all the methods and annotations
-        base_members = {x[0] for x in iter_members(MenuGuiBase)}
-
         _hist: list[tuple[str, str, str]] = []  # for traceback
 
-        for name, attr in filter(lambda x: x[0] not in base_members, iter_members(cls)):
-            if isinstance(attr, TYPES_IGNORE):
-                continue
-
+        for member in plan:
+            name, attr = member.name, member.attr
             try:
-                widget = self._convert_an_attribute_into_widget(name, attr, _tooltips)
+                widget = self._convert_an_attribute_into_widget(member)
 
                 if isinstance(widget, BaseGui):
                     if isinstance(widget, MenuGuiBase):
@@ -29,6 +29,22 @@ class PaletteEvents(QtCore.QObject):
         return super().eventFilter(obj, event)
 
 
+class LazyTooltip(QtCore.QObject):
+    """Set the tooltip of a widget when Qt requests it for the first time."""
+
+    def __init__(self, qwidget: QtW.QWidget, getter: Callable[[], str]):
+        super().__init__(qwidget)
+        self._getter = getter
+        qwidget.installEventFilter(self)
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if event.type() == QtCore.QEvent.Type.ToolTip:
+            obj.removeEventFilter(self)
+            if not obj.toolTip():  # tooltip may be given by other ways
+                obj.setToolTip(self._getter())
+        return False
+
+
 class PushButtonPlus(PushButton):
     """A Qt specific PushButton widget with a magicgui bound."""
 
@@ -37,9 +53,11 @@ class PushButtonPlus(PushButton):
         self.native: QtW.QPushButton
         self._icon = None
         self.mgui: FunctionGuiPlus | None = None  # tagged function GUI
+        self._mgui_builder: Callable[[], FunctionGuiPlus] | None = None
         self._doc = ""
         self._unwrapped = False
         self._get_running: Callable[[], bool] | None = None
+        self._tooltip_getter: Callable[[], str] | None = None
         self._widget._event_filter.paletteChanged.connect(self._update_icon)
 
     @property
@@ -57,6 +75,11 @@ class PushButtonPlus(PushButton):
         """Set keyboard shortcut to the button."""
         self.native.setShortcut(key)
 
+    def _set_lazy_tooltip(self, getter: Callable[[], str]):
+        """Set the tooltip using the getter when it is requested."""
+        self._tooltip_getter = getter
+        LazyTooltip(self.native, getter)
+
     def reset_choices(self, *_: Any):
         """Reset child Categorical widgets."""
         if self.mgui is not None:
@@ -271,6 +294,7 @@ class Action(AbstractAction):
     ):
         self._native = QtW.QAction(*args, **kwargs)
         self.mgui: FunctionGuiPlus | None = None
+        self._mgui_builder: Callable[[], FunctionGuiPlus] | None = None
         self._doc = ""
         self._unwrapped = False
 
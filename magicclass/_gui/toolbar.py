@@ -22,7 +22,8 @@ from magicclass._gui._base import (
     ContainerLikeGui,
     normalize_insertion,
 )
-from magicclass._gui.utils import TYPES_IGNORE, format_error, connect_magicclasses
+from magicclass._gui.utils import format_error, connect_magicclasses
+from magicclass._gui._build_plan import BuildPlan
 from magicclass._gui.menu_gui import (
     ContextMenuGui,
     MenuGui,
@@ -32,7 +33,7 @@ from magicclass._gui.menu_gui import (
 
 from magicclass.signature import get_additional_option
 from magicclass.widgets import FreeWidget, Separator
-from magicclass.utils import iter_members, Tooltips
+from magicclass.utils import Tooltips
 
 if TYPE_CHECKING:
     import napari
@@ -127,23 +128,18 @@ class ToolBarGui(ContainerLikeGui):
         return super()._update_icon()
 
     def _convert_attributes_into_widgets(self):
-        cls = self.__class__
+        plan = BuildPlan.get(self.__class__, ToolBarGui)
 
         # Add class docstring as tooltip.
-        _tooltips = Tooltips(cls)
-        self.native.setToolTip(_tooltips.desc)
+        self.native.setToolTip(plan.tooltip)
 
         # Bind all the methods and annotations
-        base_members = {x[0] for x in iter_members(ToolBarGui)}
-
         _hist: list[tuple[str, str, str]] = []  # for traceback
 
-        for name, attr in filter(lambda x: x[0] not in base_members, iter_members(cls)):
-            if isinstance(attr, TYPES_IGNORE):
-                continue
-
+        for member in plan:
+            name, attr = member.name, member.attr
             try:
-                widget = self._convert_an_attribute_into_widget(name, attr, _tooltips)
+                widget = self._convert_an_attribute_into_widget(member)
 
                 if isinstance(widget, BaseGui):
                     if isinstance(widget, MenuGui):
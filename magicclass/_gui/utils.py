@@ -1,20 +1,24 @@
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING, Callable, TypeVar
+from typing import Any, TYPE_CHECKING, Callable, NamedTuple, TypeVar
 from typing_extensions import deprecated
-from types import FunctionType
-from magicgui.widgets import FunctionGui, Widget
+from functools import lru_cache
+from types import FunctionType, MethodType
+import weakref
+from qtpy import QtWidgets as QtW
+from magicgui.application import use_app
+from magicgui.widgets import FunctionGui, Widget, EmptyWidget, FileEdit
 from magicgui.types import Undefined
 from magicgui.type_map import get_widget_class
 from magicgui.signature import magic_signature, MagicParameter
 
 from macrokit import Symbol
 from magicclass._exceptions import MagicClassConstructionError
-from magicclass.signature import split_annotated_type
+from magicclass.signature import split_annotated_type, get_additional_option
+from magicclass.utils import argcount
 
 if TYPE_CHECKING:
     from ._base import BaseGui
-    from magicgui.widgets import FileEdit
 
 
 def get_parameters(fgui: FunctionGui):
@@ -106,6 +110,73 @@ def callable_to_classes(f: Callable) -> list[tuple[type[Widget], MagicParameter]
     return [(_parameter_to_widget_class(p), p) for p in sig.parameters.values()]
 
 
+class CallableInfo(NamedTuple):
+    """Information of a method needed to create a button."""
+
+    nparams: int  # number of parameters except for empty and bound ones
+    first_is_file_edit: bool
+    has_preview: bool
+
+
+# function -> (signature, info). Any change of the signature options replaces the
+# `__signature__` attribute, so the cached info is valid only if the stored signature
+# is identical to the current one.
+_CALLABLE_INFO: weakref.WeakKeyDictionary[FunctionType, tuple[Any, CallableInfo]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_callable_info(method: Callable, func: Callable) -> CallableInfo:
+    """
+    Get the information of a method that is converted into a button.
+
+    Parameters
+    ----------
+    method : callable
+        The original method, such as a bound method of a magic class.
+    func : callable
+        The method converted by the magic class, which is to be analyzed.
+    """
+    if isinstance(method, MethodType) and isinstance(method.__func__, FunctionType):
+        origin = method.__func__
+    else:
+        return _analyze_callable(func)
+    sig = getattr(origin, "__signature__", None)
+    if (cached := _CALLABLE_INFO.get(origin)) is not None and cached[0] is sig:
+        return cached[1]
+    info = _analyze_callable(func)
+    _CALLABLE_INFO[origin] = (sig, info)
+    return info
+
+
+def _analyze_callable(func: Callable) -> CallableInfo:
+    fgui_info = callable_to_classes(func)
+    n_empty = sum(
+        1
+        for _wdg_cls, _prm in fgui_info
+        if _wdg_cls is EmptyWidget or _prm.options.get("bind", None) is not None
+    )
+    if len(fgui_info) == 0:
+        first_is_file_edit = False
+    else:
+        first_is_file_edit = issubclass(fgui_info[0][0], FileEdit)
+    return CallableInfo(
+        nparams=argcount(func) - n_empty,
+        first_is_file_edit=first_is_file_edit,
+        has_preview=get_additional_option(func, "preview", None) is not None,
+    )
+
+
+def get_text_width(text: str) -> int:
+    """Return the width required to render the text, cached for each font."""
+    return _get_text_width(text, QtW.QApplication.font().key())
+
+
+@lru_cache(maxsize=2048)
+def _get_text_width(text: str, font_key: str) -> int:
+    return use_app().get_obj("get_text_width")(text)
+
+
 def show_dialog_from_mgui(mgui: FunctionGui):
     """Show file dialog from given magicgui widget."""
     fdialog: FileEdit = mgui[0]
@@ -6,7 +6,6 @@ import pathlib
 import datetime
 import magicgui as mgui
 from magicclass.types import Color, Colormap, Path, ExprStr
-from magicclass.widgets import ColorEdit, EvalLineEdit, ColormapEdit
 from magicclass._gui._base import MagicTemplate
 
 # classes
@@ -55,9 +54,10 @@ def find_myname(gui: MagicTemplate):
         return Expr(Head.getattr, [find_myname(parent), gui._my_symbol])
 
 
-mgui.register_type(Color, widget_type=ColorEdit)
-mgui.register_type(Colormap, widget_type=ColormapEdit)
+# widget classes are given by names so that they are imported only when needed
+mgui.register_type(Color, widget_type="magicclass.widgets.ColorEdit")
+mgui.register_type(Colormap, widget_type="magicclass.widgets.ColormapEdit")
 mgui.register_type(Path.Save, widget_type="FileEdit", mode="w")
 mgui.register_type(Path.Dir, widget_type="FileEdit", mode="d")
 mgui.register_type(Path.Multiple, widget_type="FileEdit", mode="rm")
-mgui.register_type(ExprStr, widget_type=EvalLineEdit)
+mgui.register_type(ExprStr, widget_type="magicclass.widgets.EvalLineEdit")
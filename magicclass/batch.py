@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import ast
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import os
+from pathlib import PurePath
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, TYPE_CHECKING
+from macrokit import Symbol, Expr, BaseMacro, Head, parse, symbol
+
+if TYPE_CHECKING:
+    from magicclass._gui import BaseGui
+
+__all__ = ["run_macro", "parametrize", "BatchResult"]
+
+
+class BatchResult(NamedTuple):
+    """Result of running a macro for an input."""
+
+    index: int
+    input: Mapping[str, Any]
+    value: Any = None
+    error: BaseException | None = None
+    time: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if the macro finished without error."""
+        return self.error is None
+
+
+def parametrize(macro: BaseMacro | str, **params: Any) -> BaseMacro:
+    """
+    Replace the recorded values in a macro with variables.
+
+    >>> ui.f(Path("/data/a.tif"), 10)
+    >>> parametrize(ui.macro, path=Path("/data/a.tif"))  # ui.f(path=path, n=10)
+
+    Parameters
+    ----------
+    macro : BaseMacro or str
+        The macro to parametrize.
+    **params
+        Mapping from variable names to the values recorded in the macro.
+    """
+    if isinstance(macro, str):
+        expr = parse(macro)
+        lines = expr.args if expr.head is Head.block else [expr]
+    else:
+        lines = list(macro)
+    mapping = [(value, Symbol.var(name)) for name, value in params.items()]
+    return BaseMacro([_substitute(line, mapping) for line in lines])
+
+
+def run_macro(
+    cls: type[BaseGui],
+    macro: BaseMacro | str,
+    inputs: Iterable[Mapping[str, Any]],
+    *,
+    workers: int | None = None,
+    headless: bool = True,
+    output: Callable[[BaseGui], Any] | None = None,
+    progress: Callable[[int, int], Any] | None = None,
+) -> list[BatchResult]:
+    """
+    Run a macro for many inputs.
+
+    For each input, a new instance of `cls` is created without being shown, and the
+    macro is executed with the input as its namespace.
+
+    >>> macro = parametrize(ui.macro, path=Path("/data/a.tif"))
+    >>> results = run_macro(A, macro, [{"path": p} for p in paths], workers=4)
+
+    Parameters
+    ----------
+    cls : magicclass type
+        The magic class. It must be importable if `workers` is not 0.
+    macro : BaseMacro or str
+        The macro to run. Use `parametrize` to make variables from recorded values.
+    inputs : iterable of mapping
+        Values of the variables in the macro for each run.
+    workers : int, optional
+        Number of worker processes. Each process has its own offscreen Qt
+        application. If 0, the macro is run in this process one by one. The number of
+        CPUs is used by default.
+    headless : bool, default True
+        Run the macro in the headless mode. See `GuiMacro.compile` for details.
+    output : callable, optional
+        Function that takes the magic class instance after the run and returns the
+        result value. It must be picklable if `workers` is not 0.
+    progress : callable, optional
+        Called with the number of finished runs and the total number of runs.
+
+    Returns
+    -------
+    list of BatchResult
+        Results in the same order as `inputs`.
+    """
+    source = str(macro)
+    inputs = [dict(ns) for ns in inputs]
+    results: list[BatchResult | None] = [None] * len(inputs)
+    total = len(inputs)
+    if workers == 0:
+        from magicclass._app import get_app
+
+        get_app()
+        for i, ns in enumerate(inputs):
+            results[i] = _run_one(cls, source, i, ns, headless, output)
+            if progress is not None:
+                progress(i + 1, total)
+        return results
+
+    ctx = multiprocessing.get_context("spawn")  # forking a Qt application is unsafe
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker) as ex:
+        futures = {
+            ex.submit(_run_one, cls, source, i, ns, headless, output): i
+            for i, ns in enumerate(inputs)
+        }
+        for n_done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:  # the worker died or the result is not picklable
+                results[i] = BatchResult(i, inputs[i], error=e)
+            if progress is not None:
+                progress(n_done, total)
+    return results
+
+
+def _init_worker():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from magicclass._app import get_app
+
+    get_app()
+
+
+def _run_one(
+    cls: type[BaseGui],
+    source: str,
+    index: int,
+    ns: dict[str, Any],
+    headless: bool,
+    output: Callable[[BaseGui], Any] | None,
+) -> BatchResult:
+    ui: BaseGui | None = None
+    try:
+        ui = cls()
+        report = ui.macro.compile(source, ns=ns, headless=headless).run()
+        value = output(ui) if output is not None else None
+    except Exception as e:
+        return BatchResult(index, ns, error=e)
+    finally:
+        if ui is not None:
+            ui.close()
+            ui.native.deleteLater()
+    return BatchResult(index, ns, value=value, time=report.total)
+
+
+def _substitute(expr: Any, mapping: list[tuple[Any, Symbol]]) -> Any:
+    if isinstance(expr, Expr):
+        return Expr(expr.head, [_substitute(arg, mapping) for arg in expr.args])
+    if isinstance(expr, Symbol) and expr.constant:
+        for value, var in mapping:
+            if _matches(expr, value):
+                return var
+    return expr
+
+
+def _matches(sym: Symbol, value: Any) -> bool:
+    if sym.name == str(symbol(value)):
+        return True
+    try:
+        literal = ast.literal_eval(sym.name)
+    except (ValueError, SyntaxError):
+        return False
+    if isinstance(value, PurePath):
+        return literal == str(value)
+    return type(literal) is type(value) and literal == value
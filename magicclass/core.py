@@ -34,6 +34,8 @@ from magicclass._gui._base import (
     convert_attributes,
 )
 from magicclass._gui import ContextMenuGui, MenuGui, ToolBarGui
+from magicclass._gui._prebuild import FunctionGuiPrebuilder, PrebuildRecord
+from magicclass._gui._deferred import consume_deferring
 from magicclass._app import get_app
 from magicclass.types import WidgetType
 
@@ -47,12 +49,19 @@ if TYPE_CHECKING:
     from magicclass._gui import MenuGuiBase
     from magicclass._gui.mgui_ext import Clickable
     from magicclass._gui._function_gui import FunctionGuiPlus
-    from magicclass.types import WidgetTypeStr, PopUpModeStr, ErrorModeStr
+    from magicclass.types import (
+        WidgetTypeStr,
+        PopUpModeStr,
+        ErrorModeStr,
+        PrebuildModeStr,
+    )
     from magicclass.help import HelpWidget
     from macrokit import Macro
 
 _BASE_CLASS_SUFFIX = ":base"
 
+_COLLAPSIBLE_TYPES = (WidgetType.collapsible, WidgetType.hcollapsible)
+
 _TYPE_MAP: dict[WidgetType, type[ClassGuiBase]] = {
     WidgetType.none: ClassGui,
     WidgetType.scrollable: ScrollableClassGui,
@@ -90,6 +99,8 @@ def magicclass(
     use_native_menubar: bool = True,
     record: bool = True,
     symbol: str = "ui",
+    prebuild: PrebuildModeStr | None = None,
+    lazy: bool = False,
 ):
     """
     Decorator that can convert a Python class into a widget.
@@ -134,6 +145,16 @@ def magicclass(
         If True, macro recording is enabled.
     symbol : str, default "ui"
         The identifier used in macro to represent this widget.
+    prebuild : "none" or "idle", optional
+        If "idle", FunctionGuis of the visible buttons are built in small time slices
+        while the application is idle after the widget is shown, so that the first
+        click does not stall. Buttons that run without a dialog are skipped. Use
+        `get_prebuild_records` to see the results.
+    lazy : bool, default False
+        If True, nested magic classes that are not visible, such as the contents of
+        non-current tabs or pages, are built when they are revealed for the first time.
+        If this class is a collapsible container, its contents are built when it is
+        expanded for the first time.
 
     Returns
     -------
@@ -150,6 +171,8 @@ def magicclass(
         widget_type = widget_type.lower()
 
     widget_type = WidgetType(widget_type)
+    if prebuild not in (None, "none", "idle"):
+        raise ValueError(f"prebuild must be 'none' or 'idle', got {prebuild!r}.")
 
     def wrapper(cls) -> type[ClassGui]:
         if not isinstance(cls, type):
@@ -201,27 +224,38 @@ def magicclass(
                 gui_kwargs.update(kwargs)
                 kwargs = {}
 
-            class_gui.__init__(self, **gui_kwargs)
-
-            with self.macro.blocked():
-                super(oldclass, self).__init__(*args, **kwargs)
-
-            self._convert_attributes_into_widgets()
+            with consume_deferring() as deferred:
+                class_gui.__init__(self, **gui_kwargs)
+                self._lazy = lazy
 
-            if widget_type in (WidgetType.collapsible, WidgetType.button):
-                self.text = self.name
-
-            if icon:
-                self.icon = icon
-            if stylesheet:
-                self.native.setStyleSheet(str(stylesheet))
-            if hasattr(self, "__post_init__"):
                 with self.macro.blocked():
-                    self.__post_init__()
-            if properties:
-                for k, v in properties.items():
-                    setattr(self, k, v)
-            self._my_symbol = _as_symbol(symbol)
+                    super(oldclass, self).__init__(*args, **kwargs)
+
+                if deferred or (lazy and widget_type in _COLLAPSIBLE_TYPES):
+                    # children will be built when they are revealed
+                    self._deferred_build = self._convert_attributes_into_widgets
+                else:
+                    self._convert_attributes_into_widgets()
+
+                if widget_type in (WidgetType.collapsible, WidgetType.button):
+                    self.text = self.name
+
+                if icon:
+                    self.icon = icon
+                if stylesheet:
+                    self.native.setStyleSheet(str(stylesheet))
+                if hasattr(self, "__post_init__"):
+                    with self.macro.blocked():
+                        self.__post_init__()
+                if properties:
+                    for k, v in properties.items():
+                        setattr(self, k, v)
+                self._my_symbol = _as_symbol(symbol)
+                if prebuild == "idle":
+                    self._prebuilder = FunctionGuiPrebuilder(self)
+                if self._deferred_build is not None and not deferred:
+                    # deferring requested by the parent is resolved by the parent.
+                    self._build_when_revealed()
 
         newclass.__init__ = __init__
 
@@ -367,18 +401,20 @@ def _call_magicmenu(
                 gui_kwargs.update(kwargs)
                 kwargs = {}
 
-            menugui_class.__init__(self, **gui_kwargs)
+            # menus are never deferred
+            with consume_deferring():
+                menugui_class.__init__(self, **gui_kwargs)
 
-            with self.macro.blocked():
-                super(oldclass, self).__init__(*args, **kwargs)
+                with self.macro.blocked():
+                    super(oldclass, self).__init__(*args, **kwargs)
 
-            self._convert_attributes_into_widgets()
+                self._convert_attributes_into_widgets()
 
-            if icon:
-                self.icon = icon
-            if hasattr(self, "__post_init__"):
-                with self.macro.blocked():
-                    self.__post_init__()
+                if icon:
+                    self.icon = icon
+                if hasattr(self, "__post_init__"):
+                    with self.macro.blocked():
+                        self.__post_init__()
 
         newclass.__init__ = __init__
 
@@ -520,6 +556,22 @@ def get_function_gui(
     return mgui
 
 
+def get_prebuild_records(ui: MagicTemplate) -> list[PrebuildRecord]:
+    """
+    Get the records of FunctionGuis prebuilt in the idle time.
+
+    Prebuild is enabled by `magicclass(prebuild="idle")`. Each record is a tuple of
+    the method name and the time in seconds spent for building the FunctionGui.
+
+    >>> for name, seconds in get_prebuild_records(ui):
+    ...     print(name, seconds)
+    """
+    prebuilder = ui._search_parent_magicclass()._prebuilder
+    if prebuilder is None:
+        return []
+    return prebuilder.records
+
+
 def update_widget_state(ui: MagicTemplate, macro: Macro | str | None = None) -> None:
     """
     Update widget values based on a macro.
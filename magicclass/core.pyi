@@ -11,7 +11,14 @@ from magicclass._gui.class_gui import ClassGuiBase
 from magicclass._gui._base import PopUpMode, ErrorMode, MagicTemplate
 
 if TYPE_CHECKING:
-    from magicclass.types import WidgetType, WidgetTypeStr, PopUpModeStr, ErrorModeStr
+    from magicclass.types import (
+        WidgetType,
+        WidgetTypeStr,
+        PopUpModeStr,
+        ErrorModeStr,
+        PrebuildModeStr,
+    )
+    from magicclass._gui._prebuild import PrebuildRecord
     from magicclass._gui._function_gui import FunctionGuiPlus
     from magicclass.stylesheets import StyleSheet
     from magicclass.help import HelpWidget
@@ -40,6 +47,7 @@ def get_button(ui: MagicTemplate, name: str, cache: bool = False) -> Clickable:
 def get_function_gui(method: MethodType) -> FunctionGuiPlus: ...
 @overload
 def get_function_gui(ui: MagicTemplate, name: str) -> FunctionGuiPlus: ...
+def get_prebuild_records(ui: MagicTemplate) -> list[PrebuildRecord]: ...
 @overload
 def magicclass(
     class_: type[_M],
@@ -57,6 +65,9 @@ def magicclass(
     properties: dict[str, Any] | None = None,
     use_native_menubar: bool = True,
     record: bool = True,
+    symbol: str = "ui",
+    prebuild: PrebuildModeStr | None = None,
+    lazy: bool = False,
 ) -> type[_M]: ...
 @overload
 def magicclass(
@@ -75,6 +86,9 @@ def magicclass(
     properties: dict[str, Any] | None = None,
     use_native_menubar: bool = True,
     record: bool = True,
+    symbol: str = "ui",
+    prebuild: PrebuildModeStr | None = None,
+    lazy: bool = False,
 ) -> type[ClassGuiBase] | _C: ...
 @overload
 def magicclass(
@@ -92,6 +106,9 @@ def magicclass(
     properties: dict[str, Any] | None = None,
     use_native_menubar: bool = True,
     record: bool = True,
+    symbol: str = "ui",
+    prebuild: PrebuildModeStr | None = None,
+    lazy: bool = False,
 ) -> _MagicClassDecorator[ClassGuiBase]: ...
 @overload
 def magicmenu(
@@ -24,10 +24,10 @@ from magicgui.types import Undefined
 from magicclass.fields._define import define_callback, define_callback_gui
 from magicclass.utils import (
     is_instance_method,
-    method_as_getter,
     eval_attribute,
     is_type_like,
 )
+from magicclass.utils._choices import choices_as_getter
 from magicclass.signature import (
     MagicMethodSignature,
     is_annotated,
@@ -244,7 +244,7 @@ class MagicField(_FieldObject, Generic[_W]):
             _arg_choices = eval_attribute(type(obj), _arg_choices)
 
         if is_instance_method(_arg_choices):
-            self.options["choices"] = method_as_getter(obj, _arg_choices)
+            self.options["choices"] = choices_as_getter(obj, _arg_choices)
         try:
             if _is_magicclass(constructor):
                 widget = constructor(**self.options)
@@ -5,6 +5,7 @@ from ._const import (
     WidgetTypeStr,
     PopUpModeStr,
     ErrorModeStr,
+    PrebuildModeStr,
     Color,
     Colormap,
     MGUI_SIMPLE_TYPES,
@@ -25,6 +26,7 @@ __all__ = [
     "WidgetTypeStr",
     "PopUpModeStr",
     "ErrorModeStr",
+    "PrebuildModeStr",
     "Color",
     "Colormap",
     "MGUI_SIMPLE_TYPES",
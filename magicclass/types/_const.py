@@ -59,6 +59,8 @@ PopUpModeStr = Literal[
 
 ErrorModeStr = Literal["msgbox", "stderr", "stdout", "napari", "debug", "ignore"]
 
+PrebuildModeStr = Literal["none", "idle"]
+
 Color = Union[Iterable[float], str]
 Colormap = Dict[float, Color]
 
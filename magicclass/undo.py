@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Generic, TypeVar, overload
+import inspect
+import sys
+from typing import Any, Callable, Generator, Generic, Iterator, TypeVar, overload
 from abc import ABC, abstractmethod, abstractproperty
 
-__all__ = ["undo_callback"]
+__all__ = ["undo_callback", "array_patch"]
 
 _R = TypeVar("_R")
 _R1 = TypeVar("_R1")
@@ -29,13 +31,102 @@ class UndoCallback(Generic[_R], ImplementsUndo):
         self._name = getattr(func, "__qualname__", repr(func))
         self._redo_action = RedoAction.Default
         self._return_value: Any | None = None
+        self._packed = False
+        self._packed_cells: list[tuple[Any, Any]] = []  # (cell, packed object)
 
     def __repr__(self) -> str:
         return f"UndoCallback<{self._name}>"
 
     def run(self) -> _R:
         """Execute the undo operation."""
-        return self._func(*self._args, **self._kwargs)
+        return _consume(self._iter_run())
+
+    @property
+    def is_async(self) -> bool:
+        """True if the undo function is a generator or an async function."""
+        return _is_async_function(self._func)
+
+    def _iter_run(self) -> Generator[Any, Any, _R]:
+        """Execute the undo operation as a generator for thread workers."""
+        if self._packed:
+            self._unpack()
+        return (yield from _iter_call(self._func, *self._args, **self._kwargs))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Estimated size of the payload in bytes.
+
+        The payload is the arguments, the variables in the closure of the function
+        and the object that the function is bound to. Only array-like objects, which
+        have the ``nbytes`` attribute, are counted. Other objects such as the GUI
+        itself are shared with the rest of the application and are not counted.
+        """
+        return sum(_payload_size(obj) for obj in self._iter_payload())
+
+    def _iter_payload(self) -> Iterator[Any]:
+        if (owner := getattr(self._func, "__self__", None)) is not None:
+            yield owner  # such as the patch object of `array_patch`
+        yield from self._args
+        yield from self._kwargs.values()
+        for cell in _iter_cells(self._func):
+            try:
+                yield cell.cell_contents
+            except ValueError:  # empty cell
+                pass
+        for _, packed in self._packed_cells:
+            yield packed
+
+    def _pack(self, packer: Callable[[Any], Any]) -> None:
+        """
+        Pack the payload objects owned by this callback.
+
+        Only the objects that own their data and are not referenced from anywhere
+        else are packed, because the callback may modify the others in-place, such
+        as an array of the application state. Packed arguments are stored in place
+        of the original ones. Packed closure variables are stored in this object and
+        the cells are emptied until the undo is run. Cells shared with the custom
+        redo function are not packed.
+        """
+        owned_args = [_is_owned_item(self._args, i) for i in range(len(self._args))]
+        self._args = tuple(
+            packer(arg) if owned else arg for arg, owned in zip(self._args, owned_args)
+        )
+        owned_keys = {k for k in self._kwargs if _is_owned_item(self._kwargs, k)}
+        self._kwargs = {
+            k: packer(v) if k in owned_keys else v for k, v in self._kwargs.items()
+        }
+        if isinstance(self._redo_action, CustomRedoAction):
+            shared = {id(cell) for cell in _iter_cells(self._redo_action._func)}
+        else:
+            shared = set()
+        for cell in _iter_cells(self._func):
+            if id(cell) in shared:
+                continue
+            try:
+                if not _is_owned_cell(cell):
+                    continue
+                obj = cell.cell_contents
+            except ValueError:
+                continue
+            if (packed := packer(obj)) is not obj:
+                self._packed_cells.append((cell, packed))
+                del cell.cell_contents
+        self._packed = True
+
+    def _unpack(self) -> None:
+        """Reload the packed payload objects."""
+        from magicclass._gui._undo_store import PackedArray
+
+        def _load(obj):
+            return obj.load() if isinstance(obj, PackedArray) else obj
+
+        self._args = tuple(_load(arg) for arg in self._args)
+        self._kwargs = {k: _load(v) for k, v in self._kwargs.items()}
+        for cell, packed in self._packed_cells:
+            cell.cell_contents = packed.load()
+        self._packed_cells = []
+        self._packed = False
 
     @property
     def redo_action(self) -> RedoAction:
@@ -48,9 +139,14 @@ class UndoCallback(Generic[_R], ImplementsUndo):
 
     def copy(self) -> UndoCallback[_R]:
         """Return a copy of this undo operation."""
-        out = self.__class__(self._func, *self._args, **self._kwargs)
+        out = self.__class__(self._func)
+        # share the containers so that the arguments are not referenced twice
+        out._args = self._args
+        out._kwargs = self._kwargs
         out._name = self._name
         out._redo_action = self._redo_action
+        out._packed = self._packed
+        out._packed_cells = self._packed_cells.copy()
         return out
 
     def with_args(self, *args, **kwargs) -> UndoCallback[_R]:
@@ -59,6 +155,8 @@ class UndoCallback(Generic[_R], ImplementsUndo):
         _kwargs.update(kwargs)
         new = self.__class__(self._func, *(self._args + args), **_kwargs)
         new._name = self._name
+        new._packed = self._packed
+        new._packed_cells = self._packed_cells.copy()
         return new
 
     def with_name(self, name: str) -> UndoCallback[_R]:
@@ -132,8 +230,89 @@ class CustomRedoAction(_RedoAction):
         other = RedoAction(other)
         return other is RedoAction.Custom
 
+    @property
+    def is_async(self) -> bool:
+        return _is_async_function(self._func)
+
     def run(self):
-        return self._func()
+        return _consume(self._iter_run())
+
+    def _iter_run(self) -> Generator[Any, Any, Any]:
+        return (yield from _iter_call(self._func))
+
+
+def _iter_cells(func: Callable) -> Iterator[Any]:
+    return iter(getattr(func, "__closure__", None) or ())
+
+
+def _item_refcount(container, key) -> int:
+    return sys.getrefcount(container[key])
+
+
+def _cell_refcount(cell) -> int:
+    return sys.getrefcount(cell.cell_contents)
+
+
+# reference counts of objects referenced only by the container or the cell, measured
+# in the same way as the payload objects.
+_OWNED_ITEM_REFCOUNT = _item_refcount((object(),), 0)
+_OWNED_CELL_REFCOUNT = _cell_refcount((lambda x: lambda: x)(object()).__closure__[0])
+
+
+def _is_owned_item(container, key) -> bool:
+    return (
+        getattr(container[key], "base", None) is None
+        and _item_refcount(container, key) <= _OWNED_ITEM_REFCOUNT
+    )
+
+
+def _is_owned_cell(cell) -> bool:
+    return (
+        getattr(cell.cell_contents, "base", None) is None
+        and _cell_refcount(cell) <= _OWNED_CELL_REFCOUNT
+    )
+
+
+def _payload_size(obj: Any) -> int:
+    if isinstance(nbytes := getattr(obj, "nbytes", None), int):
+        return nbytes
+    return 0
+
+
+def _is_async_function(func: Callable) -> bool:
+    return inspect.isgeneratorfunction(func) or inspect.iscoroutinefunction(func)
+
+
+def _iter_call(func: Callable[..., _R], *args, **kwargs) -> Generator[Any, Any, _R]:
+    """Call a function, a generator function or an async function as a generator."""
+    out = func(*args, **kwargs)
+    if inspect.isgenerator(out):
+        out = yield from out
+    elif inspect.iscoroutine(out):
+        out = _run_coroutine(out)
+    return out
+
+
+def _run_coroutine(coro):
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # asyncio.run cannot be called while an event loop is running in this thread
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def _consume(gen: Generator[Any, Any, _R]) -> _R:
+    while True:
+        try:
+            next(gen)
+        except StopIteration as e:
+            return e.value
 
 
 class RedoAction:
@@ -197,3 +376,71 @@ def undo_callback(func=None, *, redo=True):
         return cb
 
     return wrapper if func is None else wrapper(func)
+
+
+def array_patch(arr, region) -> UndoCallback[None]:
+    """
+    Returns a undo operation that restores a region of an array.
+
+    Only the values in the region are copied, so that the memory usage is
+    proportional to the size of the edit, not to the size of the array. This
+    function must be called before the array is modified in-place. The redo
+    action writes the modified values back.
+
+    Parameters
+    ----------
+    arr : np.ndarray
+        The array to be modified in-place.
+    region : index or boolean mask
+        The region of the array to be modified, such as ``(0, slice(10, 20))``.
+
+    Examples
+    --------
+    >>> @magicclass
+    >>> class A:
+    ...     def paint(self, z: int, value: int):
+    ...         region = (z, slice(10, 20), slice(10, 20))
+    ...         undo = array_patch(self._labels, region)
+    ...         self._labels[region] = value
+    ...         return undo
+    """
+    import numpy as np
+
+    if (
+        isinstance(region, np.ndarray)
+        and region.dtype == bool
+        and np.count_nonzero(region) * region.ndim * 8 < region.size
+    ):
+        # indices cost 8 bytes per dimension per element while the mask costs 1
+        # byte per element, so only sparse masks are cheaper as indices.
+        region = np.nonzero(region)
+    patch = _ArrayPatch(arr, region)
+    # old values are passed as an argument so that only they are counted as the
+    # payload of the undo operation
+    old_values = np.array(arr[region], copy=True)
+    return UndoCallback(patch.undo, old_values).with_redo(patch.redo)
+
+
+class _ArrayPatch:
+    def __init__(self, arr, region):
+        self._arr = arr
+        self._region = region
+        self._new_values = None
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the region and the values for redo in bytes."""
+        if isinstance(self._region, tuple):
+            size = sum(_payload_size(idx) for idx in self._region)
+        else:
+            size = _payload_size(self._region)
+        return size + _payload_size(self._new_values)
+
+    def undo(self, old_values):
+        import numpy as np
+
+        self._new_values = np.array(self._arr[self._region], copy=True)
+        self._arr[self._region] = old_values
+
+    def redo(self):
+        self._arr[self._region] = self._new_values
@@ -1,5 +1,6 @@
 from ._functions import (
     iter_members,
+    get_member_table,
     Tooltips,
     get_signature,
     argcount,
@@ -22,6 +23,7 @@ from .qt import (
     screen_scale,
 )
 
+from ._arg_store import argument_size
 from ._click import click
 from ._recent import call_recent_menu
 from .qtsignal import QtSignal
@@ -29,6 +31,7 @@ from .qthreading import thread_worker, Timer, Callback
 
 __all__ = [
     "iter_members",
+    "get_member_table",
     "Tooltips",
     "get_signature",
     "argcount",
@@ -46,6 +49,7 @@ __all__ = [
     "open_url",
     "move_to_screen_center",
     "screen_scale",
+    "argument_size",
     "click",
     "call_recent_menu",
     "QtSignal",
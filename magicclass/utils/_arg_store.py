@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import functools
+import itertools
+import sys
+from typing import Any, Iterator
+import weakref
+
+
+@functools.singledispatch
+def argument_size(obj: Any) -> int:
+    """
+    Estimate the size of a macro argument in bytes.
+
+    Arguments larger than the "macro-arg-size-limit" option are not rendered in the
+    macro but recorded as references such as ``ui.macro.arguments[0]``. Register a
+    function to support custom types.
+
+    >>> from magicclass.utils import argument_size
+    >>> @argument_size.register(MyData)
+    ... def _(obj: MyData) -> int:
+    ...     return obj.data.nbytes
+    """
+    if isinstance(nbytes := getattr(obj, "nbytes", None), int):
+        return nbytes  # array-like objects
+    return sys.getsizeof(obj)
+
+
+class ArgumentStore:
+    """
+    Storage of the large arguments referred from the macro.
+
+    Objects are held by weak references if possible. Other objects are held by strong
+    references, but only the latest `maxsize` of them are kept.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self._maxsize = maxsize
+        self._weak: dict[int, weakref.ref] = {}
+        self._strong: OrderedDict[int, Any] = OrderedDict()
+        self._keys: dict[int, int] = {}  # id of object -> key
+        self._counter = itertools.count()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(keys={list(self)})"
+
+    def store(self, obj: Any) -> int:
+        """Store an object and return its key."""
+        if (key := self._keys.get(id(obj))) is not None:
+            try:
+                if self[key] is obj:
+                    return key
+            except KeyError:
+                pass
+        key = next(self._counter)
+        self._keys[id(obj)] = key
+        try:
+            self._weak[key] = weakref.ref(obj, _make_discard(self, key, id(obj)))
+        except TypeError:
+            self._strong[key] = obj
+            while len(self._strong) > self._maxsize:
+                _, old = self._strong.popitem(last=False)
+                self._keys.pop(id(old), None)
+        return key
+
+    def __getitem__(self, key: int) -> Any:
+        if key in self._strong:
+            return self._strong[key]
+        if (ref := self._weak.get(key)) is not None and (obj := ref()) is not None:
+            return obj
+        raise KeyError(f"Argument {key} is no longer available.")
+
+    def __contains__(self, key: int) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted([*self._weak, *self._strong]))
+
+    def __len__(self) -> int:
+        return len(self._weak) + len(self._strong)
+
+    def clear(self) -> None:
+        """Release all the stored objects."""
+        self._weak.clear()
+        self._strong.clear()
+        self._keys.clear()
+
+
+def _make_discard(store: ArgumentStore, key: int, obj_id: int):
+    store_ref = weakref.ref(store)
+
+    def _discard(_):
+        if (store := store_ref()) is not None:
+            store._weak.pop(key, None)
+            if store._keys.get(obj_id) == key:
+                del store._keys[obj_id]
+
+    return _discard
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Iterable, TYPE_CHECKING
+import weakref
+from psygnal import Signal, SignalInstance
+
+from ._functions import get_method_owner, method_as_getter
+
+if TYPE_CHECKING:
+    from magicgui.widgets import Widget
+    from magicclass._gui import BaseGui
+
+# keys of the additional options
+CHOICES_DEPENDENCIES = "choices_dependencies"
+CHOICES_TTL = "choices_ttl"
+CHOICES_THREADED = "choices_threaded"
+
+LOADING_TEXT = "Loading..."
+
+_NOT_CACHED = object()
+
+# instance -> memoized choices getters
+_MEMOS: weakref.WeakKeyDictionary[BaseGui, list[ChoicesMemo]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class ChoicesMemo:
+    """
+    Choices getter that memoizes the result of a choices provider method.
+
+    The memoized result is discarded when any of the dependencies emits or when it
+    gets older than `ttl`. If `threaded` is true, the provider is called in a worker
+    thread. The widget is disabled until the result arrives, and the result of a
+    call is discarded if a newer call has been issued.
+
+    Parameters
+    ----------
+    ins : BaseGui
+        The instance that owns the provider.
+    provider : callable
+        The choices provider defined in the class.
+    dependencies : iterable, optional
+        Names of the attributes, fields, signals or widgets that the result of the
+        provider depends on. If not given, the result is not memoized unless `ttl`
+        is given.
+    ttl : float, optional
+        Time to live of the memoized result in seconds.
+    threaded : bool, default False
+        If true, call the provider in a worker thread.
+    """
+
+    def __init__(
+        self,
+        ins: BaseGui,
+        provider: Callable,
+        dependencies: Iterable[Any] | None = None,
+        ttl: float | None = None,
+        threaded: bool = False,
+    ):
+        self._ins_ref = weakref.ref(ins)
+        self._provider = provider
+        self._cached = dependencies is not None or ttl is not None
+        self._dependencies = tuple(dependencies or ())
+        self._ttl = ttl
+        self._threaded = threaded or inspect.iscoroutinefunction(provider)
+        self._value = _NOT_CACHED
+        self._last_value: Any = []
+        self._expires_at = float("inf")
+        self._connected = False
+        self._generation = 0  # incremented every time the provider is called
+        self._loading_state: tuple[bool, str] | None = None
+        self._widget_ref: Callable[[], Widget | None] = _null_ref
+        _MEMOS.setdefault(ins, []).append(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._provider.__qualname__})"
+
+    @property
+    def provider(self) -> Callable:
+        """The choices provider."""
+        return self._provider
+
+    @property
+    def widget(self) -> Widget | None:
+        """The widget that last called this getter."""
+        return self._widget_ref()
+
+    @property
+    def is_valid(self) -> bool:
+        """True if the memoized result is available."""
+        if self._value is _NOT_CACHED:
+            return False
+        if time.monotonic() > self._expires_at:
+            self._value = _NOT_CACHED
+            return False
+        return True
+
+    @property
+    def is_loading(self) -> bool:
+        """True if the provider is running in a worker thread."""
+        return self._loading_state is not None
+
+    def __call__(self, w: Widget):
+        if (ins := self._ins_ref()) is None:
+            return []
+        try:
+            self._widget_ref = weakref.ref(w)
+        except TypeError:
+            pass
+        if not self._connected:
+            for dep in self._dependencies:
+                _resolve_signal(ins, dep).connect(self.invalidate)
+            self._connected = True
+        if self.is_valid:
+            return self._value
+        if self._threaded:
+            self._start_worker(ins, w)
+            return self._last_value
+        return self._set_value(self._provider(ins, w))
+
+    def invalidate(self, *_) -> None:
+        """Discard the memoized result."""
+        self._value = _NOT_CACHED
+
+    def _set_value(self, value: Any) -> Any:
+        if iter(value) is value:  # iterator can be consumed only once
+            value = list(value)
+        self._last_value = value
+        if self._cached:
+            self._value = value
+            if self._ttl is not None:
+                self._expires_at = time.monotonic() + self._ttl
+        return value
+
+    def _start_worker(self, ins: BaseGui, w: Widget):
+        from superqt.utils import create_worker
+
+        self._generation += 1
+        generation = self._generation
+        if inspect.iscoroutinefunction(self._provider):
+            func = lambda: asyncio.run(self._provider(ins, w))  # noqa: E731
+        else:
+            func = lambda: self._provider(ins, w)  # noqa: E731
+        worker = create_worker(func, _start_thread=False)
+        worker.returned.connect(lambda out: self._on_returned(generation, out))
+        worker.errored.connect(lambda _: self._on_errored(generation))
+        self._set_loading(True)
+        worker.start()
+
+    def _on_returned(self, generation: int, value: Any):
+        if generation != self._generation:
+            return  # stale result
+        value = self._set_value(value)
+        self._set_loading(False)
+        if (w := self.widget) is not None:
+            # The widget will call this getter again. The result must be returned
+            # even if it is not memoized, otherwise another worker starts.
+            value_old = self._value
+            self._value = value
+            try:
+                w.reset_choices()
+            finally:
+                if not self._cached:
+                    self._value = value_old
+
+    def _on_errored(self, generation: int):
+        if generation == self._generation:
+            self._set_loading(False)
+
+    def _set_loading(self, loading: bool):
+        if (w := self.widget) is None:
+            return
+        native = w.native
+        if loading:
+            if self._loading_state is None:
+                placeholder = getattr(native, "placeholderText", lambda: "")()
+                self._loading_state = (w.enabled, placeholder)
+            w.enabled = False
+            if hasattr(native, "setPlaceholderText"):
+                native.setPlaceholderText(LOADING_TEXT)
+        elif self._loading_state is not None:
+            enabled, placeholder = self._loading_state
+            self._loading_state = None
+            w.enabled = enabled
+            if hasattr(native, "setPlaceholderText"):
+                native.setPlaceholderText(placeholder)
+
+
+def choices_as_getter(self: BaseGui, provider: Callable) -> Callable[[Widget], Any]:
+    """
+    Convert a choices provider method into a getter function.
+
+    If the provider is decorated with `cache_choices` or `threaded_choices`, or is
+    an async function, a `ChoicesMemo` is returned.
+    """
+    sig = getattr(provider, "__signature__", None)
+    opts: dict[str, Any] = getattr(sig, "additional_options", {})
+    deps = opts.get(CHOICES_DEPENDENCIES, None)
+    ttl = opts.get(CHOICES_TTL, None)
+    threaded = opts.get(CHOICES_THREADED, False)
+    if (
+        deps is None
+        and ttl is None
+        and not threaded
+        and not inspect.iscoroutinefunction(provider)
+    ):
+        return method_as_getter(self, provider)
+    ins = get_method_owner(self, provider)
+    return ChoicesMemo(ins, provider, deps, ttl=ttl, threaded=threaded)
+
+
+def iter_choices_memos(ui: BaseGui) -> Iterable[ChoicesMemo]:
+    """Iterate over all the memoized choices getters of the instance."""
+    yield from _MEMOS.get(ui, [])
+
+
+def _resolve_signal(ins: BaseGui, dep: Any) -> SignalInstance:
+    from magicclass.fields import MagicField
+
+    if isinstance(dep, str):
+        cls_attr = getattr(type(ins), dep, None)
+        dep = getattr(ins, dep) if cls_attr is None else cls_attr
+    if isinstance(dep, MagicField):
+        return dep.get_widget(ins).changed
+    if isinstance(dep, Signal):
+        return dep.__get__(ins, type(ins))
+    if isinstance(dep, SignalInstance):
+        return dep
+    if isinstance(changed := getattr(dep, "changed", None), SignalInstance):
+        return changed
+    raise TypeError(f"Cannot use {dep!r} as a dependency of choices.")
+
+
+def _null_ref() -> None:
+    return None
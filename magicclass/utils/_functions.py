@@ -1,10 +1,12 @@
 from __future__ import annotations
+from collections import OrderedDict
 from functools import cached_property
 import inspect
-from types import MethodType
-from typing import Any, TYPE_CHECKING, Callable, Iterable, Union
+from types import MethodType, MappingProxyType
+from typing import Any, TYPE_CHECKING, Callable, Iterable, NamedTuple, Union
 import warnings
-from docstring_parser import parse
+import weakref
+from docstring_parser import parse, Docstring
 
 if TYPE_CHECKING:
     from magicclass._gui import BaseGui
@@ -37,24 +39,51 @@ def iter_members(cls: type, exclude_prefix: str = "__") -> Iterable[tuple[str, A
     This function is identical to inspect.getmembers except for the order
     of the results. We have to sort the name in the order of line number.
     """
-    mro = (cls,) + inspect.getmro(cls)
-    processed = set()
-    names: list[str] = list(cls.__dict__.keys())
-    try:
-        for base in reversed(mro):
-            for k in base.__dict__.keys():
-                if k not in names:
-                    names.append(k)
+    for key, value in get_member_table(cls).items():
+        if not key.startswith(exclude_prefix):
+            yield key, value
 
-    except AttributeError:
-        pass
 
+# class -> (version of the class namespaces, member table)
+_MEMBER_TABLES: weakref.WeakKeyDictionary[
+    type, tuple[tuple[Any, ...], MappingProxyType[str, Any]]
+] = weakref.WeakKeyDictionary()
+
+
+def get_member_table(cls: type) -> MappingProxyType[str, Any]:
+    """
+    Get the mapping of all the members of a class in the order of source code.
+
+    Members defined in the class come first, followed by the members inherited from
+    the base classes. The table is computed once per class and recomputed only when
+    a member of the class or any of its base classes is added, deleted or replaced.
+
+    Parameters
+    ----------
+    cls : type
+        Any class.
+
+    Returns
+    -------
+    MappingProxyType
+        Read-only mapping from member names to the members.
+    """
+    mro = inspect.getmro(cls)
+    version = _class_version(cls)
+    if (cached := _MEMBER_TABLES.get(cls)) is not None:
+        old_version, table = cached
+        if old_version == version:
+            return table
+
+    # dict is used as an ordered set
+    names: dict[str, None] = dict.fromkeys(cls.__dict__)
+    for base in reversed(mro):
+        names.update(dict.fromkeys(base.__dict__))
+
+    members: dict[str, Any] = {}
     for key in names:
         try:
             value = getattr(cls, key)
-            # handle the duplicate key
-            if key in processed:
-                raise AttributeError
         except AttributeError:
             for base in mro:
                 if key in base.__dict__:
@@ -62,16 +91,102 @@ def iter_members(cls: type, exclude_prefix: str = "__") -> Iterable[tuple[str, A
                     break
             else:
                 continue
-        if not key.startswith(exclude_prefix):
-            yield key, value
-        processed.add(key)
+        members[key] = value
+
+    table = MappingProxyType(members)
+    try:
+        _MEMBER_TABLES[cls] = (version, table)
+    except TypeError:  # not weak-referenceable
+        pass
+    return table
+
+
+def _class_version(cls: type) -> tuple[Any, ...]:
+    """
+    Version of the namespaces of a class and its base classes.
+
+    The version changes when a member of any of the classes is added, deleted or
+    replaced. Only the names and the identities of the members are compared.
+    """
+    return tuple(
+        (id(base), tuple(base.__dict__), tuple(map(id, base.__dict__.values())))
+        for base in inspect.getmro(cls)
+    )
+
+
+class DocstringCacheInfo(NamedTuple):
+    """Statistics of the docstring cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _DocstringCache:
+    """LRU cache of parsed docstrings keyed by the docstring text."""
+
+    def __init__(self, maxsize: int = 1024):
+        self._cache: OrderedDict[str | None, Docstring] = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+
+    def parse(self, doc: str | None) -> Docstring:
+        if (out := self._cache.get(doc)) is not None:
+            self._hits += 1
+            self._cache.move_to_end(doc)
+            return out
+        self._misses += 1
+        out = parse(doc)
+        if self._maxsize > 0:
+            self._cache[doc] = out
+            self._shrink()
+        return out
+
+    def info(self) -> DocstringCacheInfo:
+        return DocstringCacheInfo(
+            self._hits, self._misses, self._maxsize, len(self._cache)
+        )
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._hits = self._misses = 0
+
+    def resize(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative, got {maxsize}.")
+        self._maxsize = maxsize
+        self._shrink()
+
+    def _shrink(self):
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+
+_DOCSTRING_CACHE = _DocstringCache()
 
 
 class Tooltips:
     """A class to manage dosctring based tooltips."""
 
     def __init__(self, obj: Any):
-        self._doc = parse(obj.__doc__)
+        self._doc = _DOCSTRING_CACHE.parse(obj.__doc__)
+
+    @staticmethod
+    def cache_info() -> DocstringCacheInfo:
+        """Return the hits, misses and size of the docstring cache."""
+        return _DOCSTRING_CACHE.info()
+
+    @staticmethod
+    def cache_clear() -> None:
+        """Clear the docstring cache and its statistics."""
+        return _DOCSTRING_CACHE.clear()
+
+    @staticmethod
+    def set_cache_size(maxsize: int) -> None:
+        """Set the maximum number of parsed docstrings to be cached."""
+        return _DOCSTRING_CACHE.resize(maxsize)
 
     @property
     def desc(self):
@@ -149,6 +264,16 @@ def is_instance_method(func: Callable) -> bool:
 
 
 def method_as_getter(self: BaseGui, getter: Callable):
+    ins = get_method_owner(self, getter)
+
+    def _func(w):
+        return getter(ins, w)
+
+    return _func
+
+
+def get_method_owner(self: BaseGui, getter: Callable) -> BaseGui:
+    """Find the instance that owns the method among self and its children."""
     qualname = getter.__qualname__
     if _LOCALS in qualname:
         qualname = qualname.split(_LOCALS)[-1]
@@ -165,11 +290,7 @@ def method_as_getter(self: BaseGui, getter: Callable):
     ins = self
     for clsname in clsnames[i:]:
         ins = getattr(ins, clsname)
-
-    def _func(w):
-        return getter(ins, w)
-
-    return _func
+    return ins
 
 
 def eval_attribute(obj: Any, literal: str):
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections import Counter, deque
+from typing import Callable, Hashable, NamedTuple
+
+from superqt.utils import WorkerBase
+
+
+class _Task(NamedTuple):
+    worker: WorkerBase
+    key: Hashable
+    max_concurrent: int | None
+
+
+class WorkerPool:
+    """
+    Pool that limits the number of workers running at the same time.
+
+    Workers submitted beyond the limit are kept pending and started in the order of
+    submission when running workers finish.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Maximum number of running workers. Unlimited if not given.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self._max_workers = max_workers
+        self._pending: deque[_Task] = deque()
+        self._running: Counter[Hashable] = Counter()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(max_workers={self._max_workers}, "
+            f"running={self.n_running}, pending={self.n_pending})"
+        )
+
+    @property
+    def max_workers(self) -> int | None:
+        """Maximum number of running workers."""
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value: int | None):
+        if value is not None and value < 1:
+            raise ValueError("max_workers must be >= 1 or None")
+        self._max_workers = value
+        self._start_pending()
+
+    @property
+    def n_running(self) -> int:
+        """Number of running workers."""
+        return sum(self._running.values())
+
+    @property
+    def n_pending(self) -> int:
+        """Number of workers waiting to be started."""
+        return len(self._pending)
+
+    def submit(
+        self,
+        worker: WorkerBase,
+        key: Hashable = None,
+        max_concurrent: int | None = None,
+        on_pending: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Start the worker, or keep it pending if the pool is full.
+
+        Parameters
+        ----------
+        worker : WorkerBase
+            Worker to be started.
+        key : hashable, optional
+            Workers with the same key are counted for `max_concurrent`.
+        max_concurrent : int, optional
+            Maximum number of running workers with the same key.
+        on_pending : callable, optional
+            Called if the worker could not be started immediately.
+        """
+        task = _Task(worker, key, max_concurrent)
+        self._pending.append(task)
+        self._start_pending()
+        if on_pending is not None and task in self._pending:
+            on_pending()
+        return None
+
+    def cancel(self, worker: WorkerBase) -> bool:
+        """
+        Cancel a pending worker.
+
+        The worker is removed from the pool and its ``finished`` signal is emitted
+        without running it. Return true if the worker was pending.
+        """
+        for task in self._pending:
+            if task.worker is worker:
+                self._pending.remove(task)
+                worker.finished.emit()
+                return True
+        return False
+
+    def _start_pending(self) -> None:
+        for task in list(self._pending):
+            if task.worker.abort_requested:
+                # `quit` was called before the worker started
+                self.cancel(task.worker)
+                continue
+            if self._max_workers is not None and self.n_running >= self._max_workers:
+                break
+            if (
+                task.max_concurrent is not None
+                and self._running[task.key] >= task.max_concurrent
+            ):
+                continue
+            self._pending.remove(task)
+            self._running[task.key] += 1
+            task.worker.finished.connect(lambda key=task.key: self._on_finished(key))
+            task.worker.start()
+        return None
+
+    def _on_finished(self, key: Hashable) -> None:
+        self._running[key] -= 1
+        if self._running[key] <= 0:
+            del self._running[key]
+        self._start_pending()
+        return None
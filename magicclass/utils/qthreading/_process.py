@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from importlib import import_module
+import inspect
+import multiprocessing as mp
+import os
+import pickle
+import queue
+import threading
+from typing import Any, Callable, Generator
+
+from magicclass._exceptions import Aborted
+
+_POLL_INTERVAL = 0.05
+_MAX_IDLE_PROCESSES = os.cpu_count() or 1
+
+
+class FunctionRef:
+    """
+    Picklable reference to a function defined in a class.
+
+    Methods of a magic class cannot be pickled by themselves because the class
+    attribute is replaced by the `thread_worker` object. This object refers to the
+    function by its module and qualified name instead.
+    """
+
+    def __init__(self, module: str, qualname: str):
+        self._module = module
+        self._qualname = qualname
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._module}.{self._qualname})"
+
+    @classmethod
+    def from_function(cls, func: Callable) -> FunctionRef | Callable:
+        qualname: str = getattr(func, "__qualname__", "")
+        module = getattr(func, "__module__", None)
+        if module is None or "<locals>" in qualname:
+            return func  # will be pickled as is
+        return cls(module, qualname)
+
+    def resolve(self) -> Callable:
+        from .thread_worker import thread_worker
+
+        obj = import_module(self._module)
+        for name in self._qualname.split("."):
+            obj = getattr(obj, name)
+        if isinstance(obj, thread_worker):
+            obj = obj.func
+        return obj
+
+
+def _run_in_process(func: FunctionRef | Callable, args, kwargs, q: mp.Queue):
+    """Run the function in the child process and send the results to the queue."""
+    try:
+        if isinstance(func, FunctionRef):
+            func = func.resolve()
+        out = func(None, *args, **kwargs)  # GUI object is not available here
+        if inspect.isgenerator(out):
+            while True:
+                try:
+                    val = next(out)
+                except StopIteration as exc:
+                    out = exc.value
+                    break
+                q.put(("yielded", _dumps(val, "yielded", func)))
+        q.put(("returned", _dumps(out, "returned", func)))
+    except BaseException as exc:
+        q.put(("errored", _picklable_exception(exc)))
+
+
+def _serve(tasks: mp.Queue, q: mp.Queue):
+    """Main loop of a child process. Run the pickled tasks until None is sent."""
+    while (data := tasks.get()) is not None:
+        try:
+            func, args, kwargs = pickle.loads(data)
+        except BaseException as exc:
+            q.put(("errored", _picklable_exception(exc)))
+        else:
+            _run_in_process(func, args, kwargs, q)
+
+
+def _dumps(val: Any, kind: str, func: Callable) -> bytes:
+    """
+    Pickle the value to be sent back.
+
+    Values are pickled here, not in the feeder thread of the queue, so that the
+    error is raised in the function instead of being printed and lost.
+    """
+    from ._callback import _AwaitableCallback
+
+    name = getattr(func, "__qualname__", repr(func))
+    if isinstance(val, _AwaitableCallback):
+        raise TypeError(
+            f"Callback {val!r} was {kind} from {name}, but callbacks cannot be sent "
+            "back from a process worker. Use `returned.connect` or `yielded.connect` "
+            "instead."
+        )
+    try:
+        return pickle.dumps(val)
+    except Exception as exc:
+        raise TypeError(
+            f"Value of type {type(val).__name__} was {kind} from {name}, but it "
+            f"cannot be sent back from a process worker because it is not "
+            f"picklable ({type(exc).__name__}: {exc})."
+        ) from None
+
+
+def _picklable_exception(exc: BaseException) -> BaseException:
+    try:
+        pickle.dumps(exc)
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+class _ChildProcess:
+    """A child process that runs the tasks one by one."""
+
+    def __init__(self):
+        ctx = mp.get_context("spawn")  # forking a Qt application is not safe
+        self.tasks = ctx.Queue()
+        self.results = ctx.Queue()
+        self.process = ctx.Process(
+            target=_serve, args=(self.tasks, self.results), daemon=True
+        )
+        self.process.start()
+
+    def submit(self, func: Callable, args: tuple, kwargs: dict[str, Any]) -> None:
+        # Pickle here so that an unpicklable argument raises in the caller instead
+        # of being printed and lost in the feeder thread of the queue.
+        data = pickle.dumps((FunctionRef.from_function(func), args, kwargs))
+        self.tasks.put(data)
+
+    def terminate(self) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+
+class _ProcessPool:
+    """
+    Pool of the idle child processes.
+
+    Starting a "spawn" process imports Python, Qt, magicclass and the user module
+    again, which takes much longer than short CPU-bound tasks. Processes that finished
+    a task normally are kept here and reused. Processes of aborted tasks may still be
+    running, so they are terminated instead of being returned.
+    """
+
+    def __init__(self, max_idle: int):
+        self._idle: list[_ChildProcess] = []
+        self._max_idle = max_idle
+        self._lock = threading.Lock()
+
+    def acquire(self) -> _ChildProcess:
+        with self._lock:
+            while self._idle:
+                child = self._idle.pop()
+                if child.process.is_alive():
+                    return child
+        return _ChildProcess()
+
+    def release(self, child: _ChildProcess) -> None:
+        with self._lock:
+            if len(self._idle) < self._max_idle and child.process.is_alive():
+                self._idle.append(child)
+                return None
+        child.terminate()
+        return None
+
+
+_POOL = _ProcessPool(_MAX_IDLE_PROCESSES)
+
+
+class ProcessTask:
+    """
+    A function call in a child process.
+
+    Values yielded in the child process are streamed back through a queue so that
+    they can drive the yielded callbacks and the progress bar of the thread worker.
+    Child processes are reused for later tasks unless the task is aborted.
+    """
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict[str, Any]):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._child: _ChildProcess | None = None
+
+    def iter_results(
+        self, abort_requested: Callable[[], bool] = lambda: False
+    ) -> Generator[Any, None, Any]:
+        """Run the task in a child process, yield the yielded values and return."""
+        child = self._child = _POOL.acquire()
+        try:
+            child.submit(self._func, self._args, self._kwargs)
+        except BaseException:
+            self._child = None
+            _POOL.release(child)
+            raise
+        q = child.results
+        try:
+            while True:
+                if abort_requested():
+                    Aborted.raise_(func=self._func)
+                try:
+                    kind, val = q.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    if not child.process.is_alive() and q.empty():
+                        raise RuntimeError(
+                            f"Process running {self._func!r} exited with code "
+                            f"{child.process.exitcode}."
+                        )
+                    continue
+                if kind == "yielded":
+                    yield pickle.loads(val)
+                    continue
+                # the task is finished and the process can run the next one
+                self._child = None
+                _POOL.release(child)
+                if kind == "returned":
+                    return pickle.loads(val)
+                raise val
+        finally:
+            self.terminate()
+
+    def run(self, abort_requested: Callable[[], bool] = lambda: False) -> Any:
+        """Run the task and return the result, ignoring the yielded values."""
+        gen = self.iter_results(abort_requested)
+        while True:
+            try:
+                next(gen)
+            except StopIteration as exc:
+                return exc.value
+
+    def terminate(self) -> None:
+        """Terminate the child process if the task is still running."""
+        child, self._child = self._child, None
+        if child is not None:
+            child.terminate()
+        return None
@@ -300,7 +300,8 @@ class DefaultProgressBar(FrameContainer, _SupportProgress):
 
     def _finish(self):
         self._running = False
-        self._thread_timer.join()
+        if self._thread_timer is not None:  # None if cancelled before started
+            self._thread_timer.join()
         return None
 
     @property
@@ -3,7 +3,7 @@ from __future__ import annotations
 from contextlib import suppress, contextmanager, nullcontext
 import inspect
 import threading
-from functools import wraps
+from functools import partial, wraps
 import time
 from typing import (
     Any,
@@ -36,6 +36,8 @@ from ._progressbar import (
 )
 from ._callback import CallbackList, Callback, NestedCallback
 from ._worker import GeneratorWorker2
+from ._process import ProcessTask
+from ._pool import WorkerPool
 from magicclass._exceptions import Aborted
 
 if TYPE_CHECKING:
@@ -88,6 +90,10 @@ class thread_worker(Callable, Generic[_P, _R]):
     _DEFAULT_TOTAL = 0
     _WINDOW_FLAG = Qt.WindowType.WindowTitleHint | Qt.WindowType.WindowMinimizeButtonHint | Qt.WindowType.Window  # fmt: skip
     _BLOCKING_SOURCES: list[None] = []
+    _POOL_MAX_WORKERS: dict[str, int | None] = {}
+    _POOLS: weakref.WeakKeyDictionary[BaseGui, dict[str, WorkerPool]] = (
+        weakref.WeakKeyDictionary()
+    )
     _SHOW_PROGRESS = True
 
     def __init__(
@@ -97,7 +103,17 @@ class thread_worker(Callable, Generic[_P, _R]):
         ignore_errors: bool = False,
         progress: ProgressDict | bool | None = None,
         force_async: bool = False,
+        backend: Literal["thread", "process"] = "thread",
+        pool: str = "default",
+        max_concurrent: int | None = None,
     ) -> None:
+        if backend not in ("thread", "process"):
+            raise ValueError(f"backend must be 'thread' or 'process', got {backend!r}")
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1 or None")
+        self._backend = backend
+        self._pool_name = pool
+        self._max_concurrent = max_concurrent
         self._func: Callable[_P, _R] | None = None
         self._callback_dict_ = {
             "started": CallbackList(),
@@ -116,6 +132,7 @@ class thread_worker(Callable, Generic[_P, _R]):
         # not recordable, recursive=True -> _recorder is _silent
         # not recordable, recursive=False -> _recorder is None
         self._recorder: Callable[_P, Any] | None = None
+        self._block_in_thread = True
         self._validators: ValidatorDict | None = None
         self._signature_cache = None
 
@@ -150,6 +167,9 @@ class thread_worker(Callable, Generic[_P, _R]):
         ignore_errors: bool = False,
         progress: ProgressDict | bool | None = None,
         force_async: bool = False,
+        backend: Literal["thread", "process"] = "thread",
+        pool: str = "default",
+        max_concurrent: int | None = None,
     ):
         """Create a new object with new config."""
         return self.__class__(
@@ -157,6 +177,9 @@ class thread_worker(Callable, Generic[_P, _R]):
             ignore_errors=ignore_errors,
             progress=progress,
             force_async=force_async,
+            backend=backend,
+            pool=pool,
+            max_concurrent=max_concurrent,
         )
 
     @property
@@ -224,6 +247,51 @@ class thread_worker(Callable, Generic[_P, _R]):
         cls._DEFAULT_PROGRESS_BAR = pbar_cls
         return pbar_cls
 
+    @classmethod
+    def set_pool(
+        cls,
+        name: str = "default",
+        max_workers: int | None = None,
+        ui: BaseGui | None = None,
+    ) -> None:
+        """
+        Set the maximum number of workers running at the same time in a pool.
+
+        Each magic class root has its own pools. Workers submitted beyond the limit
+        will be pending until running ones finish.
+
+        >>> thread_worker.set_pool(max_workers=4)  # the default pool
+        >>> thread_worker.set_pool("io", max_workers=2)  # @thread_worker(pool="io")
+
+        Parameters
+        ----------
+        name : str, default "default"
+            Name of the pool.
+        max_workers : int, optional
+            Maximum number of running workers. Unlimited if not given.
+        ui : magic class, optional
+            If given, only the pool of this GUI is updated. Otherwise, the pools of
+            all the GUIs are updated.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be >= 1 or None")
+        if ui is not None:
+            cls._get_pool(ui, name).max_workers = max_workers
+            return None
+        cls._POOL_MAX_WORKERS[name] = max_workers
+        for pools in cls._POOLS.values():
+            if name in pools:
+                pools[name].max_workers = max_workers
+        return None
+
+    @classmethod
+    def _get_pool(cls, gui: BaseGui, name: str) -> WorkerPool:
+        root = gui._search_parent_magicclass()
+        pools = cls._POOLS.setdefault(root, {})
+        if (pool := pools.get(name)) is None:
+            pool = pools[name] = WorkerPool(cls._POOL_MAX_WORKERS.get(name))
+        return pool
+
     @staticmethod
     def callback(callback: Callable[_P, _R] = _do_nothing) -> Callback[_P, _R]:
         """
@@ -323,8 +391,16 @@ class thread_worker(Callable, Generic[_P, _R]):
         self._recorder = recorder
         return None
 
-    def _set_silencer(self):
+    def _set_silencer(self, in_thread: bool = True):
+        """
+        Do not record the function and the GUI updates in its callbacks.
+
+        If `in_thread` is false, the macro is blocked only while the callbacks are
+        called in the main thread, so that operations in the main thread are
+        recorded while the function is running.
+        """
         self._recorder = _silent
+        self._block_in_thread = in_thread
         return None
 
     def _set_validators(self, validators: ValidatorDict):
@@ -385,15 +461,23 @@ class thread_worker(Callable, Generic[_P, _R]):
         else:
             return nullcontext()  # record is false or all-false
 
+    def _thread_context(self, gui: BaseGui):
+        if self._block_in_thread:
+            return self._call_context(gui)
+        else:
+            return nullcontext()
+
     def _create_qt_worker(
         self, gui: BaseGui, *args, **kwargs
     ) -> FunctionWorker | GeneratorWorker:
         """Create a worker object."""
+        if self._backend == "process":
+            return self._create_process_worker(*args, **kwargs)
         if self.is_generator:
 
             @wraps(self._func)
             def _run(*args, **kwargs):
-                with self._call_context(gui):
+                with self._thread_context(gui):
                     out = yield from self._func.__get__(gui)(*args, **kwargs)
                 return out
 
@@ -401,7 +485,7 @@ class thread_worker(Callable, Generic[_P, _R]):
         else:
 
             def _run(*args, **kwargs):
-                with self._call_context(gui):
+                with self._thread_context(gui):
                     out = self._func.__get__(gui)(*args, **kwargs)
                 return out
 
@@ -418,6 +502,39 @@ class thread_worker(Callable, Generic[_P, _R]):
 
         return worker
 
+    def _create_process_worker(
+        self, *args, **kwargs
+    ) -> FunctionWorker | GeneratorWorker:
+        """Create a worker object that waits for the function run in a process."""
+        task = ProcessTask(self._func, args, kwargs)
+
+        def _abort_requested() -> bool:
+            return worker.abort_requested
+
+        if self.is_generator:
+
+            @wraps(self._func)
+            def _run():
+                return (yield from task.iter_results(_abort_requested))
+
+            _worker_class = GeneratorWorker2
+        else:
+
+            def _run():
+                return task.run(_abort_requested)
+
+            _worker_class = FunctionWorker
+
+        worker = create_worker(
+            _run,
+            _ignore_errors=True,
+            _start_thread=False,
+            _worker_class=_worker_class,
+        )
+        # the generator may not be closed when aborted
+        worker.finished.connect(task.terminate)
+        return worker
+
     def _is_non_blocking(self, gui: BaseGui) -> bool:
         async_ok = self._force_async or self._is_running(gui)
         not_blocking_mode = len(self._BLOCKING_SOURCES) == 0
@@ -465,7 +582,11 @@ class thread_worker(Callable, Generic[_P, _R]):
                         gui._error_mode.get_handler()(err, parent=gui)
                         raise err  # reraise
 
-                return worker.start()
+                pool = self._get_pool(gui, self._pool_name)
+                on_pending = None
+                if isinstance(pbar, DefaultProgressBar):
+                    on_pending = partial(_show_pending, pbar, pool)
+                return pool.submit(worker, self, self._max_concurrent, on_pending)
             else:
                 # If function is called from script, some events must get processed by
                 # the application while keep script stopping at each line of code.
@@ -546,8 +667,11 @@ class thread_worker(Callable, Generic[_P, _R]):
             # run
             args, kwargs = self._validate_args(gui, args, kwargs)
             try:
-                if self.is_generator:
-                    gen = self._func.__get__(gui)(*args, **kwargs)
+                if self._backend == "process" or self.is_generator:
+                    if self._backend == "process":
+                        gen = ProcessTask(self._func, args, kwargs).iter_results()
+                    else:
+                        gen = self._func.__get__(gui)(*args, **kwargs)
                     while True:
                         try:
                             _val = next(gen)
@@ -839,6 +963,28 @@ def init_pbar(pbar: ProgressBarLike):
     return None
 
 
+def _show_pending(pbar: DefaultProgressBar, pool: WorkerPool):
+    """Show the progressbar of a worker waiting in the pool."""
+    worker = pbar._worker
+    desc = pbar.progress_label.value
+    pbar.set_description(f"{desc} (pending)")
+    pbar.footer[2].visible = True  # abort button cancels the pending worker
+
+    def _cancel():
+        pool.cancel(worker)
+
+    def _on_started():
+        pbar.abort_button.changed.disconnect(_cancel)
+        pbar.set_description(desc)
+        if not isinstance(worker, GeneratorWorker):
+            pbar.hide_footer()
+
+    pbar.abort_button.changed.connect(_cancel)
+    worker.started.connect(_on_started)
+    pbar.show()
+    return None
+
+
 def close_pbar(pbar: ProgressBarLike):
     """Close progressbar."""
     if isinstance(pbar, ProgressBar):
@@ -18,26 +18,46 @@ from .containers import (
     ToolBoxContainer,
     ResizableContainer,
 )
-from .pywidgets import ListWidget, DictWidget
-from .color import ColorEdit, ColorSlider
-from .colormap import ColormapEdit
-from .misc import (
-    OptionalWidget,
-    ConsoleTextEdit,
-    CheckButton,
-    HistoryLineEdit,
-    HistoryFileEdit,
-    SpreadSheet,
-)
-from .plot import Figure, SeabornFigure
 from .separator import Separator
 from .utils import FreeWidget
-from .logger import Logger
-from .codeedit import CodeEdit
-from .toggle_switch import ToggleSwitch
-from .eval import EvalLineEdit
-from .line_runner import OneLineRunner
-from ._union import UnionWidget
+
+# Widgets that are not needed to build magic classes are imported on first access.
+_LAZY_ATTRS: dict[str, str] = {
+    "ListWidget": "pywidgets",
+    "DictWidget": "pywidgets",
+    "ColorEdit": "color",
+    "ColorSlider": "color",
+    "ColormapEdit": "colormap",
+    "OptionalWidget": "misc",
+    "ConsoleTextEdit": "misc",
+    "CheckButton": "misc",
+    "HistoryLineEdit": "misc",
+    "HistoryFileEdit": "misc",
+    "SpreadSheet": "misc",
+    "Figure": "plot",
+    "SeabornFigure": "plot",
+    "Logger": "logger",
+    "CodeEdit": "codeedit",
+    "ToggleSwitch": "toggle_switch",
+    "EvalLineEdit": "eval",
+    "OneLineRunner": "line_runner",
+    "UnionWidget": "_union",
+}
+
+
+def __getattr__(name: str):
+    if (mod_name := _LAZY_ATTRS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    out = getattr(import_module(f".{mod_name}", __name__), name)
+    globals()[name] = out
+    return out
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 __all__ = [
     "ButtonContainer",
@@ -465,6 +465,34 @@ class QCodeEditor(QtW.QPlainTextEdit):
             cursor.deletePreviousChar()
             self.setTextCursor(cursor)
 
+    def replaceLastLines(self, nlines: int, text: str = ""):
+        """Replace the last `nlines` lines with `text` in a single edit."""
+        with self._fix_horizontal_position():
+            doc = self.document()
+            cursor = QtGui.QTextCursor(doc)
+            cursor.beginEditBlock()
+            cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+            if nlines > 0:
+                nblocks = doc.blockCount()
+                if nlines >= nblocks:
+                    cursor.movePosition(
+                        QtGui.QTextCursor.MoveOperation.Start,
+                        QtGui.QTextCursor.MoveMode.KeepAnchor,
+                    )
+                else:
+                    # also remove the line break before the first erased line
+                    block = doc.findBlockByNumber(nblocks - nlines)
+                    cursor.setPosition(
+                        block.position() - 1, QtGui.QTextCursor.MoveMode.KeepAnchor
+                    )
+                cursor.removeSelectedText()
+            if text:
+                if doc.characterCount() > 1:
+                    text = "\n" + text
+                cursor.insertText(text)
+            cursor.endEditBlock()
+            self.setTextCursor(cursor)
+
     def eraseFirst(self):
         """Erase the first line."""
         with self._fix_horizontal_position():
@@ -926,6 +954,10 @@ class CodeEdit(TextEdit):
         """Append text to the end of the document."""
         self._qcode_edit().appendPlainText(text)
 
+    def replace_last_lines(self, nlines: int, text: str = "") -> None:
+        """Replace the last `nlines` lines with `text`."""
+        self._qcode_edit().replaceLastLines(nlines, text)
+
     @property
     def selected(self) -> str:
         """Return selected string."""
@@ -717,6 +717,7 @@ class CollapsibleContainer(ContainerWidget[_W]):
 
     @collapsed.setter
     def collapsed(self, value: bool):
+        self._widget._expand_btn.setChecked(not value)
         if value:
             self._widget._collapse()
         else:
@@ -733,6 +734,7 @@ class HCollapsibleContainer(ContainerWidget[_W]):
 
     @collapsed.setter
     def collapsed(self, value: bool):
+        self._widget._expand_btn.setChecked(not value)
         if value:
             self._widget._collapse()
         else:
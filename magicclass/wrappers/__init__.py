@@ -9,6 +9,8 @@ from ._misc import (
     mark_on_calling,
     do_not_record,
     bind_key,
+    cache_choices,
+    threaded_choices,
     nogui,
 )
 
@@ -24,5 +26,7 @@ __all__ = [
     "mark_on_calling",
     "do_not_record",
     "bind_key",
+    "cache_choices",
+    "threaded_choices",
     "nogui",
 ]
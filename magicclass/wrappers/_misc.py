@@ -7,6 +7,11 @@ from magicgui.widgets import FunctionGui
 
 from magicclass.types import Color
 from magicclass.signature import get_additional_option, upgrade_signature
+from magicclass.utils._choices import (
+    CHOICES_DEPENDENCIES,
+    CHOICES_THREADED,
+    CHOICES_TTL,
+)
 
 if TYPE_CHECKING:
     from magicclass._gui import MagicTemplate
@@ -237,6 +242,87 @@ def bind_key(key: str) -> Callable[[_F], _F]:
     return wrapper
 
 
+def cache_choices(*depends_on: Any, ttl: float | None = None) -> Callable[[_F], _F]:
+    """
+    Memoize the result of a choices provider method.
+
+    The provider is called only when the memoized result is discarded, which
+    happens when any of the dependencies emits or the result expires. The
+    `reset_choices` method does not call the provider unless the result is
+    discarded.
+
+    >>> @magicclass
+    >>> class A:
+    >>>     path = vfield(Path)
+    >>>     @cache_choices(path)
+    >>>     def _get_choices(self, w=None):
+    >>>         return read_keys(self.path)  # expensive
+    >>>     def f(self, key: OneOf[_get_choices]): ...
+
+    Parameters
+    ----------
+    *depends_on : str, field, Signal or widget
+        Dependencies of the choices. Fields, widgets and magic classes are
+        represented by their `changed` signals. Strings are interpreted as the
+        attribute names of the instance that owns the provider.
+    ttl : float, optional
+        Time to live of the memoized result in seconds.
+    """
+
+    options: dict[str, Any] = {CHOICES_DEPENDENCIES: list(depends_on)}
+    if ttl is not None:
+        options[CHOICES_TTL] = ttl
+
+    def wrapper(method: _F) -> _F:
+        upgrade_signature(method, additional_options=options)
+        return method
+
+    return wrapper
+
+
+@overload
+def threaded_choices(
+    method: None = None, *, ttl: float | None = None
+) -> Callable[[_F], _F]: ...
+
+
+@overload
+def threaded_choices(method: _F, *, ttl: float | None = None) -> _F: ...
+
+
+def threaded_choices(method=None, *, ttl=None):
+    """
+    Call a choices provider method in a worker thread.
+
+    The widget is disabled and shows a loading state until the result arrives, so
+    that a slow provider does not freeze the GUI. If choices are reset again before
+    the result arrives, the older result is discarded. Providers defined by
+    `async def` are always called in a worker thread.
+
+    >>> @magicclass
+    >>> class A:
+    >>>     @threaded_choices(ttl=10.0)
+    >>>     def _get_choices(self, w=None):
+    >>>         return query_database()  # slow
+    >>>     def f(self, key: OneOf[_get_choices]): ...
+
+    Parameters
+    ----------
+    ttl : float, optional
+        If given, the result is reused for this number of seconds.
+    """
+
+    options: dict[str, Any] = {CHOICES_THREADED: True}
+    if ttl is not None:
+        options[CHOICES_TTL] = ttl
+
+    def wrapper(f: _F) -> _F:
+        upgrade_signature(f, additional_options=options)
+        return f
+
+    return wrapper if method is None else wrapper(method)
+
+
 def nogui(method: _F) -> _F:
     """Wrapped method will not be converted into a widget."""
     upgrade_signature(method, additional_options={"gui": False})
@@ -0,0 +1,76 @@
+from pathlib import Path
+from magicclass import magicclass, vfield
+from magicclass.batch import run_macro, parametrize
+
+
+@magicclass
+class A:
+    scale = vfield(int)
+
+    def __post_init__(self):
+        self._result = None
+
+    def load(self, path: Path, n: int = 1):
+        if not path.name.startswith("a"):
+            raise ValueError(path.name)
+        self._result = (path.name, n * self.scale)
+
+
+def _get_result(ui: A):
+    return ui._result
+
+
+def _record():
+    ui = A()
+    ui.scale = 2
+    ui.load(Path("/data/a0.txt"), 3)
+    return ui
+
+
+def test_parametrize():
+    ui = _record()
+    macro = parametrize(ui.macro, path=Path("/data/a0.txt"), n=3)
+    assert str(macro).splitlines()[1:] == ["ui.scale = 2", "ui.load(path=path, n=n)"]
+    macro = parametrize(str(ui.macro), path=Path("/data/a0.txt"))
+    assert str(macro).splitlines()[-1] == "ui.load(path=path, n=3)"
+
+
+def test_run_macro_in_process():
+    ui = _record()
+    macro = parametrize(ui.macro, path=Path("/data/a0.txt"))
+    progress = []
+    inputs = [{"path": Path(f"/data/{name}.txt")} for name in ["a1", "b2", "a3"]]
+    results = run_macro(
+        A,
+        macro,
+        inputs,
+        workers=0,
+        output=_get_result,
+        progress=lambda i, n: progress.append((i, n)),
+    )
+    assert [r.value for r in results] == [("a1.txt", 6), None, ("a3.txt", 6)]
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, ValueError)
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_run_macro_in_workers():
+    ui = _record()
+    macro = parametrize(ui.macro, path=Path("/data/a0.txt"))
+    inputs = [{"path": Path(f"/data/{name}.txt")} for name in ["a1", "b2"]]
+    results = run_macro(A, macro, inputs, workers=2, output=_get_result)
+    assert results[0].value == ("a1.txt", 6)
+    assert isinstance(results[1].error, ValueError)
+
+
+def test_run_macro_construction_error():
+    @magicclass
+    class B:
+        def __post_init__(self):
+            raise RuntimeError("cannot construct")
+
+        def f(self): ...
+
+    results = run_macro(B, "ui.f()", [{}, {}], workers=0)
+    assert [r.ok for r in results] == [False, False]
+    assert all(isinstance(r.error, RuntimeError) for r in results)
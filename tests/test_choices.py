@@ -249,3 +249,155 @@ def test_slice_choices():
     fgui = get_function_gui(ui.f)
     assert fgui.x.choices == (3, 4, 5)
     assert fgui.y.choices == (0.1, 0.15, 0.2, 0.25)
+
+
+def test_cache_choices():
+    from magicclass import cache_choices
+    from magicclass.types import OneOf
+
+    @magicclass
+    class A:
+        key = vfield(str)
+
+        def __init__(self):
+            self._a = [0, 1, 2]
+            self.ncalls = 0
+
+        @cache_choices(key)
+        def _get_choices(self, w=None):
+            self.ncalls += 1
+            return self._a
+
+        c = vfield(OneOf[_get_choices])
+
+    ui = A()
+    ncalls = ui.ncalls
+    assert ui["c"].choices == (0, 1, 2)
+    ui._a = [3, 4]
+    ui.reset_choices()
+    assert ui.ncalls == ncalls  # memoized
+    assert ui["c"].choices == (0, 1, 2)
+    ui.key = "new"  # dependency changed
+    ui.reset_choices()
+    assert ui.ncalls == ncalls + 1
+    assert ui["c"].choices == (3, 4)
+
+
+def test_reset_choices_only():
+    from magicclass import cache_choices
+    from magicclass.types import OneOf
+
+    @magicclass
+    class A:
+        def __init__(self):
+            self._a = [0, 1, 2]
+
+        @cache_choices()
+        def _get_choices(self, w=None):
+            return self._a
+
+        def _get_choices_2(self, w=None):
+            return self._a
+
+        c = vfield(OneOf[_get_choices])
+        d = vfield(OneOf[_get_choices_2])
+
+    ui = A()
+    ui._a = [3, 4]
+    ui.reset_choices(only="d")
+    assert ui["c"].choices == (0, 1, 2)
+    assert ui["d"].choices == (3, 4)
+    ui.reset_choices(only=A._get_choices)
+    assert ui["c"].choices == (3, 4)
+    ui._a = [5]
+    ui.reset_choices(only=["_get_choices", ui["d"]])
+    assert ui["c"].choices == (5,)
+    assert ui["d"].choices == (5,)
+
+
+def test_threaded_choices(qtbot):
+    import threading
+    from magicclass import threaded_choices
+    from magicclass.types import OneOf
+
+    main_thread = threading.get_ident()
+
+    @magicclass
+    class A:
+        def __init__(self):
+            self._a = [0, 1, 2]
+            self.threads = []
+
+        @threaded_choices
+        def _get_choices(self, w=None):
+            self.threads.append(threading.get_ident())
+            return self._a
+
+        c = vfield(OneOf[_get_choices])
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    qtbot.waitUntil(lambda: ui["c"].choices == (0, 1, 2))
+    assert ui["c"].enabled
+    assert main_thread not in ui.threads
+    ui._a = [3, 4]
+    ui.reset_choices()
+    assert not ui["c"].enabled  # loading
+    qtbot.waitUntil(lambda: ui["c"].choices == (3, 4))
+    assert ui["c"].enabled
+
+
+def test_async_choices_with_ttl(qtbot):
+    from magicclass import threaded_choices
+    from magicclass.types import OneOf
+
+    @magicclass
+    class A:
+        def __init__(self):
+            self._a = [0, 1, 2]
+            self.ncalls = 0
+
+        @threaded_choices(ttl=100)
+        async def _get_choices(self, w=None):
+            self.ncalls += 1
+            return self._a
+
+        c = vfield(OneOf[_get_choices])
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    qtbot.waitUntil(lambda: ui["c"].choices == (0, 1, 2))
+    ncalls = ui.ncalls
+    ui._a = [3, 4]
+    ui.reset_choices()  # result is still alive
+    assert ui["c"].choices == (0, 1, 2)
+    assert ui.ncalls == ncalls
+
+
+def test_stale_choices_discarded(qtbot):
+    import time
+    from magicclass import threaded_choices
+    from magicclass.types import OneOf
+
+    @magicclass
+    class A:
+        def __init__(self):
+            self._delay = 0.3
+            self._a = ["slow"]
+
+        @threaded_choices
+        def _get_choices(self, w=None):
+            delay, out = self._delay, self._a
+            time.sleep(delay)
+            return out
+
+        c = vfield(OneOf[_get_choices])
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    ui._delay = 0.0
+    ui._a = ["fast"]
+    ui.reset_choices()
+    qtbot.waitUntil(lambda: ui["c"].choices == ("fast",))
+    qtbot.wait(500)
+    assert ui["c"].choices == ("fast",)
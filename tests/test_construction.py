@@ -346,3 +346,149 @@ def test_menu_and_toolbar_label():
     ui = A()
     assert ui.Menu.a.label == "X"
     assert ui.Tool.a.label == "X"
+
+
+def test_build_plan_is_cached():
+    from magicclass._gui._build_plan import _PLANS, MemberKind
+
+    @magicclass
+    class A:
+        """
+        Class A.
+
+        Attributes
+        ----------
+        a : int
+            Value of a.
+        """
+        @magicmenu
+        class Menu:
+            def m(self): ...
+
+        a = field(int)
+        sep = "separator"
+
+        def f(self): ...
+
+    ui0 = A()
+    plan = _PLANS[A]
+    assert [(m.name, m.kind) for m in plan] == [
+        ("Menu", MemberKind.nested_class),
+        ("a", MemberKind.field),
+        ("sep", MemberKind.separator),
+        ("f", MemberKind.method),
+    ]
+    assert plan.tooltip == "Class A."
+    ui1 = A()
+    assert _PLANS[A] is plan
+    assert ui0.a.tooltip == ui1.a.tooltip == "Value of a."
+    assert [w.name for w in ui0] == [w.name for w in ui1]
+
+    # adding a member invalidates the plan
+    def g(self): ...
+
+    A.g = g
+    A()
+    assert _PLANS[A] is not plan
+    assert _PLANS[A]._members[-1].name == "g"
+
+    # replacing a member also invalidates the plan
+    def f(self): ...
+
+    plan = _PLANS[A]
+    A.f = f
+    A()
+    assert _PLANS[A] is not plan
+
+
+def test_callable_info_is_cached():
+    from magicclass import set_options
+    from magicclass._gui.utils import _CALLABLE_INFO
+
+    @magicclass
+    class A(MagicTemplate):
+        def f(self, path: Path, i: int = 1): ...
+
+    ui0 = A()
+    cached = _CALLABLE_INFO[A.f]
+    ui1 = A()
+    assert _CALLABLE_INFO[A.f] is cached
+    assert cached[1].nparams == 2
+
+    # changing options must invalidate the cache
+    set_options(i={"bind": 2})(A.f)
+    A()
+    assert _CALLABLE_INFO[A.f] is not cached
+    assert _CALLABLE_INFO[A.f][1].nparams == 1
+    assert _CALLABLE_INFO[A.f][1].first_is_file_edit
+
+
+def test_tooltip_cache():
+    from magicclass.utils import Tooltips
+
+    @magicclass
+    class A(MagicTemplate):
+        def f(self):
+            """Doc of f."""
+
+    A()
+    hits = Tooltips.cache_info().hits
+    ui = A()
+    assert Tooltips.cache_info().hits > hits
+    assert ui["f"].tooltip == "Doc of f."
+
+
+def test_lazy_tooltip(qtbot):
+    from qtpy import QtCore, QtGui, QtWidgets as QtW
+    from magicclass import defaults
+
+    @magicclass
+    class A(MagicTemplate):
+        def f(self):
+            """Doc of f."""
+
+    defaults["lazy-tooltip"] = True
+    try:
+        ui = A()
+    finally:
+        defaults["lazy-tooltip"] = False
+    qtbot.addWidget(ui.native)
+    btn = ui["f"]
+    assert not btn.tooltip
+    event = QtGui.QHelpEvent(QtCore.QEvent.Type.ToolTip, QtCore.QPoint(), QtCore.QPoint())
+    QtW.QApplication.sendEvent(btn.native, event)
+    assert btn.tooltip == "Doc of f."
+
+
+def test_extend_and_batch_update():
+    from magicgui.widgets import SpinBox, LineEdit
+
+    @magicclass
+    class A(MagicTemplate):
+        a = field(int, label="a")
+
+    ui = A()
+    ui.extend([SpinBox(name="x", label="long label x"), LineEdit(name="y")])
+    assert [w.name for w in ui] == ["a", "x", "y"]
+    with ui.batch_update():
+        ui.append(SpinBox(name="z", label="much longer label z"))
+        with ui.batch_update():
+            ui.append(SpinBox(name="w"))
+        assert not ui.native.updatesEnabled()
+    assert ui.native.updatesEnabled()
+    widths = {w._labeled_widget().label_width for w in ui}
+    assert len(widths) == 1
+
+
+def test_extend_menu():
+    from magicclass.widgets import Separator
+
+    @magicclass
+    class A(MagicTemplate):
+        @magicmenu
+        class Menu:
+            pass
+
+    ui = A()
+    ui.Menu.extend([Separator(), lambda: None])
+    assert len(ui.Menu) == 2
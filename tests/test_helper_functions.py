@@ -41,3 +41,34 @@ def test_update_widget_state():
     assert ui.x.value == 10
     assert ui.y == "new"
     assert fgui.asdict() == {"x": 20, "y": 5.0}
+
+
+def test_member_table():
+    from magicclass.utils import get_member_table, iter_members
+
+    class Base:
+        def a(self): ...
+        def b(self): ...
+
+    class Sub(Base):
+        def c(self): ...
+        def a(self): ...
+
+    table = get_member_table(Sub)
+    names = [k for k, _ in iter_members(Sub)]
+    assert names[:3] == ["c", "a", "b"]
+    assert table["a"] is Sub.a
+    assert get_member_table(Sub) is table
+
+    # updating members of the class or the base class invalidates the cache
+    Base.d = lambda self: None
+    table2 = get_member_table(Sub)
+    assert table2 is not table
+    assert "d" in table2
+    Sub.e = lambda self: None
+    assert get_member_table(Sub)["e"] is Sub.e
+    del Sub.c
+    assert "c" not in get_member_table(Sub)
+    Base.b = lambda self: None
+    assert get_member_table(Sub)["b"] is Sub.b
+    assert dict(iter_members(Sub))["b"] is Sub.b
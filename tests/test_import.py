@@ -0,0 +1,36 @@
+import subprocess
+import sys
+import os
+
+
+def test_heavy_modules_are_lazily_imported():
+    code = (
+        "import sys, magicclass\n"
+        "print(','.join(m for m in sys.modules if m.startswith('magicclass')))"
+    )
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+    modules = out.stdout.strip().split(",")
+    assert "magicclass.core" in modules
+    for mod in [
+        "magicclass.logging",
+        "magicclass.widgets.codeedit",
+        "magicclass.widgets.colormap",
+        "magicclass.widgets.logger",
+        "magicclass.widgets.misc",
+        "magicclass.widgets.plot",
+    ]:
+        assert mod not in modules
+
+
+def test_lazy_attributes():
+    import magicclass
+    from magicclass import widgets
+
+    for name in widgets.__all__:
+        assert getattr(widgets, name) is not None
+        assert name in dir(widgets)
+    assert magicclass.logging.getLogger is not None
@@ -0,0 +1,131 @@
+from magicclass import magicclass, field, vfield, get_function_gui
+from magicclass.types import WidgetType
+import pytest
+
+
+def _make_tabbed(lazy: bool):
+    @magicclass(widget_type="tabbed", lazy=lazy)
+    class A:
+        @magicclass
+        class B:
+            x = vfield(int)
+
+            def f(self): ...
+
+        @magicclass
+        class C:
+            y = vfield(int)
+
+            def g(self, a: int):
+                self.find_ancestor(A).out = a
+
+        out = None
+
+    return A
+
+
+def test_lazy_tabbed(qtbot):
+    ui = _make_tabbed(lazy=True)()
+    qtbot.addWidget(ui.native)
+    ui.show(run=False)
+    assert ui.B._deferred_build is None  # current tab is built
+    assert ui["C"]._deferred_build is not None
+    ui.current_index = 1
+    assert ui["C"]._deferred_build is None
+    assert len(ui["C"]) == 2
+
+
+def test_lazy_built_on_access(qtbot):
+    ui = _make_tabbed(lazy=True)()
+    qtbot.addWidget(ui.native)
+    ui.show(run=False)
+    ui.C.y = 3  # setting field value does not need building
+    assert ui["C"]._deferred_build is not None
+    get_function_gui(ui.C.g)(4)
+    assert ui["C"]._deferred_build is None
+    assert ui.C["y"].value == 3
+    assert ui.out == 4
+    assert str(ui.macro[-1]) == "ui.C.g(a=4)"
+
+
+def test_not_lazy(qtbot):
+    ui = _make_tabbed(lazy=False)()
+    qtbot.addWidget(ui.native)
+    assert ui["B"]._deferred_build is None
+    assert ui["C"]._deferred_build is None
+
+
+@pytest.mark.parametrize("wtype", [WidgetType.collapsible, WidgetType.hcollapsible])
+def test_lazy_collapsible(qtbot, wtype):
+    @magicclass(lazy=True)
+    class A:
+        @magicclass(widget_type=wtype)
+        class B:
+            a = field(int)
+
+            def __post_init__(self):
+                self.collapsed = True
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    ui.show(run=False)
+    assert ui["B"]._deferred_build is not None
+    ui["B"].collapsed = False
+    assert ui["B"]._deferred_build is None
+    assert ui["B"]["a"].value == 0
+
+
+def test_lazy_private_class(qtbot):
+    @magicclass(lazy=True)
+    class A:
+        @magicclass
+        class _Sub:
+            a = field(int)
+
+        def show_sub(self):
+            self._Sub.show(run=False)
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    ui.show(run=False)
+    sub = ui._Sub
+    assert sub._deferred_build is not None
+    ui.show_sub()
+    assert sub._deferred_build is None
+    assert sub["a"].value == 0
+    sub.close()
+
+
+def test_async_execution_builds_in_main_thread(qtbot):
+    import threading
+    from macrokit import Expr, Head, parse
+
+    threads = []
+
+    @magicclass(widget_type="tabbed", lazy=True)
+    class A:
+        @magicclass
+        class B:
+            def f(self): ...
+
+        @magicclass
+        class C:
+            @magicclass
+            class D:
+                def g(self, a: int):
+                    self.find_ancestor(A).out = a
+
+            def __post_init__(self):
+                threads.append(threading.current_thread())
+
+        out = None
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    ui.show(run=False)
+    ui.macro.options.attribute_check = False
+    ui.macro.options.signature_check = True
+    ui.macro.options.run_async = True
+    ui.macro.widget._execute(Expr(Head.block, [parse("ui.C.D.g(a=1)")]))
+    qtbot.waitUntil(lambda: ui.out == 1, timeout=3000)
+    assert threads == [threading.main_thread()]
@@ -1,5 +1,5 @@
 from typing_extensions import Annotated
-from magicclass import magicclass, magicmenu, set_options, defaults, do_not_record
+from magicclass import magicclass, magicmenu, set_options, defaults, do_not_record, vfield
 from enum import Enum
 from pathlib import Path
 from datetime import datetime, date, time
@@ -325,3 +325,370 @@ def test_validator_with_silencer():
     assert (5, 5) == ui.f(5, 5)
     assert (3, 3) == ui.f(3)
     assert (1, -1) == ui.f()
+
+def test_spill_evicted_lines(tmp_path):
+    @magicclass
+    class A:
+        def f(self, i: int = 0): pass
+
+    ui = A()
+    ui.macro.options.max_lines = 5
+    ui.macro.options.spill_path = tmp_path / "spill.py"
+    for i in range(10):
+        ui.f(i)
+    assert len(ui.macro) == 5
+    assert str(ui.macro[-1]) == "ui.f(i=9)"
+    lines = ui.macro.full_script().splitlines()
+    assert len(lines) == 11
+    assert lines[1:] == [f"ui.f(i={i})" for i in range(10)]
+    ui.macro.options.spill_path = None
+    assert ui.macro.full_script() == str(ui.macro)
+
+def test_spill_overwrites_old_file(tmp_path):
+    @magicclass
+    class A:
+        @magicclass
+        class B:
+            pass
+
+        def f(self, i: int = 0): pass
+
+    path = tmp_path / "spill.py"
+    path.write_text("old_session()\n")
+    ui = A()
+    ui.macro.options.max_lines = 2
+    ui.macro.options.spill_path = path
+    ui.B._macro_instance.options.spill_path = path
+    for i in range(3):
+        ui.f(i)
+    assert ui.B._macro_instance._spill_log is None
+    assert "old_session" not in ui.macro.full_script()
+    assert ui.macro.full_script().splitlines()[1:] == [f"ui.f(i={i})" for i in range(3)]
+
+def test_journal(tmp_path):
+    @magicclass
+    class A:
+        def __init__(self):
+            self._out = []
+
+        def f(self, i: int = 0):
+            self._out.append(i)
+
+    path = tmp_path / "journal.jsonl"
+    ui = A()
+    ui.macro.options.journal_path = path
+    ui.f(0)
+    ui.f(1)
+    ui.macro.pop()
+    ui.f(2)
+    ui.macro.options.journal_path = None  # close the journal
+
+    ui = A()
+    recovered = ui.macro.recover(path)
+    assert [str(line) for line in recovered][1:] == ["ui.f(i=0)", "ui.f(i=2)"]
+    assert ui.macro.widget.textedit.value == str(recovered)
+    assert ui._out == []
+    ui.macro.recover(path, replay=True)
+    assert ui._out == [0, 2]
+    assert str(ui.macro[-1]) == "ui.f(i=2)"
+
+def test_journal_nested(tmp_path):
+    from magicclass import defaults
+    from magicclass._gui._macro_journal import read_journal
+
+    @magicclass
+    class A:
+        @magicclass
+        class B:
+            def g(self): pass
+
+        def f(self): pass
+
+    path = tmp_path / "journal.jsonl"
+    defaults["macro-journal-path"] = path
+    try:
+        ui = A()
+    finally:
+        defaults["macro-journal-path"] = None
+    assert ui.B._macro_instance._journal is None
+    ui.f()
+    ui.B.g()
+    ui.macro.options.journal_path = None  # close the journal
+    lines = [line for _, line in read_journal(path)]
+    assert len(lines) == 3
+    assert lines[0].startswith("#")
+    assert lines[1:] == ["ui.f()", "ui.B.g()"]
+
+def test_journal_last_session(tmp_path):
+    from magicclass import defaults
+
+    @magicclass
+    class A:
+        def f(self, i: int = 0): pass
+
+    path = tmp_path / "journal.jsonl"
+    defaults["macro-journal-path"] = path
+    try:
+        for i in range(2):
+            ui = A()
+            ui.f(i)
+            ui.f(i + 10)
+            ui.macro.options.journal_path = None  # close the journal
+        ui = A()
+        ui.f(100)
+        ui.macro._journal.flush()
+        recovered = ui.macro.recover(path)
+    finally:
+        defaults["macro-journal-path"] = None
+    assert [str(line) for line in recovered][1:] == ["ui.f(i=1)", "ui.f(i=11)"]
+
+def test_journal_ignores_broken_last_line(tmp_path):
+    from magicclass._gui._macro_journal import MacroJournal, read_journal
+
+    path = tmp_path / "journal.jsonl"
+    journal = MacroJournal(path)
+    journal.record("ui.f()")
+    journal.flush()
+    with open(path, "a") as f:
+        f.write('{"time": "2024-01-')
+    journal.close()
+    assert [line for _, line in read_journal(path)] == ["ui.f()"]
+
+def test_setval_coalesced():
+    @magicclass
+    class A:
+        a = vfield(int)
+        b = vfield(int)
+
+    ui = A()
+    for i in range(5):
+        ui["a"].value = i
+    assert ui.macro._pending_setval is not None
+    assert len(ui.macro._lines) == 1  # expression not constructed yet
+    assert str(ui.macro[-1]) == "ui.a = 4"
+    assert ui.macro._pending_setval is None
+    ui["a"].value = 5  # materialized line is replaced
+    ui["b"].value = 1
+    ui["b"].value = 2
+    assert str(ui.macro).splitlines()[1:] == ["ui.a = 5", "ui.b = 2"]
+
+def test_macro_editor_update(qtbot):
+    @magicclass
+    class A:
+        a = vfield(int)
+
+        def f(self, x: int = 0):
+            pass
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    ui.macro.options.update_interval = 10
+    edit = ui.macro.widget._native_macro
+    for i in range(3):
+        ui.f(i)
+    ui.macro.pop()
+    assert ui.macro.widget._pending_lines[1:] == ["ui.f(x=0)", "ui.f(x=1)"]
+    qtbot.waitUntil(lambda: not ui.macro.widget._pending_lines, timeout=1000)
+    assert edit.value == str(ui.macro)
+    ui.macro.append("for i in range(3):\n    ui.f(x=i)")
+    assert edit.value != str(ui.macro)
+    assert ui.macro.widget.native_macro.value == str(ui.macro)
+    ui.macro.pop()
+    ui.macro.pop()
+    ui["a"].value = 1
+    ui["a"].value = 2
+    qtbot.waitUntil(lambda: edit.value == str(ui.macro), timeout=1000)
+    assert edit.value.splitlines()[-1] == "ui.a = 2"
+
+def test_large_arguments():
+    @magicclass
+    class A:
+        def f(self, x):
+            self._x = x
+
+    class Data:
+        def __init__(self, n):
+            self.n = n
+
+    ui = A()
+    assert ui.macro.options.arg_size_limit is None
+    ui.macro.options.arg_size_limit = 100
+    data = list(range(100))
+    ui.f(data)
+    ui.f(data)
+    ui.f([0])
+    assert str(ui.macro[-3]) == "ui.f(x=ui.macro.arguments[0])"
+    assert str(ui.macro[-2]) == "ui.f(x=ui.macro.arguments[0])"
+    assert str(ui.macro[-1]) == "ui.f(x=[0])"
+    ui.macro[-2].eval({"ui": ui})
+    assert ui._x is data
+
+    from magicclass.utils import argument_size
+
+    argument_size.register(Data, lambda obj: obj.n)
+    big = Data(1000)
+    ui.f(big)
+    assert str(ui.macro[-1]) == "ui.f(x=ui.macro.arguments[1])"
+    ui._x = None
+    del big
+    assert 1 not in ui.macro.arguments
+
+
+def test_compiled_replay():
+    @magicclass
+    class A:
+        a = vfield(int)
+
+        @magicclass
+        class B:
+            def g(self, x: int = 0):
+                self.find_ancestor(A)._out.append(("g", x))
+
+        def __post_init__(self):
+            self._out = []
+
+        def f(self, x: int = 0):
+            self._out.append(("f", x))
+
+    ui = A()
+    ui.f(1)
+    ui.B.g(2)
+    ui.a = 3
+    ui.f(4)
+    expected = [("f", 1), ("g", 2), ("f", 4)]
+    assert ui._out == expected
+    compiled = ui.macro.compile(ui.macro[1:])
+    ui._out.clear()
+    ui.a = 0
+    report = compiled.run()
+    assert ui._out == expected
+    assert ui.a == 3
+    assert report.lines == ["ui.f(x=1)", "ui.B.g(x=2)", "ui.a = 3", "ui.f(x=4)"]
+    assert len(report.times) == 4
+    assert str(ui.macro[-1]) == "ui.f(x=4)"  # recorded
+
+    ui._out.clear()
+    nlines = len(ui.macro)
+    ui.macro.compile("ui.f(x=5)\nui.B.g(x=6)", headless=True).run()
+    assert ui._out == [("f", 5), ("g", 6)]
+    assert len(ui.macro) == nlines  # not recorded
+
+def test_validation_cache():
+    @magicclass
+    class A:
+        def f(self, x: int = 0):
+            self._x = x
+
+    ui = A()
+    edit = ui.macro.widget
+    edit.new_tab(text="ui.f(x=1)\nui.f(x=2)")
+    edit.execute()
+    validator = edit._validator
+    assert (validator.hits, validator.misses) == (0, 4)
+    edit.textedit.value = "ui.f(x=1)\nui.f(x=3)"
+    edit.execute()
+    assert ui._x == 3
+    assert (validator.hits, validator.misses) == (2, 6)
+
+    # redefinition of the class invalidates the cache
+    A.g = lambda self: None
+    edit.execute()
+    assert validator.misses == 10
+
+    # appending a widget to the instance invalidates the cache
+    from macrokit import Symbol, parse
+    from magicgui.widgets import SpinBox
+
+    ns = {Symbol.var("ui"): ui}
+    code = parse("ui.w.value = 1")
+    assert validator.validate(code, ui, ns).attribute_errors
+    ui.append(SpinBox(name="w"))
+    assert not validator.validate(code, ui, ns).attribute_errors
+
+def test_find():
+    @magicclass
+    class A:
+        @magicclass
+        class B:
+            x = vfield(int)
+
+            def f(self, a: int = 0):
+                pass
+
+        y = vfield(int)
+
+        def f(self, a: int = 0):
+            pass
+
+        def g(self):
+            pass
+
+    ui = A()
+    ui.macro.options.max_lines = 8
+    t0 = datetime.now()
+    ui.f(0)
+    ui.B.f(1)
+    ui["y"].value = 1
+    ui.B["x"].value = 2
+    ui.g()
+    ui.f(2)
+    assert ui.macro.find(method="f") == [1, 2, 6]
+    assert ui.macro.find(method="B.f") == [2]
+    assert ui.macro.find(method="h") == []
+    assert ui.macro.find(target="x") == [4]
+    assert ui.macro.find(target="y") == [3]
+    assert ui.macro.find(method="f", until=t0) == []
+    assert ui.macro.find(since=t0) == list(range(1, 7))
+
+    # index is updated on eviction and pop
+    ui.f(3)
+    ui.f(4)
+    ui.f(5)
+    assert str(ui.macro[0]) == "ui.B.f(a=1)"
+    assert ui.macro.find(method="f") == [0, 4, 5, 6, 7]
+    ui.macro.pop()
+    assert ui.macro.find(method="f") == [0, 4, 5, 6]
+    del ui.macro[1]
+    assert ui.macro.find(method="f") == [0, 3, 4, 5]
+    assert ui.macro.find(method="A.f") == []
+    assert [str(ui.macro[i]) for i in ui.macro.find(target="B.x")] == ["ui.B.x = 2"]
+
+def test_compact():
+    @magicclass
+    class A:
+        x = vfield(int)
+        y = vfield(int)
+
+        @set_options(auto_call=True)
+        def f(self, a: int = 0):
+            pass
+
+        def g(self):
+            pass
+
+    ui = A()
+    ui["x"].value = 1
+    ui["y"].value = 1
+    ui["x"].value = 2
+    ui.g()
+    ui["x"].value = 3
+    ui.f(1)
+    ui["y"].value = 2
+    ui.f(2)
+    ui.macro.append("ui.macro.undo()")
+    ui.macro.append("ui.macro.redo()")
+    ui.macro.append("ui.f(a=3)")
+    assert len(ui.macro) == 12
+    assert ui.macro.compact() == 4
+    assert str(ui.macro).splitlines()[1:] == [
+        "ui.y = 1",
+        "ui.x = 2",
+        "ui.g()",
+        "ui.x = 3",
+        "ui.f(a=1)",
+        "ui.y = 2",
+        "ui.f(a=3)",
+    ]
+    assert ui.macro.compact() == 0
+    assert ui.macro.find(method="f") == [5, 7]
+    assert ui.macro.widget.native_macro.value == str(ui.macro)
@@ -0,0 +1,40 @@
+from pytestqt.qtbot import QtBot
+from magicclass import magicclass, magicmenu, get_prebuild_records, get_function_gui
+
+@magicclass(prebuild="idle")
+class A:
+    @magicmenu
+    class Menu:
+        def m(self, x: int = 1): ...
+
+    def f(self, a: int = 0, b: str = ""): ...
+    def g(self): ...
+
+    @magicclass
+    class B:
+        def h(self, c: float = 0.0): ...
+
+def test_prebuild_on_idle(qtbot: QtBot):
+    ui = A()
+    qtbot.addWidget(ui.native)
+    assert ui["f"].mgui is None
+    ui.show(run=False)
+    qtbot.waitUntil(lambda: ui._prebuilder.finished, timeout=2000)
+    assert ui["f"].mgui is not None
+    assert ui.B["h"].mgui is not None
+    assert ui.Menu["m"].mgui is not None
+    names = [name for name, _ in get_prebuild_records(ui)]
+    assert sorted(names) == ["A.B.h", "A.Menu.m", "A.f"]
+    assert ui["g"].mgui is None
+    assert all(sec >= 0 for _, sec in get_prebuild_records(ui))
+    assert get_function_gui(ui.f) is ui["f"].mgui
+
+def test_prebuild_disabled():
+    @magicclass
+    class C:
+        def f(self, a: int = 0): ...
+
+    ui = C()
+    ui.show(run=False)
+    assert get_prebuild_records(ui) == []
+    ui.close()
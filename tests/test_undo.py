@@ -1,3 +1,8 @@
+import threading
+import time
+import pytest
+import numpy as np
+from numpy.testing import assert_equal
 from magicgui import magicgui
 from magicclass import magicclass, vfield
 from magicclass.undo import undo_callback
@@ -398,3 +403,291 @@ def test_undo_with_return_values():
     ui.macro.redo()
     assert ui._x == 2
     assert len(ui.macro) == 3 and str(ui.macro[-1]) == "ui.f(x=2)"
+
+
+def test_max_undo():
+    @magicclass
+    class A:
+        def undoable(self):
+            return undo_callback(lambda: None)
+
+    ui = A()
+    ui.macro.options.max_undo = 3
+    for _ in range(5):
+        ui.undoable()
+    assert len(ui.macro._stack_undo) == 3
+    assert len(ui.macro.undo_stack["undo"]) == 3
+    for _ in range(5):
+        ui.macro.undo()
+    assert len(ui.macro._stack_redo) == 3
+    assert str(ui.macro[-1]) == "ui.undoable()"
+    assert len(ui.macro) == 3
+
+
+@pytest.mark.parametrize("compression", [None, "zlib", "mmap"])
+def test_max_undo_bytes(compression):
+    @magicclass
+    class A:
+        def __init__(self):
+            self._data = np.zeros((100, 100))
+
+        def set_value(self, value: int = 0):
+            old_data = self._data
+            self._data = np.full((100, 100), value, dtype=np.float64)
+
+            @undo_callback
+            def out():
+                self._data = old_data
+
+            return out
+
+    ui = A()
+    ui.macro.options.max_undo_bytes = 80000 * 3
+    ui.macro.options.undo_compression = compression
+    for i in range(5):
+        ui.set_value(i + 1)
+    if compression is None:
+        assert len(ui.macro._stack_undo) == 3
+    else:
+        assert len(ui.macro._stack_undo) == 5
+    ui.macro.undo()
+    assert_equal(ui._data, np.full((100, 100), 4))
+    ui.macro.undo()
+    assert_equal(ui._data, np.full((100, 100), 3))
+    ui.macro.redo()
+    assert_equal(ui._data, np.full((100, 100), 4))
+
+
+def test_compression_with_custom_redo():
+    @magicclass
+    class A:
+        def __init__(self):
+            self._data = np.zeros((100, 100))
+
+        def set_value(self, value: int = 0):
+            old_data = self._data
+            new_data = np.full((100, 100), value, dtype=np.float64)
+            self._data = new_data
+
+            @undo_callback
+            def out():
+                self._data = old_data
+
+            @out.with_redo
+            def out():
+                self._data = new_data
+
+            return out
+
+    ui = A()
+    ui.macro.options.undo_compression = "zlib"
+    ui.set_value(1)
+    undo = ui.macro._stack_undo._stack[-1]
+    assert len(undo._packed_cells) == 1  # only old_data
+    assert ui.macro._stack_undo.nbytes < 80000
+    ui.macro.undo()
+    assert_equal(ui._data, np.zeros((100, 100)))
+    ui.macro.redo()
+    assert_equal(ui._data, np.full((100, 100), 1))
+    ui.macro.undo()
+    assert_equal(ui._data, np.zeros((100, 100)))
+
+
+def test_compression_keeps_live_arrays():
+    @magicclass
+    class A:
+        def __init__(self):
+            self.image = np.zeros((100, 100))
+
+        def fill(self, value: int = 0):
+            img = self.image
+            old = img.copy()
+            img[:] = value
+
+            @undo_callback
+            def out():
+                img[:] = old
+
+            return out
+
+    ui = A()
+    ui.macro.options.undo_compression = "zlib"
+    ui.fill(3)
+    undo = ui.macro._stack_undo._stack[-1]
+    assert len(undo._packed_cells) == 1  # only old
+    ui.macro.undo()
+    assert ui.image.max() == 0
+    ui.macro.redo()
+    assert ui.image.max() == 3
+
+
+def test_array_patch():
+    from magicclass.undo import array_patch
+
+    @magicclass
+    class A:
+        def __init__(self):
+            self._data = np.zeros((4, 10, 10), dtype=np.uint8)
+
+        def paint(self, z: int, value: int):
+            region = (z, slice(2, 5), slice(2, 5))
+            undo = array_patch(self._data, region)
+            self._data[region] = value
+            return undo
+
+        def paint_mask(self, value: int):
+            mask = self._data > 0
+            undo = array_patch(self._data, mask)
+            self._data[mask] = value
+            return undo
+
+    ui = A()
+    ui.paint(1, 3)
+    ui.paint_mask(5)
+    # old values and the sparse region (9 elements x 3 dims x 8 bytes)
+    assert ui.macro._stack_undo.nbytes == 9 + 9 + 9 * 3 * 8
+    ui.macro.undo()
+    assert ui._data.sum() == 27
+    ui.macro.undo()
+    assert ui._data.sum() == 0
+    ui.macro.redo()
+    assert ui._data[1, 2:5, 2:5].sum() == 27
+    ui.macro.redo()
+    assert ui._data.sum() == 45
+    assert str(ui.macro[-1]) == "ui.paint_mask(value=5)"
+
+    # dense masks are kept as is
+    ui._data[:] = 1
+    nbytes = ui.macro._stack_undo.nbytes
+    ui.paint_mask(2)
+    assert ui.macro._stack_undo.nbytes - nbytes == ui._data.nbytes * 2
+
+
+def test_async_undo():
+    from magicclass.utils import thread_worker
+
+    @magicclass
+    class A:
+        def __init__(self):
+            self._x = 0
+
+        def f(self, x: int):
+            old_value = self._x
+            self._x = x
+
+            @undo_callback
+            def undo():
+                yield
+                self._x = old_value
+
+            @undo.with_redo
+            async def undo():
+                self._x = x
+
+            return undo
+
+    ui = A()
+    ui.f(1)
+    ui.f(2)
+    with thread_worker.blocking_mode():
+        ui.macro.undo()
+        assert ui._x == 1
+        assert str(ui.macro[-1]) == "ui.f(x=1)"
+        ui.macro.undo()
+        assert ui._x == 0
+        ui.macro.redo()
+        assert ui._x == 1
+        assert str(ui.macro[-1]) == "ui.f(x=1)"
+    assert len(ui.macro._stack_undo) == len(ui.macro._stack_redo) == 1
+    assert not ui.macro._undo_running
+
+
+def _make_slow_undo_class():
+    @magicclass
+    class A:
+        def __init__(self):
+            self._x = 0
+
+        def f(self, x: int):
+            old_value = self._x
+            self._x = x
+
+            @undo_callback
+            def undo():
+                time.sleep(0.05)
+                yield
+                self._x = old_value
+
+            return undo
+
+    return A
+
+
+def test_async_undo_queued(qtbot):
+    ui = _make_slow_undo_class()()
+    qtbot.addWidget(ui.native)
+    for i in range(1, 4):
+        ui.f(i)
+    ui.macro.undo()
+    ui.macro.undo()
+    ui.macro.redo()
+    assert ui.macro._undo_running
+    assert len(ui.macro._undo_queue) == 2
+
+    def _done():
+        assert not ui.macro._undo_running
+        assert len(ui.macro._undo_queue) == 0
+        assert ui._x == 2
+        assert len(ui.macro._stack_redo) == 1
+
+    qtbot.waitUntil(_done, timeout=3000)
+    assert str(ui.macro[-1]) == "ui.f(x=2)"
+    assert len(ui.macro._stack_undo) == 2
+
+
+def test_new_operation_during_async_undo(qtbot):
+    started = threading.Event()
+
+    @magicclass
+    class A:
+        def __init__(self):
+            self._x = 0
+
+        def f(self, x: int):
+            old_value = self._x
+            self._x = x
+
+            @undo_callback
+            def undo():
+                started.set()
+                time.sleep(0.05)
+                yield
+                self._x = old_value
+
+            return undo
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    ui.f(1)
+    ui.f(2)
+    ui.macro.undo()
+    assert started.wait(timeout=3)
+    ui.f(5)  # new operation while undo is running
+
+    def _done():
+        assert not ui.macro._undo_running
+
+    qtbot.waitUntil(_done, timeout=3000)
+    # the undo is aborted, so the new operation is not overwritten
+    assert ui._x == 5
+    assert [str(line) for line in ui.macro[-3:]] == [
+        "ui.f(x=1)",
+        "ui.f(x=2)",
+        "ui.f(x=5)",
+    ]
+    assert len(ui.macro._stack_redo) == 0
+    assert len(ui.macro._stack_undo) == 3
+    ui.macro.undo()
+    qtbot.waitUntil(_done, timeout=3000)
+    assert ui._x == 2
+    assert str(ui.macro[-1]) == "ui.f(x=2)"
@@ -1,3 +1,4 @@
+import os
 import sys
 import pytest
 from magicclass import magicclass, magicmenu, set_options, do_not_record, vfield, get_function_gui
@@ -350,3 +351,116 @@ def test_nested_worker_macro():
     mock2.assert_called_with("f2")
     assert len(ui.macro) == 3
     assert str(ui.macro[-1]) == "ui.g12()"
+
+
+@magicclass
+class ProcessWorkerGui:
+    @thread_worker(backend="process")
+    def f(self, n: int = 3):
+        for i in range(n):
+            yield i
+        return n * 2
+
+    @thread_worker(backend="process")
+    def g(self):
+        raise ValueError("error in process")
+
+    @thread_worker(backend="process")
+    def h(self):
+        yield lambda: None  # not picklable
+
+    @thread_worker(backend="process")
+    def pid(self):
+        return os.getpid()
+
+
+def test_process_backend():
+    ui = ProcessWorkerGui()
+    yielded = []
+    returned = []
+    ProcessWorkerGui.f.yielded.connect(lambda self, v: yielded.append(v))
+    ProcessWorkerGui.f.returned.connect(lambda self, v: returned.append(v))
+    try:
+        ui.f(3)
+        assert yielded == [0, 1, 2]
+        assert returned == [6]
+        assert str(ui.macro[-1]) == "ui.f(n=3)"
+        with pytest.raises(ValueError):
+            ui.g()
+        with pytest.raises(TypeError, match="not picklable"):
+            ui.h()
+    finally:
+        ProcessWorkerGui.f.yielded.disconnect()
+        ProcessWorkerGui.f.returned.disconnect()
+
+
+def test_process_reused():
+    ui = ProcessWorkerGui()
+    pids = []
+    ProcessWorkerGui.pid.returned.connect(lambda self, v: pids.append(v))
+    try:
+        ui.pid()
+        ui.pid()
+        with pytest.raises(ValueError):
+            ui.g()  # errored tasks also release the process
+        ui.pid()
+        assert pids[0] != os.getpid()
+        assert pids[0] == pids[1] == pids[2]
+    finally:
+        ProcessWorkerGui.pid.returned.disconnect()
+
+
+def test_worker_pool(qtbot: QtBot):
+    @magicclass
+    class A:
+        @thread_worker(force_async=True, max_concurrent=1)
+        def f(self):
+            time.sleep(0.05)
+
+        @thread_worker(force_async=True, pool="io")
+        def g(self):
+            time.sleep(0.05)
+
+    ui = A()
+    pool = thread_worker._get_pool(ui, "default")
+    ui.f()
+    ui.f()
+    assert pool.n_running == 1 and pool.n_pending == 1
+    qtbot.waitUntil(lambda: pool.n_running + pool.n_pending == 0, timeout=2000)
+
+    thread_worker.set_pool("io", max_workers=2, ui=ui)
+    io_pool = thread_worker._get_pool(ui, "io")
+    for _ in range(3):
+        ui.g()
+    assert io_pool.n_running == 2 and io_pool.n_pending == 1
+    qtbot.waitUntil(lambda: io_pool.n_running + io_pool.n_pending == 0, timeout=2000)
+    assert pool.n_running == 0
+
+
+def test_cancel_pending_worker(qtbot: QtBot):
+    mock = MagicMock()
+
+    @magicclass
+    class A:
+        @thread_worker(force_async=True, max_concurrent=1, progress=True)
+        def f(self):
+            mock()
+            time.sleep(0.05)
+
+    ui = A()
+    qtbot.addWidget(ui.native)
+    pool = thread_worker._get_pool(ui, "default")
+    ui.f()
+    ui.f()
+    ui.f()
+    assert pool.n_pending == 2
+    finished = MagicMock()
+    worker_0 = pool._pending[0].worker
+    worker_1 = pool._pending[1].worker
+    worker_0.finished.connect(finished)
+    assert pool.cancel(worker_0)
+    finished.assert_called_once()
+    assert not pool.cancel(worker_0)
+    worker_1.quit()  # aborted before started
+    qtbot.waitUntil(lambda: pool.n_running + pool.n_pending == 0, timeout=2000)
+    assert mock.call_count == 1